@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import random
+import uuid
+from datetime import date, timedelta
+
+# Répartition des statuts : la plupart des tâches d'un vrai dossier sont terminées
+STATUS_WEIGHTS = {
+    "Réalisé": 50,
+    "À faire": 20,
+    "En cours": 15,
+    "En attente": 10,
+    "Abandonné": 5,
+}
+# Nombre maximal de commentaires d'une tâche
+MAX_COMMENTS = 500
+WORDS = (
+    "réunion budget client livraison rapport relecture équipe planning serveur "
+    "migration facture contrat maquette test déploiement sauvegarde révision"
+).split()
+
+
+def comment_count(rng):
+    """
+    Tire un nombre de commentaires selon une loi de Pareto : la plupart des
+    tâches n'en ont aucun ou presque, quelques-unes en ont des centaines
+
+    Args:
+        rng: Générateur aléatoire
+
+    Returns:
+        int: Nombre de commentaires
+    """
+    return min(int(rng.paretovariate(1.2)) - 1, MAX_COMMENTS)
+
+
+def sentence(rng, length):
+    """
+    Construit une phrase de mots tirés au hasard
+    """
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+
+def generate_task(rng, index, today):
+    """
+    Génère une tâche synthétique et ses commentaires
+
+    Args:
+        rng: Générateur aléatoire
+        index: Numéro de la tâche (repris dans son titre)
+        today: Date de référence des dates de début et de fin
+
+    Returns:
+        dict: La tâche
+    """
+    start = today + timedelta(days=rng.randint(-365, 60))
+    end = start + timedelta(days=rng.randint(0, 30))
+    created_at = f"{start.isoformat()} 09:00:00"
+    return {
+        "ID": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "Titre": f"{sentence(rng, 3)} {index}",
+        "Description": sentence(rng, rng.randint(5, 40)),
+        "DateStart": start.isoformat(),
+        "DateEnd": end.isoformat(),
+        "Status": rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0],
+        "Commentaires": [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "text": sentence(rng, rng.randint(3, 25)),
+                "created_at": created_at
+            }
+            for _ in range(comment_count(rng))
+        ]
+    }
+
+
+def generate_dataset(data_folder, count, seed=0):
+    """
+    Génère un dossier data de tâches synthétiques, au format de JsonFolderStore
+
+    Le même nombre de tâches et la même graine donnent toujours le même dossier,
+    pour comparer des mesures faites sur des versions différentes.
+
+    Args:
+        data_folder: Dossier à remplir (créé si besoin)
+        count: Nombre de tâches
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        dict: Statistiques du dossier (tâches, commentaires, tâche la plus commentée)
+    """
+    os.makedirs(data_folder, exist_ok=True)
+    rng = random.Random(seed)
+    today = date(2025, 1, 1)
+
+    comments = 0
+    most_comments = -1
+    most_commented_id = None
+    for index in range(count):
+        task_data = generate_task(rng, index, today)
+        with open(os.path.join(data_folder, f"{task_data['ID']}.json"), 'w', encoding='utf-8') as f:
+            json.dump(task_data, f, ensure_ascii=False, indent=2)
+        comments += len(task_data["Commentaires"])
+        if len(task_data["Commentaires"]) > most_comments:
+            most_comments = len(task_data["Commentaires"])
+            most_commented_id = task_data["ID"]
+
+    return {
+        "tasks": count,
+        "comments": comments,
+        "most_comments": most_comments,
+        "most_commented_id": most_commented_id
+    }
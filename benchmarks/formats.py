@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Compare les formats des fichiers de tâches : taille sur le disque, temps d'encodage et de décodage
+
+Exemples :
+    python -m benchmarks.formats
+    python -m benchmarks.formats --size 10000 --output formats.json
+
+Les tâches synthétiques de benchmarks.dataset sont encodées puis décodées
+dans chaque format de controller.file_format, sans interface graphique. Les
+temps sont ceux de l'ensemble des tâches (min, médiane, max en ms) ; la place
+occupée tient compte des blocs du système de fichiers.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.dataset import generate_task
+from controller.file_format import FILE_FORMATS, decode_dict, encode_task
+from controller.records import Task
+
+SIZE = 2000
+REPEAT = 5
+
+
+def timed(operation, repeat):
+    """
+    Mesure une opération plusieurs fois
+
+    Returns:
+        dict: Temps min, médian et max en ms
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def disk_usage(contents):
+    """
+    Écrit les fichiers dans un dossier temporaire et retourne la place occupée
+
+    Args:
+        contents: Liste des contenus (bytes)
+
+    Returns:
+        int: Octets occupés sur le disque (blocs alloués), ou la somme des tailles sans st_blocks
+    """
+    with tempfile.TemporaryDirectory(prefix="gestionnaire-formats-") as folder:
+        used = 0
+        for index, data in enumerate(contents):
+            path = os.path.join(folder, f"{index}.json")
+            with open(path, 'wb') as f:
+                f.write(data)
+            stat = os.stat(path)
+            used += stat.st_blocks * 512 if hasattr(stat, 'st_blocks') else stat.st_size
+        return used
+
+
+def measure_formats(size, seed, repeat):
+    """
+    Mesure chaque format sur les mêmes tâches
+
+    Args:
+        size: Nombre de tâches générées
+        seed: Graine du générateur
+        repeat: Nombre de mesures de chaque opération
+
+    Returns:
+        dict: Format -> mesures
+    """
+    rng = random.Random(seed)
+    tasks = [Task.from_dict(generate_task(rng, index, date(2025, 1, 1))) for index in range(size)]
+    print(f"{size} tâches, {sum(len(task.comments) for task in tasks)} commentaires")
+
+    results = {}
+    for file_format in FILE_FORMATS:
+        contents = [encode_task(task, file_format) for task in tasks]
+        encode = timed(lambda: [encode_task(task, file_format) for task in tasks], repeat)
+        decode = timed(lambda: [Task.from_dict(decode_dict(data)) for data in contents], repeat)
+        results[file_format] = {
+            "bytes": sum(len(data) for data in contents),
+            "disk_bytes": disk_usage(contents),
+            "encode": encode,
+            "decode": decode,
+        }
+
+    baseline = results["json"]
+    print(f"  {'format':<8} {'octets':>12} {'disque':>12} {'encodage':>12} {'décodage':>12}")
+    for file_format, result in results.items():
+        print(
+            f"  {file_format:<8} {result['bytes']:>12} {result['disk_bytes']:>12}"
+            f" {result['encode']['median_ms']:>9.1f} ms {result['decode']['median_ms']:>9.1f} ms"
+            f"  (x{result['bytes'] / baseline['bytes']:.2f} octets,"
+            f" x{result['encode']['median_ms'] / baseline['encode']['median_ms']:.2f} encodage,"
+            f" x{result['decode']['median_ms'] / baseline['decode']['median_ms']:.2f} décodage)"
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.formats", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=SIZE, help="Nombre de tâches générées")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Mesures de chaque opération")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args(argv)
+
+    results = measure_formats(args.size, args.seed, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"size": args.size, "seed": args.seed, "formats": results}, f, ensure_ascii=False, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Mesure les opérations du contrôleur sur des dossiers data synthétiques, sans affichage
+
+Exemples :
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 10000 --output resultats.json
+    python -m benchmarks.run --sizes 1000 --compare benchmarks/results/ancien.json
+
+Chaque taille est mesurée dans un processus séparé (mémoire de pointe propre à la
+taille), avec QT_QPA_PLATFORM=offscreen. Les résultats sont enregistrés en JSON :
+temps (min, médiane, max en ms), mémoire résidente et pic de mémoire (Mo),
+nombre de widgets après chaque opération.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    # Windows : pas de pic de mémoire
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = (1000, 10000, 100000)
+REPEAT = 5
+# Ralentissement (médiane) à partir duquel --compare signale une régression,
+# pour un écart d'au moins REGRESSION_MIN_MS (le bruit domine en dessous)
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_MS = 1.0
+# Délai maximal d'attente d'un chargement ou d'une indexation en arrière-plan (s)
+WAIT_TIMEOUT = 600
+
+
+def memory_usage():
+    """
+    Retourne la mémoire résidente actuelle et le pic de mémoire du processus
+
+    Returns:
+        tuple: (mémoire résidente en Mo ou None, pic en Mo ou None)
+    """
+    current = None
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Octets sur macOS, kilo-octets ailleurs
+        peak = peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+    return (round(current, 1) if current is not None else None), (round(peak, 1) if peak is not None else None)
+
+
+class Bench:
+    """
+    Mesure des opérations dans l'application Qt hors écran
+    """
+
+    def __init__(self, app, repeat):
+        """
+        Args:
+            app: QApplication
+            repeat: Nombre de mesures de chaque opération répétable
+        """
+        self.app = app
+        self.repeat = repeat
+        self.results = {}
+
+    def measure(self, name, operation, repeat=None):
+        """
+        Exécute une opération plusieurs fois et enregistre ses mesures
+
+        Les événements Qt en attente (dessin, suppressions différées) sont traités
+        après chaque exécution et comptés dans le temps mesuré.
+
+        Args:
+            name: Nom de l'opération
+            operation: Fonction sans argument, ou fonction recevant le numéro de l'exécution
+            repeat: Nombre d'exécutions (self.repeat par défaut)
+
+        Returns:
+            dict: Mesures de l'opération
+        """
+        from PySide6.QtCore import QEvent
+        from PySide6.QtWidgets import QApplication
+
+        timings = []
+        for run in range(repeat or self.repeat):
+            started = time.perf_counter()
+            operation(run)
+            self.app.processEvents()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        # Laisser les widgets supprimés (deleteLater) disparaître avant de les compter
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        rss, peak_rss = memory_usage()
+
+        result = {
+            "runs": len(timings),
+            "min_ms": round(min(timings), 2),
+            "median_ms": round(statistics.median(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "rss_mb": rss,
+            "peak_rss_mb": peak_rss,
+            "widgets": len(QApplication.allWidgets()),
+        }
+        self.results[name] = result
+        print(f"  {name:<28} {result['median_ms']:>10.2f} ms  {result['widgets']:>6} widgets  {peak_rss} Mo")
+        return result
+
+    def wait_for(self, condition):
+        """
+        Traite les événements Qt jusqu'à ce qu'une condition soit vraie
+
+        Args:
+            condition: Fonction sans argument
+        """
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while not condition():
+            if time.monotonic() > deadline:
+                raise TimeoutError("Opération en arrière-plan trop longue")
+            self.app.processEvents()
+            time.sleep(0.001)
+
+
+def run_size(count, seed, repeat):
+    """
+    Génère un dossier de count tâches puis mesure les opérations du contrôleur (processus enfant)
+
+    Args:
+        count: Nombre de tâches
+        seed: Graine du générateur du dossier
+        repeat: Nombre de mesures de chaque opération répétable
+
+    Returns:
+        dict: Statistiques du dossier et mesures de chaque opération
+    """
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from benchmarks.dataset import generate_dataset
+
+    workdir = tempfile.mkdtemp(prefix="gestionnaire-bench-")
+    try:
+        started = time.perf_counter()
+        dataset = generate_dataset(os.path.join(workdir, "data"), count, seed)
+        dataset["generation_s"] = round(time.perf_counter() - started, 2)
+        print(f"{count} tâches générées en {dataset['generation_s']} s ({dataset['comments']} commentaires)")
+
+        # Le contrôleur utilise le dossier data du répertoire courant
+        os.chdir(workdir)
+        return {"dataset": dataset, "operations": measure_operations(dataset, repeat)}
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def measure_operations(dataset, repeat):
+    """
+    Mesure le démarrage, les filtres, la sélection, les commentaires et la sauvegarde
+
+    Args:
+        dataset: Statistiques du dossier généré
+        repeat: Nombre de mesures de chaque opération répétable
+
+    Returns:
+        dict: Nom de l'opération -> mesures
+    """
+    from PySide6.QtWidgets import QApplication, QMessageBox
+
+    # Les modales de confirmation attendraient un clic : les fermer aussitôt
+    QMessageBox.exec = lambda self: QMessageBox.StandardButton.Ok
+
+    from main import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    bench = Bench(app, repeat)
+    heavy_id = dataset["most_commented_id"]
+    windows = []
+
+    def show(_):
+        window = MainWindow()
+        window.show()
+        windows.append(window)
+        bench.wait_for(lambda: window.first_frame_shown)
+
+    def start(run):
+        show(run)
+        # Le chargement en arrière-plan n'est lancé qu'après la première image
+        controller = windows[-1].task_controller
+        bench.wait_for(lambda: controller.started and controller.loader is None)
+
+    # Premier lancement : pas de manifeste, toutes les tâches sont lues
+    bench.measure("startup_cold", start, repeat=1)
+    controller = windows[-1].task_controller
+    bench.measure("search_indexing", lambda _: bench.wait_for(lambda: controller.indexer is None), repeat=1)
+
+    bench.measure("load_all_tasks", lambda _: controller.load_all_tasks())
+
+    filters = [
+        controller.ui.filterStatus.itemData(i) or controller.ui.filterStatus.itemText(i)
+        for i in range(controller.ui.filterStatus.count())
+    ]
+    filters = [view for view in filters if view != "@period"]
+    bench.measure(
+        "filter_tasks_by_status",
+        lambda run: controller.filter_tasks_by_status(filters[run % len(filters)]),
+        repeat=max(repeat, len(filters))
+    )
+    controller.filter_tasks_by_status("Tous")
+
+    bench.measure("search", lambda run: controller.ui.searchInput.setText(("réunion", "budget client", "")[run % 3]))
+    controller.ui.searchInput.setText("")
+
+    heavy_task = controller.repository.get_task(heavy_id)
+    bench.measure("select_task_first", lambda _: controller.select_task(heavy_task), repeat=1)
+    bench.measure("select_task", lambda _: controller.select_task(heavy_task))
+    bench.measure("refresh_comments_display", lambda _: controller.refresh_comments_display())
+    bench.measure("create_comment", lambda _: controller.create_comment())
+    bench.measure("save_task", lambda _: controller.save_task())
+    bench.measure("create_new_task", lambda _: controller.create_new_task())
+
+    def close(_):
+        window = windows.pop()
+        window.task_controller.shutdown()
+        window.close()
+        window.deleteLater()
+
+    # Fermeture (écritures en attente), puis relance avec le manifeste
+    bench.measure("shutdown", close, repeat=1)
+    bench.measure("startup_warm", start, repeat=1)
+    bench.measure("shutdown_warm", close, repeat=1)
+
+    # Délai avant la première image de la fenêtre, manifeste à jour
+    bench.measure("first_frame_warm", show, repeat=1)
+    bench.wait_for(lambda: windows[-1].task_controller.started and windows[-1].task_controller.loader is None)
+    close(None)
+
+    return bench.results
+
+
+def environment():
+    """
+    Décrit la machine et la version mesurée
+
+    Returns:
+        dict: Version du code, de Python et de PySide6, système
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    try:
+        import PySide6
+        pyside_version = PySide6.__version__
+    except ImportError:
+        pyside_version = None
+
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pyside6": pyside_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """
+    Affiche l'écart des temps médians avec des résultats précédents
+
+    Args:
+        results: Résultats de cette exécution
+        baseline_path: Fichier JSON de résultats de référence
+
+    Returns:
+        int: Nombre d'opérations plus lentes d'au moins REGRESSION_RATIO
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\nComparaison avec {baseline_path} (commit {baseline.get('environment', {}).get('commit')})")
+    regressions = 0
+    for size, measures in results["sizes"].items():
+        previous = baseline.get("sizes", {}).get(size)
+        if previous is None:
+            continue
+        for name, result in measures["operations"].items():
+            before = previous["operations"].get(name)
+            if not before or not before["median_ms"]:
+                continue
+            ratio = result["median_ms"] / before["median_ms"]
+            slower = ratio >= REGRESSION_RATIO and result["median_ms"] - before["median_ms"] >= REGRESSION_MIN_MS
+            flag = " <- régression" if slower else ""
+            regressions += bool(flag)
+            print(f"  {size:>7} {name:<28} {before['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Nombres de tâches générées")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur des dossiers")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Mesures de chaque opération répétable")
+    parser.add_argument("--output", help="Fichier JSON des résultats (benchmarks/results/<date>-<commit>.json par défaut)")
+    parser.add_argument("--compare", help="Fichier JSON de résultats précédents à comparer")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        result = run_size(args.child, args.seed, args.repeat)
+        with open(args.child_output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    results = {"environment": environment(), "seed": args.seed, "repeat": args.repeat, "sizes": {}}
+
+    for size in args.sizes:
+        print(f"\n=== {size} tâches ===", flush=True)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            child_output = f.name
+        try:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.run", "--child", str(size), "--child-output", child_output,
+                 "--seed", str(args.seed), "--repeat", str(args.repeat)],
+                cwd=ROOT, check=True
+            )
+            with open(child_output, 'r', encoding='utf-8') as f:
+                results["sizes"][str(size)] = json.load(f)
+        except subprocess.CalledProcessError as e:
+            print(f"Échec de la mesure pour {size} tâches : {e}")
+        finally:
+            os.remove(child_output)
+
+    output = args.output
+    if not output:
+        name = f"{datetime.now():%Y%m%d-%H%M%S}-{results['environment']['commit'] or 'local'}.json"
+        output = os.path.join(ROOT, "benchmarks", "results", name)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nRésultats enregistrés dans {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,13 @@
-from .task_controller import TaskController
+__all__ = ['TaskController', 'TaskEngine']
 
-__all__ = ['TaskController']
+
+def __getattr__(name):
+    # Import à la demande : le moteur et la ligne de commande (python -m controller)
+    # ne doivent pas charger PySide6, importé par task_controller
+    if name == 'TaskController':
+        from .task_controller import TaskController
+        return TaskController
+    if name == 'TaskEngine':
+        from .task_engine import TaskEngine
+        return TaskEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Ligne de commande pour les traitements en masse, sans interface graphique ni PySide6
+
+Exemples :
+    python -m controller list --filter @overdue
+    python -m controller create "Préparer la réunion" --end 2025-01-31
+    python -m controller update-status Réalisé --filter @overdue
+    python -m controller purge --status Abandonné --ended-before 2024-01-01
+    python -m controller export --output taches.csv
+    python -m controller import taches.jsonl
+    python -m controller reshard
+    python -m controller convert marshal
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from .instrumentation import metrics
+from .file_format import FILE_FORMATS
+from .storage import convert_folder, reshard_folder
+from .task_engine import DATE_VIEWS, SORT_FIELDS, TaskEngine
+from .transfer import FORMATS, export_tasks, import_tasks
+
+
+def add_filter_arguments(parser):
+    """
+    Ajoute les options de filtre communes (statut ou vue par date, période)
+
+    Args:
+        parser: Analyseur de la sous-commande
+    """
+    parser.add_argument(
+        "--filter", default="Tous",
+        help=f"Statut ou vue par date ({', '.join(view for view in DATE_VIEWS if view != '@period')}), Tous par défaut"
+    )
+    parser.add_argument(
+        "--period", nargs=2, metavar=("DEBUT", "FIN"),
+        help="Tâches actives entre deux dates (AAAA-MM-JJ)"
+    )
+
+
+def selected_view(args):
+    """
+    Retourne le filtre et la période demandés
+
+    Returns:
+        tuple: (filtre, période ou None)
+    """
+    if args.period:
+        return "@period", tuple(sorted(args.period))
+    return args.filter, None
+
+
+def format_task(task):
+    """
+    Formate le résumé d'une tâche sur une ligne
+    """
+    end = task.end.isoformat() if task.end else ""
+    return f"{task.id}  {task.status:<12}  {end:<10}  {task.title}"
+
+
+def command_list(engine, args):
+    view, period = selected_view(args)
+    if args.count and not args.search:
+        print(f"{engine.count_tasks(view, period)} tâches")
+        return
+
+    if args.search:
+        engine.index_missing()
+        tasks = engine.search(args.search, view, period)[:args.limit]
+    elif args.limit:
+        # Seule la page demandée est construite
+        tasks, _ = engine.task_page(view, period, args.sort, args.desc, limit=args.limit)
+    else:
+        tasks = engine.sorted_tasks(view, period, args.sort, args.desc)
+
+    if not args.count:
+        for task in tasks:
+            print(format_task(task))
+    print(f"{len(tasks)} tâches")
+
+
+def command_create(engine, args):
+    task = engine.create_task(
+        title=args.title, description=args.description,
+        start=args.start, end=args.end, status=args.status
+    )
+    print(task.id)
+
+
+def command_update_status(engine, args):
+    view, period = selected_view(args)
+    task_ids = list(args.ids)
+    if args.filter != "Tous" or args.period:
+        task_ids.extend(task.id for task in engine.filtered_tasks(view, period))
+    if not task_ids:
+        raise ValueError("Indiquer des IDs de tâches ou un filtre (--filter, --period)")
+
+    missing = [task_id for task_id in task_ids if engine.repository.get_task(task_id) is None]
+    for task_id in missing:
+        print(f"Tâche introuvable : {task_id}", file=sys.stderr)
+
+    updated = engine.set_status(task_ids, args.status)
+    print(f"{len(updated)} tâches passées au statut {args.status}")
+
+
+def command_purge(engine, args):
+    task_ids = engine.purge(args.status, args.ended_before, dry_run=args.dry_run)
+    for task_id in task_ids:
+        print(task_id)
+    action = "à supprimer" if args.dry_run else "supprimées"
+    print(f"{len(task_ids)} tâches {action}")
+
+
+def report_progress(report):
+    """
+    Affiche la progression d'un import ou d'un export sur la sortie d'erreur, sur une seule ligne
+    """
+    counters = ", ".join(f"{name} : {count}" for name, count in report.items())
+    print(f"\r{counters}", end="", file=sys.stderr, flush=True)
+
+
+def command_export(engine, args):
+    view, period = selected_view(args)
+    report = export_tasks(engine, args.output, args.format, view, period, progress=report_progress)
+    print(f"\n{report['exported']} tâches exportées", file=sys.stderr)
+
+
+def command_import(engine, args):
+    ignored = []
+
+    def report_error(line_number, message):
+        # Seules les 20 premières lignes ignorées sont affichées
+        ignored.append(line_number)
+        if len(ignored) <= 20:
+            where = f"Ligne {line_number}" if line_number else "Tâche"
+            print(f"\r{where} ignorée : {message}", file=sys.stderr)
+
+    report = import_tasks(
+        engine, args.input, args.format, args.batch_size,
+        progress=report_progress, errors=report_error
+    )
+    print(f"\n{report['imported']} tâches importées, {report['skipped']} ignorées", file=sys.stderr)
+
+
+def command_reshard(args):
+    """
+    Change la disposition du dossier data, sans ouvrir le moteur des tâches
+
+    Returns:
+        int: Code de retour
+    """
+    if (args.storage or os.environ.get("GESTIONNAIRE_STORAGE", "json")) != "json":
+        print("Erreur : la disposition ne concerne que le stockage json", file=sys.stderr)
+        return 1
+    if not os.path.isdir(args.data):
+        print(f"Erreur : dossier introuvable : {args.data}", file=sys.stderr)
+        return 1
+
+    try:
+        reshard_folder(args.data, sharded=not args.flat)
+        return 0
+    except OSError as e:
+        print(f"Erreur lors de la migration : {e}", file=sys.stderr)
+        return 1
+
+
+def command_convert(args):
+    """
+    Réécrit les fichiers des tâches dans un autre format, sans ouvrir le moteur des tâches
+
+    Returns:
+        int: Code de retour
+    """
+    if (args.storage or os.environ.get("GESTIONNAIRE_STORAGE", "json")) != "json":
+        print("Erreur : le format des fichiers ne concerne que le stockage json", file=sys.stderr)
+        return 1
+    if not os.path.isdir(args.data):
+        print(f"Erreur : dossier introuvable : {args.data}", file=sys.stderr)
+        return 1
+
+    try:
+        convert_folder(args.data, args.file_format)
+        return 0
+    except OSError as e:
+        print(f"Erreur lors de la conversion : {e}", file=sys.stderr)
+        return 1
+
+
+def build_parser():
+    """
+    Construit l'analyseur des arguments de la ligne de commande
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m controller",
+        description="Traitements en masse des tâches, sans interface graphique"
+    )
+    parser.add_argument("--data", default="data", help="Dossier des données (data par défaut)")
+    parser.add_argument(
+        "--storage", choices=("json", "sqlite"),
+        help="Support de stockage (variable GESTIONNAIRE_STORAGE ou json par défaut)"
+    )
+    parser.add_argument("--perf", action="store_true", help="Afficher les durées et compteurs mesurés à la fin")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="Lister les tâches")
+    add_filter_arguments(list_parser)
+    list_parser.add_argument("--search", help="Texte recherché dans les titres, descriptions et commentaires")
+    list_parser.add_argument("--count", action="store_true", help="Afficher seulement le nombre de tâches")
+    list_parser.add_argument(
+        "--sort", choices=SORT_FIELDS, default="end",
+        help="Tri (end : échéance, start : date de début, title : titre, status : statut), end par défaut ; "
+             "ignoré avec --search (les plus pertinentes en premier)"
+    )
+    list_parser.add_argument("--desc", action="store_true", help="Ordre décroissant")
+    list_parser.add_argument("--limit", type=int, help="Nombre maximal de tâches affichées")
+    list_parser.set_defaults(handler=command_list)
+
+    create_parser = commands.add_parser("create", help="Créer une tâche")
+    create_parser.add_argument("title", help="Titre de la tâche")
+    create_parser.add_argument("--description", default="", help="Description de la tâche")
+    create_parser.add_argument("--start", help="Date de début (AAAA-MM-JJ, aujourd'hui par défaut)")
+    create_parser.add_argument("--end", help="Date de fin (AAAA-MM-JJ, demain par défaut)")
+    create_parser.add_argument("--status", default="À faire", help="Statut (À faire par défaut)")
+    create_parser.set_defaults(handler=command_create)
+
+    status_parser = commands.add_parser("update-status", help="Changer le statut de tâches")
+    status_parser.add_argument("status", help="Nouveau statut")
+    status_parser.add_argument("ids", nargs="*", help="IDs des tâches")
+    add_filter_arguments(status_parser)
+    status_parser.set_defaults(handler=command_update_status)
+
+    purge_parser = commands.add_parser("purge", help="Supprimer les tâches d'un statut ou terminées avant une date")
+    purge_parser.add_argument("--status", help="Statut des tâches à supprimer")
+    purge_parser.add_argument("--ended-before", help="Supprimer les tâches dont la date de fin est antérieure (AAAA-MM-JJ)")
+    purge_parser.add_argument("--dry-run", action="store_true", help="Afficher les tâches sans les supprimer")
+    purge_parser.set_defaults(handler=command_purge)
+
+    export_parser = commands.add_parser("export", help="Exporter les tâches complètes, commentaires compris")
+    add_filter_arguments(export_parser)
+    export_parser.add_argument("--output", default="-", help="Fichier de sortie (sortie standard par défaut)")
+    export_parser.add_argument(
+        "--format", choices=FORMATS,
+        help="jsonl (une tâche JSON par ligne) ou csv, d'après l'extension du fichier par défaut"
+    )
+    export_parser.set_defaults(handler=command_export)
+
+    import_parser = commands.add_parser(
+        "import", help="Importer des tâches (une tâche existante est remplacée, une ligne invalide est ignorée)"
+    )
+    import_parser.add_argument("input", help="Fichier JSONL ou CSV (- pour l'entrée standard)")
+    import_parser.add_argument("--format", choices=FORMATS, help="jsonl ou csv, d'après l'extension du fichier par défaut")
+    import_parser.add_argument("--batch-size", type=int, default=500, help="Nombre de tâches écrites par lot")
+    import_parser.set_defaults(handler=command_import)
+
+    reshard_parser = commands.add_parser(
+        "reshard", help="Ranger les fichiers des tâches dans des sous-dossiers 00 à ff (application fermée)"
+    )
+    reshard_parser.add_argument("--flat", action="store_true", help="Revenir à un dossier à plat")
+    reshard_parser.set_defaults(handler=command_reshard)
+
+    convert_parser = commands.add_parser(
+        "convert", help="Réécrire les fichiers des tâches dans un autre format (application fermée)"
+    )
+    convert_parser.add_argument(
+        "file_format", choices=FILE_FORMATS,
+        help="json (indenté), compact (JSON sur une ligne) ou marshal (binaire, le plus rapide)"
+    )
+    convert_parser.set_defaults(handler=command_convert)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la ligne de commande
+
+    Args:
+        argv: Arguments (ceux du processus par défaut)
+
+    Returns:
+        int: Code de retour
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.perf:
+        metrics.enabled = True
+        logging.basicConfig(format="%(name)s %(message)s", level=logging.INFO)
+
+    # Les fichiers sont déplacés ou réécrits hors du moteur : aucune tâche ne doit être ouverte pendant la migration
+    if args.handler in (command_reshard, command_convert):
+        return args.handler(args)
+
+    try:
+        engine = TaskEngine(args.data, args.storage)
+    except Exception as e:
+        print(f"Erreur lors de l'ouverture des données : {e}", file=sys.stderr)
+        return 1
+
+    try:
+        engine.load()
+        args.handler(engine, args)
+        return 0
+    except (KeyError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 1
+    finally:
+        engine.close()
+        if metrics.enabled:
+            metrics.log_summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+
+# Statuts d'une tâche terminée : elle n'est plus en retard ni à échéance
+CLOSED_STATUSES = frozenset(("Réalisé", "Abandonné", "Terminé"))
+
+# Les dates ISO (AAAA-MM-JJ) ont toutes la même longueur : une clé "date + ID"
+# se trie comme la date, puis l'ID se relit après les DATE_LENGTH premiers caractères
+DATE_LENGTH = 10
+# Borne supérieure de toutes les clés d'une même date
+KEY_MAX = "\uffff"
+
+
+def iso_date(value, cache=None):
+    """
+    Retourne la clé AAAA-MM-JJ d'une date de tâche
+
+    Args:
+        value: Objet date ou None
+        cache: Dictionnaire date -> texte réutilisé pendant une construction en masse
+
+    Returns:
+        str: La date au format AAAA-MM-JJ ou None
+    """
+    if value is None:
+        return None
+    if cache is None:
+        return value.isoformat()
+    text = cache.get(value)
+    if text is None:
+        text = cache[value] = value.isoformat()
+    return text
+
+
+class DateIndex:
+    """
+    Index trié des dates de début et de fin des tâches
+
+    Trois listes triées de clés "date + ID" : toutes les tâches par date de début,
+    toutes les tâches par date de fin, et les tâches non terminées par date de fin.
+    Les dates ISO se comparant comme des chaînes, les bornes des requêtes
+    restent du texte ; chaque requête les trouve par dichotomie (bisect), en temps
+    logarithmique, puis ne parcourt que les tâches retournées.
+
+    Après un chargement en masse (résumés du manifeste au démarrage), l'index
+    n'est construit qu'à son premier usage.
+    """
+
+    def __init__(self):
+        # ID -> (DateStart, DateEnd, tâche non terminée)
+        self.dates = {}
+        self.by_start = []
+        self.by_end = []
+        self.open_by_end = []
+        # Résumés chargés en masse, pas encore indexés
+        self.pending = None
+
+    def load(self, summaries):
+        """
+        Remplace le contenu de l'index par un ensemble de résumés, indexés au premier usage
+
+        Args:
+            summaries: Liste de résumés de tâches
+        """
+        self.pending = summaries
+
+    def _build(self):
+        """
+        Indexe les résumés chargés en masse et trie les listes de l'index
+        """
+        if self.pending is None:
+            return
+
+        summaries = self.pending
+        self.pending = None
+        iso_dates = {}
+        self.dates = {
+            summary.id: (
+                iso_date(summary.start, iso_dates),
+                iso_date(summary.end, iso_dates),
+                summary.status not in CLOSED_STATUSES
+            )
+            for summary in summaries
+        }
+
+        by_start = []
+        by_end = []
+        open_by_end = []
+        for task_id, (start, end, is_open) in self.dates.items():
+            if start:
+                by_start.append(start + task_id)
+            if end:
+                by_end.append(end + task_id)
+                if is_open:
+                    open_by_end.append(end + task_id)
+
+        by_start.sort()
+        by_end.sort()
+        open_by_end.sort()
+        self.by_start = by_start
+        self.by_end = by_end
+        self.open_by_end = open_by_end
+
+    def update(self, summary):
+        """
+        Ajoute ou met à jour les dates d'une tâche
+
+        Args:
+            summary: Résumé de la tâche (voir records.Task)
+        """
+        self._build()
+        task_id = summary.id
+        entry = (iso_date(summary.start), iso_date(summary.end), summary.status not in CLOSED_STATUSES)
+
+        previous = self.dates.get(task_id)
+        if previous == entry:
+            return
+
+        if previous is not None:
+            self._unlist(task_id, previous)
+        self.dates[task_id] = entry
+        self._list(task_id, entry)
+
+    def remove(self, task_id):
+        """
+        Retire une tâche de l'index
+
+        Args:
+            task_id: ID de la tâche
+        """
+        self._build()
+        previous = self.dates.pop(task_id, None)
+        if previous is not None:
+            self._unlist(task_id, previous)
+
+    def _list(self, task_id, entry):
+        """
+        Insère les clés d'une tâche dans les listes triées
+        """
+        start, end, is_open = entry
+        if start:
+            self._insert(self.by_start, start + task_id)
+        if end:
+            self._insert(self.by_end, end + task_id)
+            if is_open:
+                self._insert(self.open_by_end, end + task_id)
+
+    def _unlist(self, task_id, entry):
+        """
+        Retire les clés d'une tâche des listes triées
+        """
+        start, end, is_open = entry
+        if start:
+            self._delete(self.by_start, start + task_id)
+        if end:
+            self._delete(self.by_end, end + task_id)
+            if is_open:
+                self._delete(self.open_by_end, end + task_id)
+
+    @staticmethod
+    def _insert(keys, key):
+        keys.insert(bisect_left(keys, key), key)
+
+    @staticmethod
+    def _delete(keys, key):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def _open_range(self, first, last):
+        """
+        Bornes, dans la liste des tâches non terminées, des échéances comprises entre deux dates
+
+        Args:
+            first: Première date (incluse), None pour aucune borne
+            last: Dernière date (incluse)
+
+        Returns:
+            tuple: (début, fin) de la tranche
+        """
+        self._build()
+        low = bisect_left(self.open_by_end, first) if first else 0
+        high = bisect_right(self.open_by_end, last + KEY_MAX)
+        return low, high
+
+    def open_ending_between(self, first, last):
+        """
+        Retourne les tâches non terminées dont l'échéance (DateEnd) est comprise entre deux dates
+
+        Args:
+            first: Première date incluse (AAAA-MM-JJ), None pour toutes les échéances passées
+            last: Dernière date incluse (AAAA-MM-JJ)
+
+        Returns:
+            list: IDs des tâches, par échéance croissante
+        """
+        low, high = self._open_range(first, last)
+        return [key[DATE_LENGTH:] for key in self.open_by_end[low:high]]
+
+    def count_open_ending_between(self, first, last):
+        """
+        Compte les tâches non terminées dont l'échéance est comprise entre deux dates, sans les parcourir
+
+        Returns:
+            int: Nombre de tâches
+        """
+        low, high = self._open_range(first, last)
+        return high - low
+
+    def active_between(self, first, last):
+        """
+        Retourne les tâches actives sur une période : commencées au plus tard à la
+        fin de la période et terminées au plus tôt à son début
+
+        Les deux conditions sont des tranches des listes triées ; seule la plus
+        petite est parcourue, la seconde condition étant vérifiée tâche par tâche.
+
+        Args:
+            first: Début de la période (AAAA-MM-JJ)
+            last: Fin de la période (AAAA-MM-JJ)
+
+        Returns:
+            list: IDs des tâches, par date de début croissante (ou de fin si la tranche des fins est plus petite)
+        """
+        self._build()
+        started = bisect_right(self.by_start, last + KEY_MAX)
+        not_ended = bisect_left(self.by_end, first)
+
+        if started <= len(self.by_end) - not_ended:
+            candidates = self.by_start[:started]
+            return [
+                key[DATE_LENGTH:] for key in candidates
+                if (self.dates[key[DATE_LENGTH:]][1] or "") >= first
+            ]
+
+        candidates = self.by_end[not_ended:]
+        return [
+            key[DATE_LENGTH:] for key in candidates
+            if (self.dates[key[DATE_LENGTH:]][0] or KEY_MAX) <= last
+        ]
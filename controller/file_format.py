@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import json
+import marshal
+
+# Formats des fichiers de tâches :
+#   json    : JSON indenté (format d'origine, lisible et modifiable à la main)
+#   compact : JSON sur une seule ligne, sans espaces
+#   marshal : dictionnaire de la tâche encodé avec le module marshal, précédé de MARSHAL_MAGIC
+FILE_FORMATS = ("json", "compact", "marshal")
+DEFAULT_FORMAT = "json"
+
+# En-tête des fichiers marshal : un fichier JSON commence par "{" ou un espace, jamais par cet octet
+MARSHAL_MAGIC = b"\x00GTM1"
+# Version fixée du format marshal : lisible par toutes les versions de Python 3 suivantes
+MARSHAL_VERSION = 4
+
+
+def check_format(file_format):
+    """
+    Vérifie qu'un format de fichier est connu
+
+    Args:
+        file_format: Nom du format
+
+    Returns:
+        str: Le format
+
+    Raises:
+        ValueError: Si le format est inconnu
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Format de fichier inconnu : {file_format} ({', '.join(FILE_FORMATS)})")
+    return file_format
+
+
+def detect_format(data):
+    """
+    Reconnaît le format du contenu d'un fichier de tâche
+
+    Args:
+        data: Contenu du fichier (bytes)
+
+    Returns:
+        str: "marshal", "json" (indenté) ou "compact"
+    """
+    if data.startswith(MARSHAL_MAGIC):
+        return "marshal"
+    # Le JSON indenté passe à la ligne dès la première clé
+    return "json" if b"\n" in data[:64] else "compact"
+
+
+def encode_task(task, file_format=DEFAULT_FORMAT):
+    """
+    Encode une tâche complète pour son fichier
+
+    Args:
+        task: La tâche (voir records.Task)
+        file_format: Format du fichier (voir FILE_FORMATS)
+
+    Returns:
+        bytes: Contenu du fichier
+    """
+    return encode_dict(task.to_dict(), file_format)
+
+
+def encode_dict(task_data, file_format=DEFAULT_FORMAT):
+    """
+    Encode le dictionnaire d'une tâche (clés des fichiers data/*.json)
+
+    Args:
+        task_data: Dictionnaire de la tâche
+        file_format: Format du fichier (voir FILE_FORMATS)
+
+    Returns:
+        bytes: Contenu du fichier
+    """
+    if file_format == "marshal":
+        return MARSHAL_MAGIC + marshal.dumps(task_data, MARSHAL_VERSION)
+    if file_format == "compact":
+        return json.dumps(task_data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    return json.dumps(task_data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def decode_dict(data):
+    """
+    Décode le contenu d'un fichier de tâche, quel que soit son format
+
+    Args:
+        data: Contenu du fichier (bytes)
+
+    Returns:
+        dict: Dictionnaire de la tâche
+
+    Raises:
+        ValueError: Si le contenu est invalide
+    """
+    if data.startswith(MARSHAL_MAGIC):
+        try:
+            task_data = marshal.loads(data[len(MARSHAL_MAGIC):])
+        except (EOFError, TypeError) as e:
+            raise ValueError(f"Fichier marshal invalide : {e}") from e
+        if not isinstance(task_data, dict):
+            raise ValueError("Fichier marshal invalide : dictionnaire attendu")
+        return task_data
+    return json.loads(data)
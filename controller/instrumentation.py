@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("gestionnaire.perf")
+
+
+class Span:
+    """
+    Mesure de la durée d'une opération, à utiliser avec with ou start()/stop()
+    """
+
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.started = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self.started is not None:
+            self.metrics.record(self.name, time.perf_counter() - self.started)
+            self.started = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class NullSpan:
+    """
+    Mesure désactivée : ne fait rien
+    """
+
+    __slots__ = ()
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Metrics:
+    """
+    Durées des opérations coûteuses (chargement, lecture, construction des
+    listes, écriture, commentaires) et compteurs (fichiers lus, octets écrits)
+
+    Désactivées par défaut : span() retourne alors une mesure vide partagée et
+    count() s'arrête au premier test, pour un coût quasi nul. Activées par la
+    variable d'environnement GESTIONNAIRE_PERF=1 ou depuis le menu Affichage.
+    Chaque mesure est écrite dans le logger "gestionnaire.perf" (niveau DEBUG).
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        # Nom -> [nombre, durée totale (s), durée maximale (s), dernière durée (s)]
+        self.spans = {}
+        # Nom -> valeur
+        self.counters = {}
+        # Les mesures viennent aussi des threads de chargement et d'écriture
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        """
+        Retourne une mesure de durée pour une opération
+
+        Args:
+            name: Nom de l'opération (ex. "load", "comments.refresh")
+
+        Returns:
+            Span: Mesure à utiliser avec with (ou start()/stop() pour une opération asynchrone)
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, seconds):
+        """
+        Enregistre la durée d'une opération
+
+        Args:
+            name: Nom de l'opération
+            seconds: Durée en secondes
+        """
+        with self.lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = [1, seconds, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+                stats[3] = seconds
+        logger.debug("%s : %.2f ms", name, seconds * 1000)
+
+    def count(self, name, value=1):
+        """
+        Incrémente un compteur
+
+        Args:
+            name: Nom du compteur (ex. "files_read", "bytes_written")
+            value: Valeur ajoutée
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        """
+        Retourne une copie des mesures
+
+        Returns:
+            dict: {"spans": {nom: {count, total_ms, max_ms, last_ms}}, "counters": {nom: valeur}}
+        """
+        with self.lock:
+            return {
+                "spans": {
+                    name: {
+                        "count": count,
+                        "total_ms": round(total * 1000, 2),
+                        "max_ms": round(longest * 1000, 2),
+                        "last_ms": round(last * 1000, 2),
+                    }
+                    for name, (count, total, longest, last) in self.spans.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    def reset(self):
+        """
+        Remet les mesures à zéro
+        """
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+
+    def log_summary(self):
+        """
+        Écrit un résumé des mesures dans le logger (niveau INFO)
+        """
+        snapshot = self.snapshot()
+        for name, stats in sorted(snapshot["spans"].items()):
+            logger.info(
+                "%s : %d fois, %.1f ms au total, %.1f ms au plus",
+                name, stats["count"], stats["total_ms"], stats["max_ms"]
+            )
+        for name, value in sorted(snapshot["counters"].items()):
+            logger.info("%s : %d", name, value)
+
+
+metrics = Metrics(enabled=os.environ.get("GESTIONNAIRE_PERF", "") not in ("", "0"))
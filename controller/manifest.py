@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .instrumentation import metrics
+from .records import Task
+from .writer import atomic_write
+
+
+class TaskManifest:
+    """
+    Index binaire compact des résumés de tâches (data/.manifest)
+
+    Pour chaque fichier de tâche, le manifeste garde la signature du fichier
+    (date de modification et taille, journal des commentaires compris) et les
+    seuls champs nécessaires à la liste et aux filtres : ID, Titre, DateStart,
+    DateEnd et Status. Au
+    démarrage, la liste peut ainsi être affichée sans ouvrir un seul fichier de
+    tâche ; les signatures permettent ensuite de ne relire que les fichiers
+    modifiés depuis.
+
+    Le fichier contient :
+    - une base en colonnes, réécrite à chaque compaction : un tableau
+      d'enregistrements de taille fixe suivi de toutes les chaînes dans un seul
+      bloc UTF-8 (séparées par un caractère nul), décodé en une fois ;
+    - un journal en ajout seul : chaque écriture ajoute un enregistrement (ou
+      une suppression) à la fin, le dernier enregistrement d'un fichier l'emporte.
+
+    Plusieurs instances peuvent ajouter au même manifeste : les enregistrements
+    en attente sont écrits en un seul ajout (O_APPEND) à chaque flush, sous un
+    verrou fcntl court, et ne s'entremêlent pas. Le manifeste reste un cache :
+    une entrée manquante ou périmée fait seulement relire le fichier de la tâche.
+    """
+
+    FILE_NAME = ".manifest"
+    MAGIC = b"GTMF"
+    VERSION = 2
+    # Signature, version, nombre d'entrées de la base, taille du bloc de chaînes de la base
+    HEADER = struct.Struct("<4sHxxII")
+    # mtime_ns, taille, mtime_ns du journal, taille du journal,
+    # DateStart et DateEnd (ordinaux, 0 si absente)
+    BASE_RECORD = struct.Struct("<qqqqii")
+    # Type, champs de BASE_RECORD, puis les longueurs en octets
+    # du nom de fichier, de l'ID, du titre et du statut
+    LOG_RECORD = struct.Struct("<BqqqqiiHHHH")
+    KIND_DELETE = 0
+    KIND_TASK = 1
+    # Nombre d'enregistrements du journal à partir duquel ils sont intégrés à la base
+    COMPACT_LOG_RECORDS = 1000
+
+    def __init__(self, data_folder):
+        """
+        Args:
+            data_folder: Dossier contenant les fichiers des tâches
+        """
+        self.path = os.path.join(data_folder, self.FILE_NAME)
+        # Nom de fichier -> (signature, résumé de la tâche)
+        self.entries = {}
+        self.log_records = 0
+        # Descripteur ouvert en ajout et enregistrements pas encore écrits (voir flush)
+        self.fd = None
+        self.pending = []
+
+    def load(self):
+        """
+        Lit le manifeste en le projetant en mémoire (mmap)
+
+        Un manifeste absent, d'une autre version ou illisible est ignoré : il sera
+        reconstruit au fil des scans. Le ramasse-miettes est suspendu pendant le
+        décodage, qui crée des dizaines de milliers d'objets sans aucun cycle.
+
+        Returns:
+            dict: Nom de fichier -> (signature, résumé de la tâche)
+        """
+        self.entries = {}
+        self.log_records = 0
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with metrics.span("manifest.load"), open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < self.HEADER.size:
+                    return self.entries
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    self._parse(data)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Manifeste illisible, il sera reconstruit : {e}")
+            self.entries = {}
+            self.log_records = 0
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return self.entries
+
+    def _parse(self, data):
+        """
+        Décode la base puis rejoue le journal du manifeste
+
+        Un enregistrement tronqué en fin de fichier (arrêt brutal) est ignoré.
+
+        Args:
+            data: Contenu du manifeste (mmap)
+        """
+        magic, version, base_count, blob_length = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            return
+
+        entries = self.entries
+        # Ordinal -> date, beaucoup de tâches partageant les mêmes dates
+        dates = {0: None}
+
+        def to_date(ordinal):
+            value = dates.get(ordinal)
+            if value is None and ordinal not in dates:
+                value = dates[ordinal] = date.fromordinal(ordinal)
+            return value
+
+        # Base : enregistrements de taille fixe puis bloc de chaînes
+        fixed_start = self.HEADER.size
+        fixed_end = fixed_start + base_count * self.BASE_RECORD.size
+        base_end = fixed_end + blob_length
+        if base_end > len(data):
+            return
+
+        rows = self.BASE_RECORD.iter_unpack(data[fixed_start:fixed_end])
+        strings = data[fixed_end:base_end].decode('utf-8').split('\x00') if base_count else []
+
+        for row, file_name, task_id, title, status in zip(
+            rows, strings[0::4], strings[1::4], strings[2::4], strings[3::4]
+        ):
+            entries[file_name] = (row[:4], Task(task_id, title, None, to_date(row[4]), to_date(row[5]), status))
+
+        # Journal : enregistrements ajoutés depuis la dernière compaction
+        record = self.LOG_RECORD
+        unpack_from = record.unpack_from
+        offset = base_end
+        end = len(data)
+        log_records = 0
+
+        while offset + record.size <= end:
+            (kind, mtime, size, journal_mtime, journal_size, start_ordinal, end_ordinal,
+             name_len, id_len, title_len, status_len) = unpack_from(data, offset)
+            position = offset + record.size
+            record_end = position + name_len + id_len + title_len + status_len
+            if record_end > end:
+                break
+
+            file_name = data[position:position + name_len].decode('utf-8')
+            position += name_len
+
+            if kind == self.KIND_DELETE:
+                entries.pop(file_name, None)
+            else:
+                task_id = data[position:position + id_len].decode('utf-8')
+                position += id_len
+                title = data[position:position + title_len].decode('utf-8')
+                position += title_len
+                status = data[position:position + status_len].decode('utf-8')
+
+                summary = Task(task_id, title, None, to_date(start_ordinal), to_date(end_ordinal), status)
+                entries[file_name] = ((mtime, size, journal_mtime, journal_size), summary)
+
+            log_records += 1
+            offset = record_end
+
+        self.log_records = log_records
+
+    @staticmethod
+    def _date_ordinals(summary):
+        """
+        Convertit les dates de début et de fin d'un résumé en ordinaux (0 si absente)
+
+        Returns:
+            tuple: (ordinal de la date de début, ordinal de la date de fin)
+        """
+        return (
+            summary.start.toordinal() if summary.start else 0,
+            summary.end.toordinal() if summary.end else 0
+        )
+
+    @staticmethod
+    def _clean_text(text):
+        """
+        Prépare un texte pour le manifeste : sans caractère nul et limité à 65535 octets en UTF-8
+
+        Args:
+            text: Texte à préparer
+
+        Returns:
+            str: Texte nettoyé
+        """
+        text = (text or "").replace('\x00', '')
+        data = text.encode('utf-8')
+        if len(data) > 0xFFFF:
+            text = data[:0xFFFF].decode('utf-8', 'ignore')
+        return text
+
+    def record(self, file_name, signature, task):
+        """
+        Ajoute ou remplace l'entrée d'un fichier de tâche
+
+        Args:
+            file_name: Nom du fichier de la tâche
+            signature: Signature du fichier (voir storage.file_signature)
+            task: Tâche (ou son résumé, voir records.Task)
+        """
+        summary = Task(
+            self._clean_text(task.id), self._clean_text(task.title), None,
+            task.start, task.end, self._clean_text(task.status)
+        )
+        self.entries[file_name] = (signature, summary)
+
+        name = file_name.encode('utf-8')
+        task_id = summary.id.encode('utf-8')
+        title = summary.title.encode('utf-8')
+        status = summary.status.encode('utf-8')
+
+        self._append(self.LOG_RECORD.pack(
+            self.KIND_TASK, *signature, *self._date_ordinals(summary),
+            len(name), len(task_id), len(title), len(status)
+        ) + name + task_id + title + status)
+
+    def forget(self, file_name):
+        """
+        Retire l'entrée d'un fichier de tâche supprimé
+
+        Args:
+            file_name: Nom du fichier de la tâche
+        """
+        if self.entries.pop(file_name, None) is None:
+            return
+
+        name = file_name.encode('utf-8')
+        self._append(self.LOG_RECORD.pack(self.KIND_DELETE, 0, 0, -1, -1, 0, 0, len(name), 0, 0, 0) + name)
+
+    def summary(self, file_name):
+        """
+        Retourne le résumé connu d'un fichier de tâche
+
+        Args:
+            file_name: Nom du fichier de la tâche
+
+        Returns:
+            Task: Résumé de la tâche ou None
+        """
+        entry = self.entries.get(file_name)
+        return entry[1] if entry else None
+
+    def _append(self, data):
+        """
+        Ajoute un enregistrement à la fin du journal du manifeste (écrit au prochain flush)
+
+        Args:
+            data: Enregistrement encodé
+        """
+        self.open()
+        self.pending.append(data)
+        self.log_records += 1
+
+    def open(self):
+        """
+        Ouvre le manifeste en ajout seul, s'il ne l'est pas déjà
+
+        Appelé avant d'écrire un fichier de tâche : une erreur à l'ouverture
+        survient avant l'écriture, jamais entre l'écriture et son enregistrement.
+
+        L'en-tête est relu, verrou tenu : une autre instance a pu créer, compacter
+        ou compléter le manifeste depuis sa lecture. Un manifeste absent ou
+        illisible est recréé avec une base vide ; un enregistrement tronqué en
+        fin de fichier (arrêt brutal) est écarté.
+        """
+        if self.fd is not None:
+            return
+
+        # O_BINARY : pas de conversion des fins de ligne sous Windows
+        self.fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+        with self._locked():
+            size = os.fstat(self.fd).st_size
+            log_start = 0
+            if size >= self.HEADER.size:
+                magic, version, base_count, blob_length = self.HEADER.unpack(self._read_at(0, self.HEADER.size))
+                if magic == self.MAGIC and version == self.VERSION:
+                    log_start = self.HEADER.size + base_count * self.BASE_RECORD.size + blob_length
+
+            if not log_start or log_start > size:
+                # Pas de manifeste valide : en créer un, avec une base vide
+                os.ftruncate(self.fd, 0)
+                os.write(self.fd, self.HEADER.pack(self.MAGIC, self.VERSION, 0, 0))
+                return
+
+            end = log_start + self._log_end(self._read_at(log_start, size - log_start))
+            if end < size:
+                os.ftruncate(self.fd, end)
+
+    def _read_at(self, offset, length):
+        """
+        Lit une partie du manifeste ouvert (os.pread n'existe pas sous Windows)
+
+        Les écritures restent à la fin du fichier (O_APPEND) quelle que soit la position de lecture.
+
+        Args:
+            offset: Position du début
+            length: Nombre d'octets
+
+        Returns:
+            bytes: Les octets lus (moins en fin de fichier)
+        """
+        os.lseek(self.fd, offset, os.SEEK_SET)
+        chunks = []
+        while length > 0:
+            chunk = os.read(self.fd, length)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            length -= len(chunk)
+        return b"".join(chunks)
+
+    def _log_end(self, data):
+        """
+        Retourne la fin du dernier enregistrement complet d'un morceau du journal
+
+        Args:
+            data: Enregistrements du journal (bytes), à partir du début d'un enregistrement
+
+        Returns:
+            int: Position de la fin du dernier enregistrement complet
+        """
+        record = self.LOG_RECORD
+        offset = 0
+        while offset + record.size <= len(data):
+            record_end = offset + record.size + sum(record.unpack_from(data, offset)[-4:])
+            if record_end > len(data):
+                break
+            offset = record_end
+        return offset
+
+    @contextmanager
+    def _locked(self):
+        """
+        Verrou exclusif court du manifeste, partagé avec les autres instances (sans effet sans fcntl)
+        """
+        if fcntl is None:
+            yield
+            return
+        fcntl.lockf(self.fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN)
+
+    def flush(self):
+        """
+        Écrit sur le disque les enregistrements en attente, en un seul ajout
+        """
+        if self.pending:
+            data = b"".join(self.pending)
+            self.pending = []
+            with self._locked():
+                os.write(self.fd, data)
+
+    def needs_compaction(self):
+        """
+        Indique si le journal du manifeste est assez long pour être intégré à la base
+        """
+        return self.log_records >= self.COMPACT_LOG_RECORDS
+
+    def compact(self):
+        """
+        Réécrit le manifeste avec toutes les entrées dans la base et un journal vide
+        """
+        self.close()
+
+        pack = self.BASE_RECORD.pack
+        rows = []
+        strings = []
+        for file_name, (signature, summary) in self.entries.items():
+            rows.append(pack(*signature, *self._date_ordinals(summary)))
+            strings.extend((file_name, summary.id, summary.title, summary.status))
+
+        blob = '\x00'.join(strings).encode('utf-8')
+        data = b"".join([self.HEADER.pack(self.MAGIC, self.VERSION, len(rows), len(blob))] + rows + [blob])
+        atomic_write(self.path, data)
+
+        self.log_records = 0
+
+    def close(self):
+        """
+        Écrit les enregistrements en attente et ferme le manifeste
+        """
+        if self.fd is not None:
+            self.flush()
+            os.close(self.fd)
+            self.fd = None
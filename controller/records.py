@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+from datetime import date
+
+# Date ISO (AAAA-MM-JJ) -> date, beaucoup de tâches partageant les mêmes dates
+_dates = {}
+
+
+def parse_date(value):
+    """
+    Convertit une date AAAA-MM-JJ en objet date, une seule fois par valeur distincte
+
+    Les dates déjà converties sont réutilisées : les tâches d'une même date
+    partagent le même objet.
+
+    Args:
+        value: Date au format AAAA-MM-JJ, objet date ou None
+
+    Returns:
+        date: La date, ou None si elle est absente ou invalide
+    """
+    if value is None or isinstance(value, date):
+        return value
+    parsed = _dates.get(value)
+    if parsed is None:
+        try:
+            parsed = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+        _dates[value] = parsed
+    return parsed
+
+
+def format_date(value):
+    """
+    Convertit une date en texte AAAA-MM-JJ
+
+    Args:
+        value: Objet date ou None
+
+    Returns:
+        str: Date au format AAAA-MM-JJ ou None
+    """
+    return value.isoformat() if value is not None else None
+
+
+class Comment:
+    """
+    Commentaire d'une tâche : ID, texte et date de création (AAAA-MM-JJ HH:MM:SS)
+    """
+
+    __slots__ = ("id", "text", "created_at")
+
+    def __init__(self, id, text="", created_at=None):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Construit un commentaire depuis son dictionnaire JSON (id, text, created_at)
+        """
+        return cls(data.get("id"), data.get("text", ""), data.get("created_at"))
+
+    def to_dict(self):
+        """
+        Retourne le dictionnaire JSON du commentaire (id, text, created_at)
+        """
+        return {"id": self.id, "text": self.text, "created_at": self.created_at}
+
+    def __eq__(self, other):
+        if not isinstance(other, Comment):
+            return NotImplemented
+        return (self.id, self.text, self.created_at) == (other.id, other.text, other.created_at)
+
+    def __repr__(self):
+        return f"Comment({self.id!r}, {self.text!r}, {self.created_at!r})"
+
+
+class Task:
+    """
+    Tâche : champs typés au lieu d'un dictionnaire à clés françaises
+
+    Les dates sont des objets date, convertis une seule fois à la lecture, et le
+    statut est internalisé (sys.intern) : les milliers de tâches d'un même statut
+    partagent la même chaîne. Grâce à __slots__, une tâche n'a pas de
+    dictionnaire d'attributs.
+
+    Un résumé (la tâche gardée en mémoire pour la liste et les filtres) est une
+    tâche sans description ni commentaires (None) ; la tâche complète est lue à
+    la demande sur le support de stockage.
+
+    Sur le disque, le format JSON reste celui d'origine (ID, Titre, Description,
+    DateStart, DateEnd, Status, Commentaires) : voir from_dict et to_dict.
+
+    La version compte les enregistrements complets de la tâche, pour détecter
+    une modification faite par une autre instance entre la lecture et la
+    sauvegarde (voir TaskStore.commit_task). Elle n'est connue que des tâches
+    complètes : un résumé a la version 0.
+    """
+
+    __slots__ = ("id", "title", "description", "start", "end", "_status", "comments", "version")
+
+    def __init__(self, id, title="Sans titre", description=None, start=None, end=None,
+                 status="", comments=None, version=0):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.start = start
+        self.end = end
+        self.status = status
+        self.comments = comments
+        self.version = version
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = sys.intern(value or "")
+
+    @property
+    def is_summary(self):
+        """
+        True si la tâche n'est qu'un résumé (sans description ni commentaires)
+        """
+        return self.comments is None
+
+    def summary(self):
+        """
+        Retourne le résumé de la tâche : les seuls champs affichés dans la liste et utilisés par les filtres
+
+        Returns:
+            Task: Résumé (ID, titre, dates et statut)
+        """
+        if self.is_summary:
+            return self
+        return Task(self.id, self.title, None, self.start, self.end, self._status)
+
+    def copy(self):
+        """
+        Retourne une copie de la tâche, avec sa propre liste de commentaires
+
+        Returns:
+            Task: La copie
+        """
+        return Task(
+            self.id, self.title, self.description, self.start, self.end, self._status,
+            list(self.comments) if self.comments is not None else None, self.version
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Construit une tâche depuis son dictionnaire JSON
+
+        Une tâche sans clé Commentaires est un résumé.
+
+        Args:
+            data: Dictionnaire de la tâche (ID, Titre, Description, DateStart, DateEnd, Status, Version, Commentaires)
+
+        Returns:
+            Task: La tâche
+        """
+        comments = data.get("Commentaires")
+        return cls(
+            data.get("ID"),
+            data.get("Titre", "Sans titre"),
+            data.get("Description", "") if comments is not None else None,
+            parse_date(data.get("DateStart")),
+            parse_date(data.get("DateEnd")),
+            data.get("Status", ""),
+            [Comment.from_dict(comment) for comment in comments] if comments is not None else None,
+            data.get("Version", 0)
+        )
+
+    def to_dict(self):
+        """
+        Retourne le dictionnaire JSON de la tâche, au format des fichiers data/*.json
+
+        Les dates absentes sont omises, comme la version d'une tâche jamais enregistrée ;
+        un résumé n'a ni Description ni Commentaires.
+
+        Returns:
+            dict: Dictionnaire de la tâche
+        """
+        data = {"ID": self.id, "Titre": self.title}
+        if self.description is not None:
+            data["Description"] = self.description
+        if self.start is not None:
+            data["DateStart"] = self.start.isoformat()
+        if self.end is not None:
+            data["DateEnd"] = self.end.isoformat()
+        data["Status"] = self._status
+        if self.version:
+            data["Version"] = self.version
+        if self.comments is not None:
+            data["Commentaires"] = [comment.to_dict() for comment in self.comments]
+        return data
+
+    @classmethod
+    def from_json(cls, text):
+        """
+        Construit une tâche depuis le contenu JSON d'un fichier de tâche
+
+        Args:
+            text: Contenu JSON (str ou bytes)
+
+        Returns:
+            Task: La tâche
+        """
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self, indent=2):
+        """
+        Retourne le contenu JSON de la tâche, au format des fichiers data/*.json
+
+        Args:
+            indent: Indentation (None pour une seule ligne, ex. JSONL)
+
+        Returns:
+            str: Contenu JSON
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return (
+            (self.id, self.title, self.description, self.start, self.end, self._status, self.comments)
+            == (other.id, other.title, other.description, other.start, other.end, other._status, other.comments)
+        )
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.title!r}, status={self._status!r}, start={self.start}, end={self.end})"
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+from .writer import atomic_write
+
+# Accents et autres signes diacritiques une fois le texte décomposé (NFKD)
+COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+TOKEN_PATTERN = re.compile(r"\w+")
+LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+
+# Mots trop fréquents en français pour être utiles à la recherche
+STOP_WORDS = frozenset(
+    "au aux avec ce ces dans de des du elle en et il ils je la le les leur lui ma mais me meme "
+    "mes moi mon ne nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu "
+    "un une vos votre vous est sont".split()
+)
+
+
+def normalize_text(text):
+    """
+    Met un texte en minuscules et retire ses accents ("Tâche Réalisée" -> "tache realisee")
+
+    Args:
+        text: Texte à normaliser
+
+    Returns:
+        str: Texte normalisé
+    """
+    text = unicodedata.normalize("NFKD", text.casefold().translate(LIGATURES))
+    return COMBINING_MARKS.sub("", text)
+
+
+def tokenize(text):
+    """
+    Découpe un texte en mots normalisés, sans les mots d'une lettre ni les mots vides
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        list: Liste des mots
+    """
+    return [
+        token for token in TOKEN_PATTERN.findall(normalize_text(text or ""))
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+class SearchIndex:
+    """
+    Index inversé des mots des tâches : titre, description et texte des commentaires
+
+    Pour chaque mot, l'index garde les tâches qui le contiennent et un poids
+    (nombre d'occurrences, les mots du titre comptant triple). Une recherche ne
+    parcourt donc que les tâches contenant les mots demandés, cherchés comme
+    préfixes (« réu » trouve « réunion ») pour filtrer pendant la saisie.
+
+    L'index est mis à jour à chaque sauvegarde de tâche ou de commentaire et
+    enregistré dans data/.search_index à la fermeture. Le fichier est supprimé
+    dès la première modification : après un arrêt brutal, l'index est reconstruit
+    au lieu de rester désynchronisé.
+    """
+
+    FILE_NAME = ".search_index"
+    VERSION = 1
+    TITLE_WEIGHT = 3
+
+    def __init__(self, data_folder):
+        """
+        Args:
+            data_folder: Dossier où enregistrer l'index
+        """
+        self.path = os.path.join(data_folder, self.FILE_NAME)
+        # Mot -> {ID de la tâche: poids}
+        self.postings = {}
+        # ID de la tâche -> {mot: poids}
+        self.documents = {}
+        # Vocabulaire trié, pour chercher les mots commençant par un préfixe
+        self.vocabulary = []
+        self.loaded = False
+        self.dirty = False
+        # L'index est chargé et complété dans des threads du QThreadPool
+        self.lock = threading.RLock()
+
+    def load(self):
+        """
+        Charge l'index enregistré, sans écraser les tâches déjà indexées depuis le démarrage
+        """
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                return
+            except Exception as e:
+                print(f"Index de recherche illisible, il sera reconstruit : {e}")
+                return
+
+            if data.get("version") != self.VERSION:
+                return
+
+            for task_id, terms in data.get("documents", {}).items():
+                if task_id not in self.documents:
+                    self._add(task_id, terms)
+            self.vocabulary = sorted(self.postings)
+
+            # Tâches déjà indexées depuis le démarrage : le fichier n'est plus à jour
+            if self.dirty:
+                self._remove_file()
+
+    def save(self):
+        """
+        Enregistre l'index s'il a été modifié depuis son chargement
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            self.load()
+
+            data = json.dumps(
+                {"version": self.VERSION, "documents": self.documents},
+                ensure_ascii=False, separators=(',', ':')
+            )
+            atomic_write(self.path, data)
+            self.dirty = False
+
+    def _mark_dirty(self):
+        """
+        Supprime l'index enregistré à la première modification, pour qu'un arrêt brutal entraîne sa reconstruction
+        """
+        if self.dirty:
+            return
+        self.dirty = True
+        if self.loaded:
+            self._remove_file()
+
+    def _remove_file(self):
+        """
+        Supprime l'index enregistré
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def extract_terms(cls, task):
+        """
+        Calcule les mots d'une tâche et leur poids
+
+        Args:
+            task: Tâche complète (voir records.Task)
+
+        Returns:
+            dict: Mot -> poids
+        """
+        terms = {}
+        for token in tokenize(task.title or ""):
+            terms[token] = terms.get(token, 0) + cls.TITLE_WEIGHT
+
+        texts = [task.description or ""]
+        texts.extend(comment.text or "" for comment in task.comments or ())
+        for text in texts:
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0) + 1
+        return terms
+
+    def index_task(self, task, replace=True):
+        """
+        Indexe (ou réindexe) une tâche complète
+
+        Args:
+            task: Tâche complète (voir records.Task)
+            replace: False pour ne pas remplacer une tâche déjà indexée (indexation en arrière-plan)
+        """
+        task_id = task.id
+        terms = self.extract_terms(task)
+
+        with self.lock:
+            if task_id in self.documents:
+                if not replace or self.documents[task_id] == terms:
+                    return
+                self._remove(task_id)
+
+            self._add(task_id, terms, keep_sorted=True)
+            self._mark_dirty()
+
+    def remove_task(self, task_id):
+        """
+        Retire une tâche de l'index
+
+        Args:
+            task_id: ID de la tâche
+        """
+        with self.lock:
+            if task_id in self.documents:
+                self._remove(task_id)
+                self._mark_dirty()
+
+    def _add(self, task_id, terms, keep_sorted=False):
+        """
+        Ajoute les mots d'une tâche aux listes de l'index
+
+        Args:
+            task_id: ID de la tâche
+            terms: Mot -> poids
+            keep_sorted: True pour insérer les nouveaux mots dans le vocabulaire trié
+        """
+        self.documents[task_id] = terms
+        for token, weight in terms.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                if keep_sorted:
+                    insort(self.vocabulary, token)
+            posting[task_id] = weight
+
+    def _remove(self, task_id):
+        """
+        Retire les mots d'une tâche des listes de l'index
+
+        Args:
+            task_id: ID de la tâche
+        """
+        for token in self.documents.pop(task_id):
+            posting = self.postings[token]
+            del posting[task_id]
+            if not posting:
+                del self.postings[token]
+                position = bisect_left(self.vocabulary, token)
+                if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                    del self.vocabulary[position]
+
+    def has_task(self, task_id):
+        """
+        Indique si une tâche est indexée
+        """
+        return task_id in self.documents
+
+    def task_ids(self):
+        """
+        Retourne les IDs des tâches indexées
+
+        Returns:
+            set: IDs des tâches
+        """
+        with self.lock:
+            return set(self.documents)
+
+    def _expand_prefix(self, prefix):
+        """
+        Retourne les mots du vocabulaire commençant par un préfixe
+        """
+        position = bisect_left(self.vocabulary, prefix)
+        tokens = []
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            tokens.append(self.vocabulary[position])
+            position += 1
+        return tokens
+
+    def search(self, query, limit=None):
+        """
+        Cherche les tâches contenant tous les mots d'une requête, les plus pertinentes en premier
+
+        Chaque mot de la requête est cherché comme préfixe. Le score d'une tâche est
+        la somme, pour chaque mot trouvé, de son poids dans la tâche multiplié par
+        la rareté du mot (idf).
+
+        Args:
+            query: Texte de la requête
+            limit: Nombre maximal de résultats (None pour tous)
+
+        Returns:
+            list: IDs des tâches trouvées, triés par pertinence
+        """
+        words = TOKEN_PATTERN.findall(normalize_text(query))
+        if not words:
+            return []
+
+        # Le dernier mot est gardé tel quel pendant la saisie ("de" peut devenir "demain")
+        tokens = [token for token in words[:-1] if len(token) > 1 and token not in STOP_WORDS]
+        tokens.append(words[-1])
+
+        with self.lock:
+            total = max(len(self.documents), 1)
+
+            # Listes de chaque mot de la requête (tous les mots du vocabulaire ayant ce préfixe)
+            token_postings = []
+            for token in tokens:
+                postings = [self.postings[matched] for matched in self._expand_prefix(token)]
+                if not postings:
+                    return []
+                token_postings.append(postings)
+
+            # Partir du mot le plus rare : les mots suivants ne sont cherchés que parmi ses tâches
+            token_postings.sort(key=lambda postings: sum(len(posting) for posting in postings))
+
+            scores = {}
+            for posting in token_postings[0]:
+                idf = math.log(1 + total / len(posting))
+                for task_id, weight in posting.items():
+                    scores[task_id] = scores.get(task_id, 0) + weight * idf
+
+            for postings in token_postings[1:]:
+                weighted = [(posting, math.log(1 + total / len(posting))) for posting in postings]
+                next_scores = {}
+                for task_id, score in scores.items():
+                    token_score = 0
+                    for posting, idf in weighted:
+                        weight = posting.get(task_id)
+                        if weight:
+                            token_score += weight * idf
+                    if token_score:
+                        next_scores[task_id] = score + token_score
+                scores = next_scores
+                if not scores:
+                    return []
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return ranked[:limit] if limit is not None else ranked
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import sys
+from bisect import bisect_left, bisect_right
+
+from .search_index import normalize_text
+
+# Tris de la liste des tâches : clé -> libellé
+SORT_FIELDS = {
+    "end": "Échéance",
+    "start": "Date de début",
+    "title": "Titre",
+    "status": "Statut",
+}
+
+# Champs dont la clé se calcule sans coût notable : leur première page est choisie sans construire
+# la liste triée (la clé d'un titre retire ses accents : elle n'est calculée qu'une fois, dans la liste)
+HEAP_FIELDS = ("end", "start", "status")
+# Clé d'une date absente : les tâches sans date sont classées après les autres
+MISSING_DATE = sys.maxsize
+
+
+def sort_key(field, summary):
+    """
+    Retourne la clé de tri d'une tâche, suivie de son ID pour départager les égalités
+
+    Les dates sont comparées par leur numéro de jour, les titres sans tenir compte
+    des accents ni des majuscules.
+
+    Args:
+        field: Champ du tri (voir SORT_FIELDS)
+        summary: Résumé de la tâche (voir records.Task)
+
+    Returns:
+        tuple: (clé, ID de la tâche)
+
+    Raises:
+        ValueError: Si le champ est inconnu
+    """
+    if field == "end":
+        key = summary.end.toordinal() if summary.end is not None else MISSING_DATE
+    elif field == "start":
+        key = summary.start.toordinal() if summary.start is not None else MISSING_DATE
+    elif field == "title":
+        key = normalize_text(summary.title or "")
+    elif field == "status":
+        key = summary.status or ""
+    else:
+        raise ValueError(f"Tri inconnu : {field} ({', '.join(SORT_FIELDS)})")
+    return key, summary.id
+
+
+class DescendingKey:
+    """
+    Clé de tri inversée : les tâches d'un tri décroissant se comparent dans l'ordre d'affichage
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def row_key(field, descending=False):
+    """
+    Retourne la fonction de clé des lignes de la liste, croissante dans l'ordre d'affichage
+
+    Args:
+        field: Champ du tri (voir SORT_FIELDS)
+        descending: True pour l'ordre décroissant
+
+    Returns:
+        function: Résumé -> clé (voir sort_key)
+    """
+    if descending:
+        return lambda summary: DescendingKey(sort_key(field, summary))
+    return lambda summary: sort_key(field, summary)
+
+
+class SortIndex:
+    """
+    Listes triées des clés de tri des tâches, une par champ de tri
+
+    La liste d'un champ n'est construite qu'au premier tri sur ce champ, puis
+    tenue à jour à chaque modification (insertion par dichotomie) : changer
+    de tri ne relit aucun fichier et ne recalcule pas les clés. Les pages
+    sont lues par curseur (la clé de la dernière tâche de la page précédente) :
+    une page coûte un bisect et le nombre de tâches retournées, quel que soit
+    le nombre de tâches.
+    """
+
+    def __init__(self, tasks):
+        """
+        Args:
+            tasks: Dictionnaire ID -> résumé des tâches, partagé avec le dépôt
+        """
+        self.tasks = tasks
+        # Champ -> liste triée des (clé, ID)
+        self.keys = {}
+
+    def reset(self):
+        """
+        Oublie les listes construites, après un chargement en masse des résumés
+        """
+        self.keys = {}
+
+    def _keys(self, field):
+        """
+        Retourne la liste triée d'un champ, construite au premier appel
+        """
+        keys = self.keys.get(field)
+        if keys is None:
+            keys = self.keys[field] = sorted(sort_key(field, summary) for summary in self.tasks.values())
+        return keys
+
+    def update(self, previous, summary):
+        """
+        Met à jour les clés d'une tâche dans les listes construites
+
+        Args:
+            previous: Résumé précédent de la tâche (None pour une nouvelle tâche)
+            summary: Nouveau résumé
+        """
+        for field, keys in self.keys.items():
+            key = sort_key(field, summary)
+            if previous is not None:
+                previous_key = sort_key(field, previous)
+                if previous_key == key:
+                    continue
+                self._delete(keys, previous_key)
+            keys.insert(bisect_left(keys, key), key)
+
+    def remove(self, summary):
+        """
+        Retire les clés d'une tâche des listes construites
+
+        Args:
+            summary: Résumé de la tâche retirée
+        """
+        for field, keys in self.keys.items():
+            self._delete(keys, sort_key(field, summary))
+
+    @staticmethod
+    def _delete(keys, key):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def sort(self, summaries, field, descending=False):
+        """
+        Trie une sélection de tâches (résultat d'un filtre)
+
+        Une sélection couvrant une grande partie des tâches est lue dans l'ordre de
+        la liste triée du champ, sans calculer ses clés ; une petite sélection est triée directement.
+
+        Args:
+            summaries: Liste de résumés
+            field: Champ du tri
+            descending: True pour l'ordre décroissant
+
+        Returns:
+            list: Résumés triés
+        """
+        if len(summaries) * 8 >= len(self.tasks) and (field in self.keys or len(summaries) == len(self.tasks)):
+            selected = {summary.id for summary in summaries}
+            keys = self._keys(field)
+            ordered = reversed(keys) if descending else keys
+            return [self.tasks[task_id] for _, task_id in ordered if task_id in selected]
+        return sorted(summaries, key=lambda summary: sort_key(field, summary), reverse=descending)
+
+    def page(self, field, descending=False, after=None, limit=100, accept=None):
+        """
+        Retourne une page de tâches dans l'ordre d'un champ
+
+        La première page d'un tri par date ou par statut dont la liste n'est pas
+        encore construite est choisie sans trier toutes les tâches (heapq) ; la
+        liste est construite à la page suivante.
+
+        Args:
+            field: Champ du tri
+            descending: True pour l'ordre décroissant
+            after: Curseur de la page précédente (None pour la première page)
+            limit: Nombre maximal de tâches
+            accept: Fonction ID -> bool des tâches à retenir (toutes par défaut)
+
+        Returns:
+            tuple: (IDs des tâches, curseur de la page suivante ou None à la fin)
+        """
+        if after is None and accept is None and field not in self.keys and field in HEAP_FIELDS:
+            keys = (sort_key(field, summary) for summary in self.tasks.values())
+            page = heapq.nlargest(limit, keys) if descending else heapq.nsmallest(limit, keys)
+            cursor = page[-1] if page and len(self.tasks) > limit else None
+            return [task_id for _, task_id in page], cursor
+
+        keys = self._keys(field)
+        if descending:
+            end = bisect_left(keys, after) if after is not None else len(keys)
+            positions = range(end - 1, -1, -1)
+        else:
+            start = bisect_right(keys, after) if after is not None else 0
+            positions = range(start, len(keys))
+
+        page = []
+        last = None
+        for position in positions:
+            key = keys[position]
+            if accept is not None and not accept(key[1]):
+                continue
+            if len(page) == limit:
+                # Il reste au moins une tâche : la page suivante reprend après la dernière retournée
+                return page, last
+            page.append(key[1])
+            last = key
+        return page, None
@@ -0,0 +1,1537 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows : pas de verrou entre instances, seules les versions protègent les sauvegardes
+    fcntl = None
+
+from .file_format import DEFAULT_FORMAT, check_format, decode_dict, detect_format, encode_dict, encode_task
+from .instrumentation import metrics
+from .manifest import TaskManifest
+from .records import Comment, Task, format_date, parse_date
+from .writer import BackgroundWriter, atomic_write, atomic_write_many
+
+# Sous-dossiers de la disposition en sous-dossiers : 00 à ff
+SHARD_NAMES = frozenset(f"{shard:02x}" for shard in range(256))
+
+
+def shard_name(task_id):
+    """
+    Retourne le sous-dossier d'une tâche dans la disposition en sous-dossiers
+
+    Le nom est tiré d'un hachage de l'ID (et non de ses premiers caractères) :
+    les tâches sont réparties également même quand les IDs importés se
+    ressemblent (tache-1, tache-2...).
+
+    Args:
+        task_id: ID de la tâche
+
+    Returns:
+        str: Deux chiffres hexadécimaux (00 à ff)
+    """
+    return f"{zlib.crc32(task_id.encode('utf-8')) & 0xFF:02x}"
+
+
+def scan_task_files(data_folder, journal_suffix):
+    """
+    Liste les fichiers de tâches et leurs journaux, à la racine du dossier data et dans ses sous-dossiers 00 à ff
+
+    Les deux dispositions sont lues : un dossier en cours de migration, ou
+    complété par une synchronisation dans l'autre disposition, reste lisible.
+
+    Args:
+        data_folder: Dossier des données
+        journal_suffix: Suffixe des journaux de commentaires
+
+    Returns:
+        tuple: (nom relatif du fichier -> os.DirEntry, nom relatif sans suffixe -> os.DirEntry du journal)
+    """
+    task_entries = {}
+    journal_entries = {}
+    shards = []
+
+    with os.scandir(data_folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(journal_suffix):
+                journal_entries[entry.name[:-len(journal_suffix)]] = entry
+            elif entry.name.endswith('.json') and entry.is_file():
+                task_entries[entry.name] = entry
+            elif entry.name in SHARD_NAMES and entry.is_dir():
+                shards.append(entry.name)
+
+    for shard in shards:
+        with os.scandir(os.path.join(data_folder, shard)) as entries:
+            for entry in entries:
+                if entry.name.endswith(journal_suffix):
+                    journal_entries[f"{shard}/{entry.name[:-len(journal_suffix)]}"] = entry
+                elif entry.name.endswith('.json') and entry.is_file():
+                    task_entries[f"{shard}/{entry.name}"] = entry
+
+    return task_entries, journal_entries
+
+
+def folder_format(data_folder):
+    """
+    Retourne le format des fichiers de tâches enregistré dans le dossier data (voir convert_folder)
+
+    Args:
+        data_folder: Dossier des données
+
+    Returns:
+        str: Format enregistré, json par défaut
+    """
+    try:
+        with open(os.path.join(data_folder, JsonFolderStore.FORMAT_MARKER), 'r', encoding='utf-8') as f:
+            return f.read().strip() or DEFAULT_FORMAT
+    except FileNotFoundError:
+        return DEFAULT_FORMAT
+
+
+def file_signature(stat, journal_stat=None):
+    """
+    Signature d'un fichier de tâche et de son journal, pour détecter une modification sans le relire
+
+    Args:
+        stat: Résultat de os.stat du fichier de la tâche
+        journal_stat: Résultat de os.stat du journal des commentaires (ou None)
+
+    Returns:
+        tuple: (mtime_ns, taille, mtime_ns du journal, taille du journal), -1 pour un journal absent
+    """
+    if journal_stat is None:
+        return (stat.st_mtime_ns, stat.st_size, -1, -1)
+    return (stat.st_mtime_ns, stat.st_size, journal_stat.st_mtime_ns, journal_stat.st_size)
+
+
+class VersionConflict(Exception):
+    """
+    Sauvegarde refusée : la tâche a été enregistrée ou supprimée par une autre instance depuis sa lecture
+    """
+
+    def __init__(self, task, current, base=None):
+        """
+        Args:
+            task: La tâche dont la sauvegarde est refusée (avec la version lue)
+            current: La tâche enregistrée sur le support de stockage (None si elle a été supprimée)
+            base: La tâche telle qu'elle a été lue avant la modification, si elle est connue
+        """
+        self.task = task
+        self.current = current
+        self.base = base
+        if current is None:
+            message = f"Tâche supprimée par une autre instance : {task.id}"
+        else:
+            message = (
+                f"Tâche modifiée par une autre instance : {task.id} "
+                f"(version {task.version} lue, version {current.version} enregistrée)"
+            )
+        super().__init__(message)
+
+
+class TaskStore:
+    """
+    Interface commune des supports de stockage des tâches
+    """
+
+    def scan(self):
+        """
+        Retourne les tâches modifiées depuis le dernier scan
+
+        Returns:
+            tuple: (liste des tâches ajoutées ou modifiées, liste des IDs supprimés)
+        """
+        changed_tasks = []
+        removed_ids = []
+        for batch_tasks, batch_removed_ids in self.iter_scan():
+            changed_tasks.extend(batch_tasks)
+            removed_ids.extend(batch_removed_ids)
+        return changed_tasks, removed_ids
+
+    def iter_scan(self, batch_size=200):
+        """
+        Parcourt les tâches modifiées depuis le dernier scan, par lots
+
+        Peut être appelé depuis un thread de chargement. Un parcours interrompu
+        reprend au prochain scan là où il s'était arrêté.
+
+        Args:
+            batch_size: Nombre maximal de tâches par lot
+
+        Yields:
+            tuple: (liste des tâches ajoutées ou modifiées, liste des IDs supprimés)
+        """
+        raise NotImplementedError
+
+    def cached_summaries(self):
+        """
+        Retourne les résumés de tâches disponibles sans lire les tâches elles-mêmes
+
+        Returns:
+            list: Liste de résumés (voir records.Task)
+        """
+        return []
+
+    def read_task(self, task_id):
+        """
+        Lit une tâche complète (description et commentaires compris)
+
+        Args:
+            task_id: ID de la tâche
+
+        Returns:
+            Task: La tâche ou None si elle n'existe pas
+        """
+        raise NotImplementedError
+
+    def write_tasks(self, tasks):
+        """
+        Enregistre un lot de tâches complètes (import en masse), sans contrôle de version
+
+        Le lot est sur le disque au retour de la méthode.
+
+        Args:
+            tasks: Liste des tâches
+        """
+        raise NotImplementedError
+
+    def commit_task(self, task, on_conflict=None, base=None):
+        """
+        Enregistre une tâche modifiée si personne d'autre ne l'a enregistrée depuis sa lecture
+
+        Contrôle de concurrence optimiste : la version de la tâche doit être
+        celle du support de stockage (0 pour une nouvelle tâche). La tâche est
+        enregistrée avec la version suivante ; ses commentaires sont ceux du
+        support de stockage : ils sont ajoutés ou modifiés un par un (voir
+        add_comment) et ne sont jamais en conflit.
+
+        Sans on_conflict, la tâche est sur le disque au retour de la méthode.
+        Avec on_conflict, l'écriture peut être faite plus tard par un thread
+        d'écriture : un conflit est alors signalé en appelant on_conflict,
+        éventuellement depuis ce thread.
+
+        Args:
+            task: La tâche (voir records.Task)
+            on_conflict: Fonction appelée avec le VersionConflict, au lieu de lever l'exception
+            base: La tâche avant la modification, transmise au conflit (voir VersionConflict)
+
+        Returns:
+            Task: La tâche telle qu'elle sera enregistrée (version suivante), ou None si
+                on_conflict a déjà été appelée
+
+        Raises:
+            VersionConflict: Sans on_conflict, si la tâche a été enregistrée ou supprimée ailleurs entre-temps
+        """
+        raise NotImplementedError
+
+    def commit_tasks(self, tasks, on_conflict=None):
+        """
+        Enregistre un lot de tâches modifiées, chacune avec le contrôle de version de commit_task
+
+        Les tâches en conflit ne sont pas enregistrées ; les autres le sont.
+
+        Args:
+            tasks: Liste des tâches
+            on_conflict: Fonction appelée avec chaque VersionConflict (voir commit_task)
+
+        Returns:
+            tuple: (tâches telles qu'elles seront enregistrées, liste des VersionConflict,
+                toujours vide avec on_conflict)
+        """
+        raise NotImplementedError
+
+    def delete_task(self, task_id):
+        """
+        Supprime une tâche
+
+        Args:
+            task_id: ID de la tâche à supprimer
+        """
+        raise NotImplementedError
+
+    def delete_tasks(self, task_ids):
+        """
+        Supprime un lot de tâches
+
+        Le lot est supprimé du disque au retour de la méthode.
+
+        Args:
+            task_ids: IDs des tâches à supprimer
+        """
+        for task_id in task_ids:
+            self.delete_task(task_id)
+        self.flush()
+
+    def add_comment(self, task_id, comment):
+        """
+        Ajoute un commentaire à une tâche sans réécrire les autres commentaires
+
+        Args:
+            task_id: ID de la tâche
+            comment: Le commentaire (voir records.Comment)
+        """
+        raise NotImplementedError
+
+    def delete_comment(self, task_id, comment_id):
+        """
+        Supprime un commentaire d'une tâche sans réécrire les autres commentaires
+
+        Args:
+            task_id: ID de la tâche
+            comment_id: ID du commentaire à supprimer
+        """
+        raise NotImplementedError
+
+    def update_comment(self, task_id, comment_id, text):
+        """
+        Modifie le texte d'un commentaire sans réécrire les autres commentaires
+
+        Args:
+            task_id: ID de la tâche
+            comment_id: ID du commentaire
+            text: Nouveau texte
+        """
+        raise NotImplementedError
+
+    def watch_paths(self):
+        """
+        Retourne les chemins à surveiller pour détecter les modifications faites hors de l'application
+
+        Returns:
+            list: Chemins de dossiers ou de fichiers
+        """
+        return []
+
+    def flush(self):
+        """
+        Attend que toutes les écritures en attente soient sur le disque
+        """
+
+    def close(self):
+        """
+        Libère les ressources du support de stockage
+        """
+
+
+class JsonFolderStore(TaskStore):
+    # Suffixe du journal des commentaires d'une tâche : <ID>.comments.jsonl
+    JOURNAL_SUFFIX = ".comments.jsonl"
+    # Présent dans le dossier data : les nouvelles tâches sont écrites dans des sous-dossiers (voir reshard_folder)
+    SHARDED_MARKER = ".sharded"
+    # Format des fichiers écrits, enregistré par convert_folder (voir controller.file_format)
+    FORMAT_MARKER = ".format"
+    # Taille du journal (en octets) au-delà de laquelle il est fusionné dans le fichier de la tâche
+    COMPACT_THRESHOLD = 256 * 1024
+    # Fichier des verrous d'écriture partagés entre les instances (voir task_lock)
+    LOCK_FILE = ".locks"
+    # Nombre de verrous : chaque tâche verrouille un octet du fichier, choisi d'après son ID
+    LOCK_STRIPES = 4096
+    # Clé des sauvegardes dans le thread d'écriture : toutes celles en attente sont écrites en un lot
+    COMMIT_KEY = ("commit",)
+
+    def __init__(self, data_folder, use_manifest=True, file_format=None):
+        """
+        Stockage d'origine : un fichier JSON par tâche dans le dossier data
+
+        Les commentaires ajoutés, modifiés ou supprimés sont écrits à la fin d'un journal
+        propre à chaque tâche, au lieu de réécrire tout le fichier de la tâche.
+        Toutes les écritures passent par un thread d'écriture en arrière-plan
+        (voir controller.writer) pour ne jamais bloquer l'interface.
+
+        Dans la disposition en sous-dossiers (fichier data/.sharded), chaque
+        tâche est écrite dans data/<sous-dossier>/<ID>.json (voir shard_name),
+        pour garder des dossiers de taille raisonnable avec des centaines de
+        milliers de tâches. Les deux dispositions sont toujours lues ; une
+        tâche trouvée dans l'autre disposition y est déplacée à sa prochaine
+        sauvegarde complète.
+
+        Les fichiers sont écrits en JSON indenté, en JSON compact ou en marshal
+        (voir controller.file_format) et lus quel que soit leur format.
+
+        Plusieurs instances peuvent partager le dossier : chaque écriture tient
+        le verrou de ses tâches (voir task_lock), et une sauvegarde complète
+        vérifie la version de la tâche (voir commit_task).
+
+        Args:
+            data_folder: Dossier contenant les fichiers JSON des tâches
+            use_manifest: False pour ignorer le manifeste et relire tous les fichiers
+            file_format: Format des fichiers écrits (variable GESTIONNAIRE_FORMAT,
+                sinon celui enregistré dans data/.format, sinon json)
+
+        Raises:
+            ValueError: Si le format est inconnu
+        """
+        self.data_folder = data_folder
+        # Nom de fichier relatif au dossier data -> (signature du fichier et de son journal, ID de la tâche),
+        # construit au premier usage (voir file_stats)
+        self._file_stats = None
+        # Protège file_stats et le manifeste, partagés avec le thread d'écriture
+        self.lock = threading.Lock()
+        # Sérialise les verrous de tâches des threads de cette instance (voir task_lock)
+        self.task_locks = threading.Lock()
+        self.writer = BackgroundWriter()
+        # Sauvegardes pas encore écrites (protégées par lock) :
+        # ID -> (version lue, tâche avant modification, tâche à écrire, fonction de conflit)
+        self.pending_commits = {}
+
+        # Créer le dossier data s'il n'existe pas
+        if not os.path.exists(self.data_folder):
+            os.makedirs(self.data_folder)
+
+        self.lock_fd = None
+        if fcntl is not None:
+            self.lock_fd = os.open(os.path.join(self.data_folder, self.LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o666)
+
+        self.sharded = os.path.exists(os.path.join(self.data_folder, self.SHARDED_MARKER))
+        self.file_format = check_format(
+            file_format or os.environ.get("GESTIONNAIRE_FORMAT") or folder_format(self.data_folder)
+        )
+        # Sous-dossiers dont l'existence a déjà été vérifiée
+        self.shard_folders = set()
+
+        # Résumés et signatures des fichiers connus lors de la dernière exécution
+        self.manifest = TaskManifest(self.data_folder)
+        if use_manifest:
+            self.manifest.load()
+
+    @property
+    def file_stats(self):
+        """
+        Signatures des fichiers connus, tirées du manifeste au premier usage (verrou tenu)
+
+        Le premier usage est le scan du thread de chargement : la construction ne
+        retarde pas l'affichage de la liste au démarrage.
+
+        Returns:
+            dict: Nom de fichier relatif -> (signature, ID de la tâche)
+        """
+        if self._file_stats is None:
+            self._file_stats = {
+                file_name: (signature, summary.id)
+                for file_name, (signature, summary) in self.manifest.entries.items()
+            }
+        return self._file_stats
+
+    def file_name(self, task_id, sharded=None):
+        """
+        Retourne le nom du fichier d'une tâche, relatif au dossier data
+
+        Args:
+            task_id: ID de la tâche
+            sharded: Disposition voulue (celle du dossier par défaut)
+
+        Returns:
+            str: <ID>.json ou <sous-dossier>/<ID>.json
+        """
+        if self.sharded if sharded is None else sharded:
+            return f"{shard_name(task_id)}/{task_id}.json"
+        return f"{task_id}.json"
+
+    def locate(self, task_id):
+        """
+        Retourne le nom relatif du fichier existant d'une tâche, dans l'une ou l'autre disposition
+
+        Returns:
+            str: Nom du fichier (celui de la disposition du dossier si la tâche n'existe pas)
+        """
+        file_name = self.file_name(task_id)
+        if not os.path.exists(os.path.join(self.data_folder, file_name)):
+            other_name = self.file_name(task_id, not self.sharded)
+            if os.path.exists(os.path.join(self.data_folder, other_name)):
+                return other_name
+        return file_name
+
+    def paths(self, file_name):
+        """
+        Retourne les chemins du fichier d'une tâche et de son journal des commentaires
+
+        Args:
+            file_name: Nom relatif du fichier de la tâche
+
+        Returns:
+            tuple: (chemin du fichier JSON, chemin du journal)
+        """
+        file_path = os.path.join(self.data_folder, file_name)
+        return file_path, file_path[:-len('.json')] + self.JOURNAL_SUFFIX
+
+    def task_path(self, task_id):
+        """
+        Retourne le chemin du fichier JSON d'une tâche
+        """
+        return self.paths(self.locate(task_id))[0]
+
+    def journal_path(self, task_id):
+        """
+        Retourne le chemin du journal des commentaires d'une tâche
+        """
+        return self.paths(self.locate(task_id))[1]
+
+    def _prepare_folder(self, file_name):
+        """
+        Crée si besoin le sous-dossier d'un fichier de tâche
+        """
+        folder = os.path.dirname(file_name)
+        if folder and folder not in self.shard_folders:
+            os.makedirs(os.path.join(self.data_folder, folder), exist_ok=True)
+            self.shard_folders.add(folder)
+
+    @contextmanager
+    def task_lock(self, *task_ids):
+        """
+        Verrouille l'écriture de tâches pour toutes les instances partageant le dossier data
+
+        Verrous consultatifs courts (fcntl.lockf) sur un octet du fichier
+        data/.locks par tâche : deux instances n'attendent l'une l'autre que
+        si elles écrivent la même tâche (ou deux tâches tombant sur le même
+        octet, voir LOCK_STRIPES). Les octets sont pris dans l'ordre croissant,
+        pour que deux lots ne puissent pas s'attendre mutuellement. Sans fcntl
+        (Windows), seul le verrou des threads de cette instance est pris.
+
+        Args:
+            *task_ids: IDs des tâches écrites
+        """
+        with self.task_locks:
+            if self.lock_fd is None:
+                yield
+                return
+
+            # Les verrous fcntl appartiennent au processus : task_locks empêche un autre
+            # thread de cette instance de les libérer ou de les reprendre en même temps
+            stripes = sorted({zlib.crc32(task_id.encode('utf-8')) % self.LOCK_STRIPES for task_id in task_ids})
+            locked = []
+            try:
+                with metrics.span("lock"):
+                    for stripe in stripes:
+                        fcntl.lockf(self.lock_fd, fcntl.LOCK_EX, 1, stripe)
+                        locked.append(stripe)
+                yield
+            finally:
+                for stripe in locked:
+                    fcntl.lockf(self.lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    def watch_paths(self):
+        # Fichiers ajoutés, supprimés ou remplacés (écriture atomique, synchronisation),
+        # à la racine et dans chaque sous-dossier
+        # Chercher les 256 sous-dossiers possibles plutôt que parcourir un dossier à plat de 100 000 fichiers
+        paths = [self.data_folder]
+        for shard in sorted(SHARD_NAMES):
+            path = os.path.join(self.data_folder, shard)
+            if os.path.isdir(path):
+                paths.append(path)
+        return paths
+
+    def cached_summaries(self):
+        """
+        Retourne les résumés du manifeste, sans ouvrir aucun fichier de tâche
+
+        Returns:
+            list: Liste de résumés (voir records.Task)
+        """
+        with self.lock:
+            return [summary for _, summary in self.manifest.entries.values()]
+
+    def read_task(self, task_id):
+        # Une sauvegarde encore en attente doit être écrite avant de relire le fichier
+        self.writer.flush()
+        with self.lock:
+            try:
+                return self._read_task(*self.paths(self.locate(task_id)))
+            except FileNotFoundError:
+                return None
+
+    def iter_scan(self, batch_size=200):
+        """
+        Ne relit que les tâches dont le fichier ou le journal a changé (date de modification ou taille)
+
+        Args:
+            batch_size: Nombre maximal de tâches par lot
+
+        Yields:
+            tuple: (liste des tâches ajoutées ou modifiées, liste des IDs supprimés)
+        """
+        changed_tasks = []
+        removed_ids = []
+        task_entries, journal_entries = scan_task_files(self.data_folder, self.JOURNAL_SUFFIX)
+
+        for file_name, entry in task_entries.items():
+            with self.lock:
+                journal_entry = journal_entries.get(file_name[:-len('.json')])
+                try:
+                    signature = file_signature(entry.stat(), journal_entry.stat() if journal_entry else None)
+                except FileNotFoundError:
+                    continue
+                known = self.file_stats.get(file_name)
+
+                # Fichier inchangé depuis le dernier scan : rien à relire
+                if known and known[0] == signature:
+                    continue
+
+                try:
+                    task = self._read_task(*self.paths(file_name))
+                except Exception as e:
+                    print(f"Erreur lors du chargement de {file_name}: {e}")
+                    continue
+
+                # Un fichier réécrit avec un autre ID remplace l'ancienne tâche
+                if known and known[1] != task.id:
+                    removed_ids.append(known[1])
+
+                self.file_stats[file_name] = (signature, task.id)
+                self.manifest.record(file_name, signature, task)
+
+            changed_tasks.append(task)
+            if len(changed_tasks) >= batch_size:
+                with self.lock:
+                    self.manifest.flush()
+                yield changed_tasks, removed_ids
+                changed_tasks = []
+                removed_ids = []
+
+        # Les fichiers disparus correspondent à des tâches supprimées
+        # (sauf ceux créés par le thread d'écriture depuis le début du parcours)
+        with self.lock:
+            for file_name in list(self.file_stats):
+                if file_name not in task_entries and not os.path.exists(os.path.join(self.data_folder, file_name)):
+                    removed_ids.append(self.file_stats.pop(file_name)[1])
+                    self.manifest.forget(file_name)
+            self.manifest.flush()
+
+        yield changed_tasks, removed_ids
+
+    def _read_task(self, file_path, journal_path):
+        """
+        Lit le fichier d'une tâche puis rejoue son journal de commentaires
+
+        Rejouer un enregistrement déjà intégré au fichier est sans effet : les
+        commentaires sont identifiés par leur ID.
+
+        Args:
+            file_path: Chemin du fichier JSON de la tâche
+            journal_path: Chemin du journal des commentaires
+
+        Returns:
+            Task: La tâche
+        """
+        with metrics.span("parse"):
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            task_data = decode_dict(data)
+        metrics.count("files_read")
+        metrics.count("bytes_read", len(data))
+
+        if not os.path.exists(journal_path):
+            return Task.from_dict(task_data)
+
+        with open(journal_path, 'rb') as f:
+            journal = f.read()
+        metrics.count("files_read")
+        metrics.count("bytes_read", len(journal))
+
+        comments = {comment["id"]: comment for comment in task_data.get("Commentaires", [])}
+        for line in journal.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Ligne tronquée par un arrêt brutal pendant l'ajout : ignorée
+                continue
+            if record.get("op") == "add":
+                comments[record["comment"]["id"]] = record["comment"]
+            elif record.get("op") == "del":
+                comments.pop(record.get("id"), None)
+            elif record.get("op") == "edit" and record.get("id") in comments:
+                comments[record["id"]] = dict(comments[record["id"]], text=record.get("text", ""))
+
+        task_data["Commentaires"] = list(comments.values())
+        return Task.from_dict(task_data)
+
+    def write_tasks(self, tasks):
+        # Les sauvegardes en attente de l'interface passent avant le lot
+        self.writer.flush()
+
+        with self.task_lock(*(task.id for task in tasks)):
+            self._write_batch(tasks, [self.locate(task.id) for task in tasks])
+
+    def _write_batch(self, tasks, previous_names):
+        """
+        Écrit les fichiers complets d'un lot de tâches avec une seule synchronisation du disque (verrous des tâches tenus)
+
+        Args:
+            tasks: Liste des tâches
+            previous_names: Noms relatifs des fichiers des tâches avant l'écriture
+        """
+        self._open_manifest()
+        file_names = [self.file_name(task.id) for task in tasks]
+        for file_name in file_names:
+            self._prepare_folder(file_name)
+        atomic_write_many([
+            (self.paths(file_name)[0], encode_task(task, self.file_format))
+            for task, file_name in zip(tasks, file_names)
+        ])
+
+        with self.lock:
+            for task, previous_name, file_name in zip(tasks, previous_names, file_names):
+                self._replace_files(task, previous_name, file_name)
+
+    def commit_task(self, task, on_conflict=None, base=None):
+        saved, conflicts = self._commit([task], on_conflict, {task.id: base})
+        if conflicts:
+            raise conflicts[0]
+        return saved[0]
+
+    def commit_tasks(self, tasks, on_conflict=None):
+        return self._commit(tasks, on_conflict)
+
+    def _commit(self, tasks, on_conflict, bases=None):
+        """
+        Programme la sauvegarde de tâches dans le thread d'écriture
+
+        Les sauvegardes rapprochées sont regroupées : toutes celles en attente
+        sont écrites en un seul lot (voir _write_commits), et une nouvelle
+        sauvegarde d'une tâche remplace celle encore en attente, en gardant la
+        version lue à l'origine.
+
+        Args:
+            tasks: Liste des tâches
+            on_conflict: Fonction appelée avec chaque VersionConflict (None pour attendre l'écriture)
+            bases: ID -> tâche avant la modification, optionnel
+
+        Returns:
+            tuple: (tâches telles qu'elles seront enregistrées, liste des VersionConflict)
+        """
+        conflicts = []
+        report = on_conflict or conflicts.append
+        saved = []
+        with self.lock:
+            for task in tasks:
+                base = bases.get(task.id) if bases else None
+                pending = self.pending_commits.get(task.id)
+                version = task.version
+                if pending is not None:
+                    version, base = pending[0], pending[1] or base
+                expected = task.copy()
+                expected.version = task.version + 1
+                # Copie écrite par le thread d'écriture : l'interface peut continuer à modifier la sienne
+                self.pending_commits[task.id] = (version, base, expected.copy(), report)
+                saved.append(expected)
+        self.writer.submit(self.COMMIT_KEY, self._write_commits, replace=True)
+
+        if on_conflict is None:
+            self.writer.flush()
+            conflicting = {conflict.task.id for conflict in conflicts}
+            saved = [task for task in saved if task.id not in conflicting]
+        return saved, conflicts
+
+    def _write_commits(self):
+        """
+        Écrit les sauvegardes en attente en un seul lot (exécuté dans le thread d'écriture)
+
+        La version de chaque fichier est comparée, verrou de la tâche tenu, à
+        celle lue avant la modification. Les tâches en conflit ne sont pas
+        écrites : leur conflit est signalé par la fonction donnée à la sauvegarde.
+        """
+        with self.lock:
+            pending = self.pending_commits
+            self.pending_commits = {}
+        if not pending:
+            return
+
+        tasks = []
+        previous_names = []
+        conflicts = []
+        with self.task_lock(*pending):
+            for task_id, (version, base, task, report) in pending.items():
+                previous_name = self.locate(task_id)
+                try:
+                    current = self._read_task(*self.paths(previous_name))
+                except FileNotFoundError:
+                    current = None
+
+                # Nouvelle tâche (version 0), sinon le fichier doit avoir la version lue
+                if not ((current is None and version == 0) or (current is not None and current.version == version)):
+                    task.version = version
+                    conflicts.append((report, VersionConflict(task, current, base)))
+                    continue
+
+                if current is not None:
+                    task.comments = current.comments
+                tasks.append(task)
+                previous_names.append(previous_name)
+
+            if tasks:
+                self._write_batch(tasks, previous_names)
+
+        with self.lock:
+            for position, (report, conflict) in enumerate(conflicts):
+                # Une sauvegarde faite depuis porte la version refusée : elle la remplace dans le conflit
+                later = self.pending_commits.pop(conflict.task.id, None)
+                if later is not None:
+                    _, _, task, report = later
+                    task.version = conflict.task.version
+                    conflicts[position] = (report, VersionConflict(task, conflict.current, conflict.base))
+
+        for report, conflict in conflicts:
+            report(conflict)
+
+    def _replace_files(self, task, previous_name, file_name):
+        """
+        Termine la réécriture complète d'une tâche : journal obsolète et ancien emplacement supprimés
+
+        Args:
+            task: La tâche écrite
+            previous_name: Nom relatif du fichier de la tâche avant l'écriture
+            file_name: Nom relatif du fichier écrit
+        """
+        # Le fichier contient désormais tous les commentaires : le journal est obsolète
+        journal_path = self.paths(file_name)[1]
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+
+        # Tâche lue dans l'autre disposition : elle a été déplacée
+        if previous_name != file_name:
+            self._remove_files(previous_name)
+
+        # Mémoriser la signature du fichier pour ne pas le relire au prochain scan
+        self._remember(task.id, task)
+
+    def delete_task(self, task_id):
+        # Une sauvegarde encore en attente de la tâche supprimée n'est pas écrite
+        with self.lock:
+            self.pending_commits.pop(task_id, None)
+        self.writer.submit(task_id, lambda: self._delete_files(task_id), replace=True)
+
+    def delete_tasks(self, task_ids):
+        with self.lock:
+            for task_id in task_ids:
+                self.pending_commits.pop(task_id, None)
+
+        # Les sauvegardes en attente passent avant le lot, qui ne réécrit le manifeste qu'une fois
+        self.writer.flush()
+        self._delete_files(*task_ids)
+
+    def _delete_files(self, *task_ids):
+        """
+        Supprime le fichier et le journal de tâches (exécuté dans le thread d'écriture)
+
+        Args:
+            *task_ids: IDs des tâches
+        """
+        with self.task_lock(*task_ids), self.lock:
+            self.manifest.open()
+            for task_id in task_ids:
+                for sharded in (self.sharded, not self.sharded):
+                    self._remove_files(self.file_name(task_id, sharded))
+            self.manifest.flush()
+
+    def _remove_files(self, file_name):
+        """
+        Supprime le fichier d'une tâche et son journal, et les oublie (verrou tenu)
+
+        Args:
+            file_name: Nom relatif du fichier de la tâche
+        """
+        for path in self.paths(file_name):
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.file_stats.pop(file_name, None)
+        self.manifest.forget(file_name)
+
+    def add_comment(self, task_id, comment):
+        self._append_journal(task_id, {"op": "add", "comment": comment.to_dict()})
+
+    def delete_comment(self, task_id, comment_id):
+        self._append_journal(task_id, {"op": "del", "id": comment_id})
+
+    def update_comment(self, task_id, comment_id, text):
+        self._append_journal(task_id, {"op": "edit", "id": comment_id, "text": text})
+
+    def _append_journal(self, task_id, record):
+        """
+        Programme l'ajout d'un enregistrement à la fin du journal des commentaires d'une tâche
+
+        Le coût ne dépend pas du nombre de commentaires déjà présents.
+
+        Args:
+            task_id: ID de la tâche
+            record: Enregistrement à ajouter ("add", "del" ou "edit")
+        """
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        self.writer.submit(task_id, lambda: self._write_journal(task_id, data))
+
+    def _write_journal(self, task_id, data):
+        """
+        Ajoute une ligne au journal (exécuté dans le thread d'écriture)
+
+        Quand le journal dépasse COMPACT_THRESHOLD, il est fusionné dans le fichier de la tâche.
+
+        Args:
+            task_id: ID de la tâche
+            data: Enregistrement JSON terminé par un retour à la ligne, encodé en UTF-8
+        """
+        with self.task_lock(task_id):
+            # Tâche supprimée entre-temps : ne pas recréer de journal orphelin
+            file_path, journal_path = self.paths(self.locate(task_id))
+            if not os.path.exists(file_path):
+                return
+
+            self._open_manifest()
+            with metrics.span("write"), open(journal_path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            metrics.count("bytes_written", len(data))
+
+            with self.lock:
+                journal_size = self._remember(task_id)
+
+        if journal_size >= self.COMPACT_THRESHOLD:
+            self.compact_journal(task_id)
+
+    def compact_journal(self, task_id):
+        """
+        Fusionne le journal des commentaires dans le fichier de la tâche
+
+        Exécuté dans le thread d'écriture, à la suite des autres écritures de la tâche.
+
+        Args:
+            task_id: ID de la tâche
+        """
+        try:
+            with self.task_lock(task_id):
+                file_path, journal_path = self.paths(self.locate(task_id))
+                task = self._read_task(file_path, journal_path)
+                self._open_manifest()
+                atomic_write(file_path, encode_task(task, self.file_format))
+
+                with self.lock:
+                    os.remove(journal_path)
+                    self._remember(task_id, task)
+
+            print(f"Journal des commentaires fusionné : {task_id}")
+
+        except Exception as e:
+            print(f"Erreur lors de la fusion du journal de {task_id} : {e}")
+
+    def flush(self):
+        """
+        Attend que toutes les écritures en attente soient sur le disque
+        """
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+        with self.lock:
+            if self.manifest.needs_compaction():
+                self.manifest.compact()
+            self.manifest.close()
+
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+            self.lock_fd = None
+
+    def _open_manifest(self):
+        """
+        Ouvre le manifeste avant d'écrire un fichier de tâche (voir TaskManifest.open)
+
+        Une erreur d'ouverture empêche l'écriture, au lieu de laisser un fichier
+        écrit que le manifeste et le dépôt n'ont jamais enregistré.
+        """
+        with self.lock:
+            self.manifest.open()
+
+    def _remember(self, task_id, task=None):
+        """
+        Mémorise la signature du fichier et du journal d'une tâche écrits par cette instance
+
+        La signature et le résumé sont aussi ajoutés au manifeste.
+
+        Args:
+            task_id: ID de la tâche
+            task: La tâche (None si seul le journal a changé)
+
+        Returns:
+            int: Taille du journal en octets (0 s'il n'existe pas)
+        """
+        file_name = self.locate(task_id)
+        file_path, journal_path = self.paths(file_name)
+        try:
+            journal_stat = os.stat(journal_path)
+        except FileNotFoundError:
+            journal_stat = None
+
+        signature = file_signature(os.stat(file_path), journal_stat)
+        self.file_stats[file_name] = (signature, task_id)
+
+        summary = task or self.manifest.summary(file_name)
+        if summary is not None:
+            self.manifest.record(file_name, signature, summary)
+            self.manifest.flush()
+
+        return journal_stat.st_size if journal_stat else 0
+
+
+class SqliteStore(TaskStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            date_start TEXT,
+            date_end TEXT,
+            status TEXT NOT NULL DEFAULT '',
+            revision INTEGER NOT NULL DEFAULT 0,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS comments (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL DEFAULT '',
+            created_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_date_start ON tasks(date_start);
+        CREATE INDEX IF NOT EXISTS idx_tasks_date_end ON tasks(date_end);
+        CREATE INDEX IF NOT EXISTS idx_comments_task ON comments(task_id, position);
+    """
+
+    def __init__(self, db_path):
+        """
+        Stockage SQLite (mode WAL) : tâches et commentaires dans deux tables
+
+        Plusieurs instances peuvent partager la base : SQLite verrouille lui-même
+        les transactions, et une sauvegarde complète ne modifie la ligne que si
+        sa version n'a pas changé (voir commit_task).
+
+        Args:
+            db_path: Chemin du fichier de base de données
+        """
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        # Importé seulement avec ce support : le démarrage en json ne le charge pas
+        import sqlite3
+
+        # La connexion est partagée avec le thread de chargement, protégée par un verrou
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(self.SCHEMA)
+        # Base créée avant le contrôle des versions
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        if "version" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        # ID -> révision connue, pour ne relire que les tâches modifiées
+        self.revisions = {}
+
+    def iter_scan(self, batch_size=200):
+        """
+        Ne relit que les tâches dont la révision a changé (écritures d'une autre instance)
+
+        Args:
+            batch_size: Nombre maximal de tâches par lot
+
+        Yields:
+            tuple: (liste des tâches ajoutées ou modifiées, liste des IDs supprimés)
+        """
+        with self.lock:
+            current = dict(self.connection.execute("SELECT id, revision FROM tasks"))
+            removed_ids = [task_id for task_id in self.revisions if task_id not in current]
+            for task_id in removed_ids:
+                del self.revisions[task_id]
+
+        changed_ids = [
+            task_id for task_id, revision in current.items()
+            if self.revisions.get(task_id) != revision
+        ]
+
+        for start in range(0, len(changed_ids), batch_size):
+            with self.lock:
+                changed_tasks = self.read_tasks(changed_ids[start:start + batch_size])
+                for task in changed_tasks:
+                    self.revisions[task.id] = current[task.id]
+
+            yield changed_tasks, removed_ids
+            removed_ids = []
+
+        if removed_ids:
+            yield [], removed_ids
+
+    def read_task(self, task_id):
+        """
+        Lit une tâche et ses commentaires
+
+        Args:
+            task_id: ID de la tâche
+
+        Returns:
+            Task: La tâche ou None si elle n'existe pas
+        """
+        tasks = self.read_tasks([task_id])
+        return tasks[0] if tasks else None
+
+    def read_tasks(self, task_ids):
+        """
+        Lit plusieurs tâches et leurs commentaires en deux requêtes
+
+        Args:
+            task_ids: Liste des IDs des tâches (au plus quelques centaines)
+
+        Returns:
+            list: Liste des tâches trouvées
+        """
+        placeholders = ", ".join("?" for _ in task_ids)
+
+        with self.lock, metrics.span("parse"):
+            tasks = {
+                row[0]: Task(row[0], row[1], row[2], parse_date(row[3]), parse_date(row[4]), row[5], [], row[6])
+                for row in self.connection.execute(
+                    "SELECT id, title, description, date_start, date_end, status, version "
+                    f"FROM tasks WHERE id IN ({placeholders})",
+                    task_ids
+                )
+            }
+
+            for task_id, comment_id, text, created_at in self.connection.execute(
+                f"SELECT task_id, id, text, created_at FROM comments WHERE task_id IN ({placeholders}) "
+                "ORDER BY task_id, position",
+                task_ids
+            ):
+                tasks[task_id].comments.append(Comment(comment_id, text, created_at))
+
+        return list(tasks.values())
+
+    def write_tasks(self, tasks):
+        # Un lot entier dans une seule transaction
+        with self.lock:
+            with metrics.span("write"), self.connection:
+                for task in tasks:
+                    self._insert_task(task)
+
+            task_ids = [task.id for task in tasks]
+            placeholders = ", ".join("?" for _ in task_ids)
+            self.revisions.update(self.connection.execute(
+                f"SELECT id, revision FROM tasks WHERE id IN ({placeholders})", task_ids
+            ))
+
+    def _insert_task(self, task):
+        """
+        Insère ou remplace une tâche et ses commentaires (dans la transaction en cours)
+
+        Args:
+            task: La tâche (voir records.Task)
+        """
+        self.connection.execute(
+            """
+            INSERT INTO tasks (id, title, description, date_start, date_end, status, revision, version)
+            VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                description = excluded.description,
+                date_start = excluded.date_start,
+                date_end = excluded.date_end,
+                status = excluded.status,
+                revision = tasks.revision + 1,
+                version = excluded.version
+            """,
+            (
+                task.id,
+                task.title or "",
+                task.description or "",
+                format_date(task.start),
+                format_date(task.end),
+                task.status,
+                task.version
+            )
+        )
+        self.connection.execute("DELETE FROM comments WHERE task_id = ?", (task.id,))
+        self.connection.executemany(
+            "INSERT INTO comments (id, task_id, position, text, created_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (comment.id, task.id, position, comment.text or "", comment.created_at)
+                for position, comment in enumerate(task.comments or [])
+            ]
+        )
+
+    def commit_task(self, task, on_conflict=None, base=None):
+        saved, conflicts = self._commit([task], {task.id: base})
+        if conflicts:
+            if on_conflict is None:
+                raise conflicts[0]
+            on_conflict(conflicts[0])
+            return None
+        return saved[0]
+
+    def commit_tasks(self, tasks, on_conflict=None):
+        saved, conflicts = self._commit(tasks)
+        if on_conflict is None:
+            return saved, conflicts
+        for conflict in conflicts:
+            on_conflict(conflict)
+        return saved, []
+
+    def _commit(self, tasks, bases=None):
+        """
+        Enregistre un lot de tâches avec contrôle de version (la transaction est courte : pas de thread d'écriture)
+
+        Args:
+            tasks: Liste des tâches
+            bases: ID -> tâche avant la modification, optionnel
+
+        Returns:
+            tuple: (tâches enregistrées, liste des VersionConflict)
+        """
+        # Un lot entier dans une seule transaction : chaque ligne n'est modifiée que si sa version n'a pas changé
+        committed_ids = []
+        conflicting = []
+        with self.lock:
+            with metrics.span("write"), self.connection:
+                for task in tasks:
+                    if self._update_row(task):
+                        committed_ids.append(task.id)
+                    else:
+                        conflicting.append(task)
+
+            # Relire les tâches enregistrées (commentaires à jour) et celles en conflit, par lots
+            saved = []
+            for start in range(0, len(committed_ids), 500):
+                task_ids = committed_ids[start:start + 500]
+                saved.extend(self.read_tasks(task_ids))
+                placeholders = ", ".join("?" for _ in task_ids)
+                self.revisions.update(self.connection.execute(
+                    f"SELECT id, revision FROM tasks WHERE id IN ({placeholders})", task_ids
+                ))
+            current = {}
+            for start in range(0, len(conflicting), 500):
+                current.update(
+                    (task.id, task) for task in self.read_tasks([task.id for task in conflicting[start:start + 500]])
+                )
+
+        bases = bases or {}
+        return saved, [VersionConflict(task, current.get(task.id), bases.get(task.id)) for task in conflicting]
+
+    def _update_row(self, task):
+        """
+        Modifie les champs d'une tâche si sa version est celle de la base (dans la transaction en cours)
+
+        Une nouvelle tâche (version 0, absente de la base) est insérée avec ses commentaires.
+
+        Args:
+            task: La tâche (voir records.Task)
+
+        Returns:
+            bool: False si la tâche a été modifiée ou supprimée depuis sa lecture
+        """
+        cursor = self.connection.execute(
+            """
+            UPDATE tasks SET
+                title = ?, description = ?, date_start = ?, date_end = ?, status = ?,
+                revision = revision + 1, version = version + 1
+            WHERE id = ? AND version = ?
+            """,
+            (
+                task.title or "",
+                task.description or "",
+                format_date(task.start),
+                format_date(task.end),
+                task.status,
+                task.id,
+                task.version
+            )
+        )
+        if cursor.rowcount:
+            return True
+        if task.version or self.connection.execute("SELECT 1 FROM tasks WHERE id = ?", (task.id,)).fetchone():
+            return False
+
+        saved = task.copy()
+        saved.version = 1
+        self._insert_task(saved)
+        return True
+
+    def delete_task(self, task_id):
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+            self.revisions.pop(task_id, None)
+
+    def delete_tasks(self, task_ids):
+        # Un lot entier dans une seule transaction
+        task_ids = list(task_ids)
+        with self.lock:
+            with self.connection:
+                self.connection.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+            for task_id in task_ids:
+                self.revisions.pop(task_id, None)
+
+    def add_comment(self, task_id, comment):
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO comments (id, task_id, position, text, created_at)
+                VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM comments WHERE task_id = ?), ?, ?)
+                """,
+                (comment.id, task_id, task_id, comment.text or "", comment.created_at)
+            )
+            self._bump_revision(task_id)
+
+    def delete_comment(self, task_id, comment_id):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM comments WHERE id = ? AND task_id = ?", (comment_id, task_id))
+            self._bump_revision(task_id)
+
+    def update_comment(self, task_id, comment_id, text):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE comments SET text = ? WHERE id = ? AND task_id = ?", (text, comment_id, task_id)
+            )
+            self._bump_revision(task_id)
+
+    def _bump_revision(self, task_id):
+        """
+        Incrémente la révision d'une tâche pour que les autres instances la relisent
+
+        Args:
+            task_id: ID de la tâche
+        """
+        self.connection.execute("UPDATE tasks SET revision = revision + 1 WHERE id = ?", (task_id,))
+        row = self.connection.execute("SELECT revision FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row:
+            self.revisions[task_id] = row[0]
+
+    def watch_paths(self):
+        # Les écritures d'un autre processus passent par le journal WAL
+        return [path for path in (self.db_path, f"{self.db_path}-wal") if os.path.exists(path)]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def migrate_json_to_sqlite(data_folder, db_path):
+    """
+    Copie toutes les tâches data/*.json dans une base SQLite, en une seule transaction
+
+    Les fichiers JSON sont conservés : ils peuvent servir de sauvegarde.
+
+    Args:
+        data_folder: Dossier contenant les fichiers JSON des tâches
+        db_path: Chemin de la base SQLite à remplir
+
+    Returns:
+        int: Nombre de tâches migrées
+    """
+    json_store = JsonFolderStore(data_folder, use_manifest=False)
+    tasks, _ = json_store.scan()
+    json_store.close()
+
+    sqlite_store = SqliteStore(db_path)
+    try:
+        with sqlite_store.connection:
+            for task in tasks:
+                sqlite_store._insert_task(task)
+    finally:
+        sqlite_store.close()
+
+    print(f"Migration terminée : {len(tasks)} tâches copiées dans {db_path}")
+    return len(tasks)
+
+
+def reshard_folder(data_folder, sharded=True):
+    """
+    Change sur place la disposition d'un dossier de tâches JSON : sous-dossiers 00 à ff, ou à plat
+
+    Les fichiers et leurs journaux sont déplacés (os.replace, sans les relire
+    ni les réécrire) et le manifeste est mis à jour avec leurs nouveaux noms :
+    le démarrage suivant ne relit aucune tâche. La disposition est
+    enregistrée avant les déplacements : une migration interrompue peut être
+    relancée, et le dossier reste lisible entre-temps. Quand une tâche existe
+    dans les deux dispositions, le fichier le plus récent est gardé.
+
+    L'application et la ligne de commande ne doivent pas utiliser le dossier pendant la migration.
+
+    Args:
+        data_folder: Dossier contenant les fichiers JSON des tâches
+        sharded: True pour les sous-dossiers, False pour revenir à un dossier à plat
+
+    Returns:
+        int: Nombre de tâches déplacées
+    """
+    marker = os.path.join(data_folder, JsonFolderStore.SHARDED_MARKER)
+    if sharded:
+        atomic_write(marker, b"")
+    elif os.path.exists(marker):
+        os.remove(marker)
+
+    # Le magasin reste ouvert pendant les déplacements : ses fichiers supprimés sont oubliés de son manifeste
+    store = JsonFolderStore(data_folder)
+    manifest = store.manifest
+    entries = manifest.entries
+    task_entries, journal_entries = scan_task_files(data_folder, JsonFolderStore.JOURNAL_SUFFIX)
+
+    moved = 0
+    for file_name, entry in task_entries.items():
+        task_id = entry.name[:-len('.json')]
+        target_name = store.file_name(task_id)
+        if file_name == target_name:
+            continue
+
+        file_path, journal_path = store.paths(file_name)
+        target_path, target_journal_path = store.paths(target_name)
+
+        # Tâche présente dans les deux dispositions : garder le fichier le plus récent
+        if target_name in task_entries:
+            if entry.stat().st_mtime_ns <= task_entries[target_name].stat().st_mtime_ns:
+                store._remove_files(file_name)
+                continue
+            entries.pop(target_name, None)
+            if os.path.exists(target_journal_path):
+                os.remove(target_journal_path)
+
+        store._prepare_folder(target_name)
+        os.replace(file_path, target_path)
+        if file_name[:-len('.json')] in journal_entries:
+            os.replace(journal_path, target_journal_path)
+
+        # Un déplacement garde la date de modification et la taille : la signature reste valable
+        if file_name in entries:
+            entries[target_name] = entries.pop(file_name)
+        moved += 1
+
+    # Sous-dossiers vidés par un retour à plat
+    if not sharded:
+        for shard in SHARD_NAMES:
+            folder = os.path.join(data_folder, shard)
+            if os.path.isdir(folder) and not os.listdir(folder):
+                os.rmdir(folder)
+
+    manifest.compact()
+    store.close()
+
+    layout = "en sous-dossiers" if sharded else "à plat"
+    print(f"Migration terminée : {moved} tâches déplacées, dossier {data_folder} {layout}")
+    return moved
+
+
+def convert_folder(data_folder, file_format, batch_size=500):
+    """
+    Réécrit sur place les fichiers de tâches d'un dossier dans un autre format
+
+    Le format est enregistré dans data/.format avant la conversion : les
+    sauvegardes suivantes l'utilisent, et une conversion interrompue peut
+    être relancée (les fichiers déjà au bon format ne sont pas réécrits).
+    Les journaux de commentaires sont gardés tels quels. Le manifeste est mis
+    à jour avec les nouvelles signatures : le démarrage suivant ne relit
+    aucune tâche.
+
+    L'application et la ligne de commande ne doivent pas utiliser le dossier pendant la conversion.
+
+    Args:
+        data_folder: Dossier contenant les fichiers des tâches
+        file_format: Nouveau format (voir controller.file_format.FILE_FORMATS)
+        batch_size: Nombre de fichiers écrits avec une seule synchronisation du disque
+
+    Returns:
+        dict: Nombre de fichiers convertis, octets avant et après conversion
+
+    Raises:
+        ValueError: Si le format est inconnu
+    """
+    check_format(file_format)
+    atomic_write(os.path.join(data_folder, JsonFolderStore.FORMAT_MARKER), file_format)
+
+    manifest = TaskManifest(data_folder)
+    entries = manifest.load()
+    task_entries, journal_entries = scan_task_files(data_folder, JsonFolderStore.JOURNAL_SUFFIX)
+    report = {"converted": 0, "bytes_before": 0, "bytes_after": 0}
+
+    def write_batch(batch):
+        atomic_write_many([(os.path.join(data_folder, file_name), data) for file_name, data in batch])
+        for file_name, _ in batch:
+            # Signature du fichier réécrit, pour que le manifeste reste valable
+            if file_name in entries:
+                journal_entry = journal_entries.get(file_name[:-len('.json')])
+                signature = file_signature(
+                    os.stat(os.path.join(data_folder, file_name)), journal_entry.stat() if journal_entry else None
+                )
+                entries[file_name] = (signature, entries[file_name][1])
+
+    batch = []
+    for file_name, entry in task_entries.items():
+        with open(entry.path, 'rb') as f:
+            data = f.read()
+        report["bytes_before"] += len(data)
+        if detect_format(data) == file_format:
+            report["bytes_after"] += len(data)
+            continue
+
+        try:
+            converted = encode_dict(decode_dict(data), file_format)
+        except ValueError as e:
+            print(f"Fichier ignoré : {file_name} ({e})")
+            report["bytes_after"] += len(data)
+            continue
+
+        report["bytes_after"] += len(converted)
+        report["converted"] += 1
+        batch.append((file_name, converted))
+        if len(batch) >= batch_size:
+            write_batch(batch)
+            batch = []
+
+    if batch:
+        write_batch(batch)
+
+    manifest.entries = entries
+    manifest.compact()
+    manifest.close()
+
+    print(
+        f"Conversion terminée : {report['converted']} fichiers écrits en {file_format}, "
+        f"{report['bytes_before']} -> {report['bytes_after']} octets"
+    )
+    return report
+
+
+def open_store(data_folder, backend=None):
+    """
+    Ouvre le support de stockage configuré
+
+    Le support est choisi par l'argument backend ou la variable d'environnement
+    GESTIONNAIRE_STORAGE ("json" par défaut, ou "sqlite"). Au premier lancement en
+    SQLite, les fichiers JSON existants sont migrés automatiquement.
+
+    Args:
+        data_folder: Dossier des données
+        backend: "json" ou "sqlite"
+
+    Returns:
+        TaskStore: Le support de stockage
+    """
+    backend = backend or os.environ.get("GESTIONNAIRE_STORAGE", "json")
+
+    if backend == "sqlite":
+        db_path = os.path.join(data_folder, "tasks.db")
+        if not os.path.exists(db_path) and os.path.isdir(data_folder):
+            if scan_task_files(data_folder, JsonFolderStore.JOURNAL_SUFFIX)[0]:
+                migrate_json_to_sqlite(data_folder, db_path)
+        return SqliteStore(db_path)
+
+    if backend != "json":
+        raise ValueError(f"Support de stockage inconnu : {backend}")
+
+    return JsonFolderStore(data_folder)
@@ -1,13 +1,34 @@
 # -*- coding: utf-8 -*-
 
-import uuid
-import json
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+from PySide6.QtCore import QFileSystemWatcher, QObject, QThreadPool, QTimer, Signal
 from PySide6.QtWidgets import QMessageBox
 
+from views.task_list_model import TaskItemDelegate, TaskListModel, TaskRole
+from .instrumentation import metrics
+from .records import Task, format_date
+from .sort_index import row_key
+from .task_engine import DATE_VIEWS, SORT_FIELDS, TaskEngine, merge_tasks
+from .task_loader import TaskIndexer, TaskLoader
+
+
+class ConflictSignals(QObject):
+    # Sauvegarde refusée (VersionConflict)
+    save_conflict = Signal(object)
+    # Tâche d'une action groupée refusée (VersionConflict, fonction de nouvelle tentative ou None)
+    batch_conflict = Signal(object, object)
+
 
 class TaskController:
+    # Délai sans nouvel événement avant de recharger les fichiers modifiés du dossier data (ms)
+    RELOAD_DELAY_MS = 300
+    # Délai maximal de rechargement pendant une longue rafale d'événements (synchronisation)
+    RELOAD_MAX_DELAY = 2.0
+    # Nombre de tâches ajoutées à la liste à chaque défilement en bas (hors recherche)
+    PAGE_SIZE = 500
+    
     def __init__(self, ui, main_window):
         """
         Initialise le contrôleur de tâches
@@ -19,43 +40,141 @@ class TaskController:
         self.ui = ui
         self.main_window = main_window
         self.selected_task = None
+        self.current_filter = "Tous"
+        self.current_search = ""
+        self.search_results = set()
+        # Période de la vue "@period" : (première date, dernière date) au format AAAA-MM-JJ
+        self.period = None
+        # Tri de la liste (voir SORT_FIELDS), ignoré pendant une recherche (les plus pertinentes en premier)
+        self.current_sort = "end"
+        self.sort_descending = False
+        # Compteurs de la liste des filtres : statut ou vue par date -> nombre de tâches (voir update_status_counts)
+        self.filter_counts = {}
+        self.loader = None
+        # Mesure du chargement en arrière-plan, de start_loading à on_loading_finished
+        self.load_span = None
+        self.indexer = None
+        self.reload_pending = False
+        self.changes_since = None
         self.data_folder = "data"
+        # False jusqu'à la fin du démarrage (voir finish_startup)
+        self.started = False
+        self._comment_model = None
+        self.watcher = None
+        
+        # Logique des tâches sans Qt, partagée avec la ligne de commande (python -m controller),
+        # au-dessus du support de stockage configuré (dossier JSON par défaut,
+        # SQLite avec GESTIONNAIRE_STORAGE=sqlite) et d'un index de recherche plein texte
+        self.engine = TaskEngine(self.data_folder)
+        self.repository = self.engine.repository
+        
+        # Les sauvegardes sont écrites en arrière-plan : leurs conflits de version
+        # sont signalés depuis le thread d'écriture et traités dans celui de l'interface
+        self.conflict_signals = ConflictSignals()
+        self.conflict_signals.save_conflict.connect(self.on_save_conflict)
+        self.conflict_signals.batch_conflict.connect(self.on_batch_conflict)
         
-        # Créer le dossier data s'il n'existe pas
-        if not os.path.exists(self.data_folder):
-            os.makedirs(self.data_folder)
+        # Liste virtualisée des tâches : un modèle et un délégué au lieu d'un widget par tâche
+        self.task_model = TaskListModel(main_window)
+        if hasattr(self.ui, 'taskList'):
+            self.ui.taskList.setModel(self.task_model)
+            self.ui.taskList.setItemDelegate(TaskItemDelegate(self.ui.taskList))
+            self.ui.taskList.clicked.connect(self.on_task_clicked)
+            # Actions groupées sur les tâches sélectionnées (Ctrl/Maj + clic)
+            self.ui.taskList.customContextMenuRequested.connect(self.show_task_menu)
         
-        # Charger toutes les tâches au démarrage
-        self.load_all_tasks("Tous")
+        if hasattr(self.ui, 'searchInput'):
+            self.ui.searchInput.textChanged.connect(self.on_search_changed)
+        
+        # Ajouter les vues par date après les statuts de filterStatus
+        if hasattr(self.ui, 'filterStatus'):
+            self.ui.filterStatus.blockSignals(True)
+            for view, label in DATE_VIEWS.items():
+                self.ui.filterStatus.addItem(label, view)
+            self.ui.filterStatus.blockSignals(False)
+        
+        if hasattr(self.ui, 'sortField'):
+            self.ui.sortField.blockSignals(True)
+            for sort, label in SORT_FIELDS.items():
+                self.ui.sortField.addItem(label, sort)
+            self.ui.sortField.setCurrentIndex(self.ui.sortField.findData(self.current_sort))
+            self.ui.sortField.blockSignals(False)
+        
+        # Afficher immédiatement la première page des tâches connues du manifeste, sans ouvrir leurs fichiers
+        with metrics.span("load.cached"):
+            self.repository.load_cached()
+            self.show_visible_tasks()
+        
+        # Une rafale de changements du dossier data ne déclenche qu'un seul rechargement
+        self.reload_timer = QTimer(main_window)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.timeout.connect(self.reload_changed_tasks)
     
-    def create_new_task(self):
-        """
-        Crée une nouvelle tâche avec un UUID unique
+    def finish_startup(self):
         """
-        # Générer un UUID unique
-        task_id = str(uuid.uuid4())
+        Termine le démarrage une fois la première image de la fenêtre affichée
         
-        # Créer les dates (aujourd'hui et demain)
-        today = datetime.now()
-        tomorrow = today + timedelta(days=1)
+        Le volet des commentaires, les compteurs de la liste des filtres (les vues
+        par date construisent leur index), le chargement en arrière-plan et la
+        surveillance du dossier data ne sont pas nécessaires à la première image :
+        ils ne retardent plus l'affichage de la fenêtre. Sans effet après le premier appel.
+        """
+        if self.started:
+            return
+        self.started = True
         
-        # Créer l'objet tâche
-        task_data = {
-            "ID": task_id,
-            "Titre": "Nouvelle tâche",
-            "Description": "Nouvelle description",
-            "DateStart": today.strftime("%Y-%m-%d"),
-            "DateEnd": tomorrow.strftime("%Y-%m-%d"),
-            "Status": "À faire",
-            "Commentaires": []
-        }
+        with metrics.span("startup.deferred"):
+            self.build_comment_pane()
+            self.update_status_counts()
+            
+            # Vérifier le dossier en arrière-plan : seuls les fichiers modifiés sont relus, par lots
+            self.start_loading()
+            
+            # Surveiller le dossier data (synchronisation, scripts)
+            self.watcher = QFileSystemWatcher(self.main_window)
+            watch_paths = self.repository.store.watch_paths()
+            if watch_paths:
+                self.watcher.addPaths(watch_paths)
+            self.watcher.directoryChanged.connect(self.on_data_changed)
+            self.watcher.fileChanged.connect(self.on_data_changed)
+    
+    @property
+    def comment_model(self):
+        """
+        Modèle des commentaires de la tâche sélectionnée (voir build_comment_pane)
+        """
+        return self.build_comment_pane()
+    
+    def build_comment_pane(self):
+        """
+        Construit le volet des commentaires au premier appel : modèle et délégué de commentList
         
-        # Créer le fichier JSON dans le dossier data
-        file_path = os.path.join(self.data_folder, f"{task_id}.json")
+        Lignes dessinées par un délégué, les plus anciens commentaires chargés par
+        pages pendant le défilement. Le module n'est importé qu'à ce moment-là.
         
+        Returns:
+            CommentListModel: Le modèle des commentaires
+        """
+        if self._comment_model is None:
+            from views.comment_list_model import CommentItemDelegate, CommentListModel
+            
+            self._comment_model = CommentListModel(self.main_window)
+            self._comment_model.comment_edited.connect(self.update_comment)
+            if hasattr(self.ui, 'commentList'):
+                comment_delegate = CommentItemDelegate(self.ui.commentList)
+                comment_delegate.delete_requested.connect(self.delete_comment)
+                self.ui.commentList.setModel(self._comment_model)
+                self.ui.commentList.setItemDelegate(comment_delegate)
+        return self._comment_model
+    
+    def create_new_task(self):
+        """
+        Crée une nouvelle tâche avec un UUID unique
+        """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, ensure_ascii=False, indent=2)
+            # Créer la tâche (aujourd'hui et demain) et son fichier JSON dans le dossier data
+            task_data = self.engine.create_task(on_conflict=self.report_conflict)
+            task_id = task_data.id
             
             # Définir cette tâche comme selected_task
             self.selected_task = task_data
@@ -63,8 +182,8 @@ class TaskController:
             # Mettre à jour les champs UI
             self.update_ui_with_task(task_data)
             
-            # Rafraîchir l'affichage des tâches
-            self.load_all_tasks("Tous")
+            # Ajouter uniquement la nouvelle ligne à la liste
+            self.refresh_task_row(task_data, None)
             
             print(f"Tâche créée avec succès : {task_id}")
             
@@ -89,91 +208,231 @@ class TaskController:
             
             # Mettre à jour les données avec les valeurs actuelles de l'UI
             if hasattr(self.ui, 'selectedTitle'):
-                task_data["Titre"] = self.ui.selectedTitle.text()
+                task_data.title = self.ui.selectedTitle.text()
             
             if hasattr(self.ui, 'selectedDescription'):
-                task_data["Description"] = self.ui.selectedDescription.toPlainText()
+                task_data.description = self.ui.selectedDescription.toPlainText()
             
             if hasattr(self.ui, 'selectedStartDate'):
-                task_data["DateStart"] = self.ui.selectedStartDate.date().toString("yyyy-MM-dd")
+                task_data.start = self.ui.selectedStartDate.date().toPython()
             
             if hasattr(self.ui, 'selectedEndDate'):
-                task_data["DateEnd"] = self.ui.selectedEndDate.date().toString("yyyy-MM-dd")
+                task_data.end = self.ui.selectedEndDate.date().toPython()
             
             if hasattr(self.ui, 'selecteStatus'):
-                task_data["Status"] = self.ui.selecteStatus.currentText()
-            
-            # Sauvegarder le fichier JSON
-            file_path = os.path.join(self.data_folder, f"{task_data['ID']}.json")
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, ensure_ascii=False, indent=2)
-            
-            # Mettre à jour selected_task avec les nouvelles données
-            self.selected_task = task_data
+                task_data.status = self.ui.selecteStatus.currentText()
             
-            # Rafraîchir l'affichage des tâches
-            self.load_all_tasks("Tous")
+            with metrics.span("save"):
+                # Sauvegarder le fichier JSON en arrière-plan (un conflit est traité par on_save_conflict)
+                previous = self.repository.get_task(task_data.id)
+                saved = self.engine.save_task(task_data, on_conflict=self.report_conflict)
+                if saved is None:
+                    return
+                
+                # Mettre à jour selected_task avec la version enregistrée
+                self.selected_task = saved
+                
+                # Mettre à jour uniquement la ligne de cette tâche
+                self.refresh_task_row(saved, previous)
             
             # Afficher un message de confirmation
             self.show_success_message("Tâche sauvegardé avec succès")
             
-            print(f"Tâche sauvegardée : {task_data['ID']}")
+            print(f"Tâche sauvegardée : {saved.id} (version {saved.version})")
             
         except Exception as e:
             self.show_error_message("Erreur lors de la sauvegarde", f"Une erreur s'est produite : {str(e)}")
             print(f"Erreur lors de la sauvegarde : {e}")
     
+    def report_conflict(self, conflict):
+        """
+        Transmet le conflit d'une sauvegarde au thread de l'interface (appelée depuis le thread d'écriture)
+        
+        Args:
+            conflict: Le conflit (voir storage.VersionConflict)
+        """
+        self.conflict_signals.save_conflict.emit(conflict)
+    
+    def report_batch_conflict(self, conflict, retry):
+        """
+        Transmet le conflit d'une action groupée au thread de l'interface (appelée depuis le thread d'écriture)
+        
+        Args:
+            conflict: Le conflit (voir storage.VersionConflict)
+            retry: Fonction qui applique à nouveau l'action à la version enregistrée, ou None
+        """
+        self.conflict_signals.batch_conflict.emit(conflict, retry)
+    
+    def on_save_conflict(self, conflict):
+        """
+        Traite une sauvegarde refusée parce qu'une autre instance a enregistré la tâche entre-temps
+        
+        Les champs modifiés d'un seul côté sont fusionnés sans question ; les
+        champs modifiés des deux côtés sont choisis par l'utilisateur (voir ask_merge).
+        La tâche fusionnée est sauvegardée à nouveau.
+        
+        Args:
+            conflict: Le conflit (voir storage.VersionConflict)
+        """
+        print(f"Conflit de sauvegarde : {conflict}")
+        previous = self.summaries([conflict.task.id])
+        self.repository.apply_conflict(conflict)
+        task_data = conflict.task
+        theirs = conflict.current
+        
+        if theirs is None:
+            # Supprimée ailleurs : la recréer comme une nouvelle tâche, ou la retirer de la liste
+            if not self.ask_recreate(task_data):
+                self.apply_batch([], [task_data.id], previous)
+                return
+            task_data = task_data.copy()
+            task_data.version = 0
+        else:
+            task_data, fields = merge_tasks(conflict.base, task_data, theirs)
+            if fields:
+                task_data = self.ask_merge(task_data, theirs, fields)
+                if task_data is None:
+                    # Abandon : afficher la version enregistrée par l'autre instance
+                    self.apply_batch([theirs.id], (), previous)
+                    return
+        
+        try:
+            saved = self.engine.save_task(task_data, on_conflict=self.report_conflict)
+        except Exception as e:
+            self.show_error_message("Erreur lors de la sauvegarde", f"Une erreur s'est produite : {str(e)}")
+            print(f"Erreur lors de la sauvegarde : {e}")
+            return
+        if saved is None:
+            return
+        
+        # Afficher les champs modifiés par l'autre instance
+        self.apply_batch([saved.id], (), previous)
+        self.show_status_message("Tâche fusionnée avec les modifications d'une autre instance")
+        print(f"Tâche fusionnée : {saved.id} (version {saved.version})")
+    
+    def on_batch_conflict(self, conflict, retry):
+        """
+        Traite une tâche d'une action groupée refusée parce qu'une autre instance l'a enregistrée entre-temps
+        
+        L'action est appliquée à nouveau à la version enregistrée, si possible.
+        
+        Args:
+            conflict: Le conflit (voir storage.VersionConflict)
+            retry: Fonction qui applique à nouveau l'action, ou None si la tâche est supprimée ou les tentatives épuisées
+        """
+        print(f"Conflit de sauvegarde : {conflict}")
+        task_id = conflict.task.id
+        previous = self.summaries([task_id])
+        self.repository.apply_conflict(conflict)
+        if conflict.current is None:
+            self.apply_batch([], [task_id], previous)
+        elif retry is not None:
+            self.apply_batch(retry(), (), previous)
+        else:
+            self.apply_batch([task_id], (), previous)
+            self.show_status_message(f"Tâche « {conflict.current.title} » modifiée par une autre instance : action non appliquée")
+    
+    def ask_recreate(self, task_data):
+        """
+        Demande s'il faut recréer une tâche supprimée par une autre instance pendant sa modification
+        
+        Args:
+            task_data: La tâche modifiée
+        
+        Returns:
+            bool: True pour la recréer avec les modifications
+        """
+        answer = QMessageBox.question(
+            self.main_window, "Tâche supprimée",
+            f"La tâche « {task_data.title} » a été supprimée par une autre instance. La recréer avec vos modifications ?"
+        )
+        return answer == QMessageBox.StandardButton.Yes
+    
+    def ask_merge(self, merged, theirs, fields):
+        """
+        Demande quelle valeur garder pour chaque champ modifié à la fois ici et par une autre instance
+        
+        Args:
+            merged: Tâche fusionnée (valeurs locales pour les champs en conflit, voir merge_tasks)
+            theirs: Tâche enregistrée par l'autre instance
+            fields: Champs en conflit (attributs de records.Task)
+        
+        Returns:
+            Task: La tâche fusionnée selon les choix, ou None si annulé
+        """
+        from PySide6.QtWidgets import QComboBox, QDialog, QDialogButtonBox, QFormLayout, QLabel
+        
+        labels = {
+            "title": "Titre", "description": "Description", "start": "Date début",
+            "end": "Date fin", "status": "Statut",
+        }
+        
+        def describe(value):
+            text = format_date(value) if isinstance(value, date) else (value or "")
+            text = " ".join(text.split())
+            return text if len(text) <= 60 else text[:57] + "..."
+        
+        dialog = QDialog(self.main_window)
+        dialog.setWindowTitle("Tâche modifiée par une autre instance")
+        layout = QFormLayout(dialog)
+        layout.addRow(QLabel("Ces champs ont aussi été modifiés ailleurs : choisir la valeur à garder."))
+        
+        choices = {}
+        for field in fields:
+            choice = QComboBox()
+            choice.addItem(f"Ma version : {describe(getattr(merged, field))}")
+            choice.addItem(f"Autre instance : {describe(getattr(theirs, field))}")
+            layout.addRow(labels.get(field, field), choice)
+            choices[field] = choice
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return None
+        
+        merged = merged.copy()
+        for field, choice in choices.items():
+            if choice.currentIndex() == 1:
+                setattr(merged, field, getattr(theirs, field))
+        return merged
+    
     def update_ui_with_task(self, task_data):
         """
         Met à jour l'interface utilisateur avec les données de la tâche
         
         Args:
-            task_data: Dictionnaire contenant les données de la tâche
+            task_data: Tâche complète (voir records.Task)
         """
         # Mettre à jour le titre
         if hasattr(self.ui, 'selectedTitle'):
-            self.ui.selectedTitle.setText(task_data["Titre"])
+            self.ui.selectedTitle.setText(task_data.title)
         
         # Mettre à jour la description
         if hasattr(self.ui, 'selectedDescription'):
-            self.ui.selectedDescription.setPlainText(task_data["Description"])
+            self.ui.selectedDescription.setPlainText(task_data.description or "")
         
         # Mettre à jour les dates
         if hasattr(self.ui, 'selectedStartDate'):
-            start_date = datetime.strptime(task_data["DateStart"], "%Y-%m-%d").date()
-            self.ui.selectedStartDate.setDate(start_date)
+            self.ui.selectedStartDate.setDate(task_data.start or date.today())
         
         if hasattr(self.ui, 'selectedEndDate'):
-            end_date = datetime.strptime(task_data["DateEnd"], "%Y-%m-%d").date()
-            self.ui.selectedEndDate.setDate(end_date)
+            self.ui.selectedEndDate.setDate(task_data.end or date.today() + timedelta(days=1))
+        
+        # Mettre à jour le statut (celui d'une tâche fusionnée a pu changer)
+        if hasattr(self.ui, 'selecteStatus') and task_data.status:
+            self.ui.selecteStatus.setCurrentText(task_data.status)
         
         # Rafraîchir l'affichage des commentaires
         self.refresh_comments_display()
     
     def clear_comments_view(self):
         """
-        Vide la vue des commentaires (supprime seulement les frames de commentaires)
-        """
-        # Vider le layout des commentaires (verticalLayout)
-        if hasattr(self.ui, 'verticalLayout_2'):
-            layout = self.ui.verticalLayout_2.layout()
-            if layout:
-                # Supprimer seulement les frames de commentaires (QFrame)
-                widgets_to_remove = []
-                for i in range(layout.count()):
-                    item = layout.itemAt(i)
-                    if item and item.widget():
-                        widget = item.widget()
-                        # Supprimer seulement les QFrame (frames de commentaires)
-                        from PySide6.QtWidgets import QFrame
-                        if isinstance(widget, QFrame):
-                            widgets_to_remove.append(widget)
-                
-                # Supprimer les widgets identifiés
-                for widget in widgets_to_remove:
-                    layout.removeWidget(widget)
-                    widget.deleteLater()
+        Vide la vue des commentaires
+        """
+        self.comment_model.set_comments([])
     
     def create_comment(self):
         """
@@ -188,23 +447,17 @@ class TaskController:
             return
         
         try:
-            # Ajouter le commentaire à la tâche sélectionnée
-            comment_id = str(uuid.uuid4())
-            new_comment = {
-                "id": comment_id,
-                "text": "Nouveau commentaire",
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            self.selected_task["Commentaires"].append(new_comment)
+            # Ajouter le commentaire au journal de la tâche (sans réécrire les autres commentaires)
+            self.selected_task, new_comment = self.engine.add_comment(self.selected_task.id)
+            comment_id = new_comment.id
             
-            # Sauvegarder le fichier JSON
-            file_path = os.path.join(self.data_folder, f"{self.selected_task['ID']}.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.selected_task, f, ensure_ascii=False, indent=2)
-            
-            # Rafraîchir l'affichage des commentaires
-            self.refresh_comments_display()
+            # Insérer seulement la ligne du nouveau commentaire, en haut de la liste, et la modifier
+            row = self.comment_model.add_comment(new_comment)
+            if hasattr(self.ui, 'commentList'):
+                index = self.comment_model.index(row, 0)
+                self.ui.commentList.scrollToTop()
+                self.ui.commentList.setCurrentIndex(index)
+                self.ui.commentList.edit(index)
             
             print(f"Commentaire créé avec succès : {comment_id}")
             
@@ -215,58 +468,31 @@ class TaskController:
     def refresh_comments_display(self):
         """
         Rafraîchit l'affichage des commentaires
-        """
-        # Vider d'abord l'affichage actuel
-        self.clear_comments_view()
         
-        # Récupérer le layout des commentaires
-        if not hasattr(self.ui, 'verticalLayout_2'):
-            return
-        
-        layout = self.ui.verticalLayout_2.layout()
-        if not layout:
-            return
-        
-        # Afficher chaque commentaire
-        for comment in self.selected_task.get("Commentaires", []):
-            self.create_comment_widget(layout, comment)
+        Seule la première page de commentaires est dessinée ; les suivantes le sont au défilement.
+        """
+        with metrics.span("comments.refresh"):
+            self.comment_model.set_comments(self.selected_task.comments or [])
     
-    def create_comment_widget(self, layout, comment):
+    def update_comment(self, comment_id, text):
         """
-        Crée un widget pour afficher un commentaire
+        Enregistre le texte d'un commentaire modifié dans la liste
         
         Args:
-            layout: Le layout où ajouter le widget
-            comment: Dictionnaire contenant les données du commentaire
+            comment_id: ID du commentaire
+            text: Nouveau texte
         """
-        from PySide6.QtWidgets import QFrame, QHBoxLayout, QPlainTextEdit, QPushButton, QVBoxLayout
-        
-        # Créer une frame pour le commentaire
-        comment_frame = QFrame()
-        comment_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        comment_frame.setMaximumHeight(100)
-        
-        # Layout horizontal pour la frame
-        frame_layout = QHBoxLayout(comment_frame)
-        
-        # Zone de texte pour le commentaire
-        comment_text = QPlainTextEdit()
-        comment_text.setPlainText(comment["text"])
-        comment_text.setMaximumHeight(80)
-        comment_text.setMaximumWidth(400)
-        
-        # Bouton de suppression
-        delete_button = QPushButton("🗑️")
-        delete_button.setMaximumWidth(40)
-        delete_button.setMaximumHeight(40)
-        delete_button.clicked.connect(lambda: self.delete_comment(comment["id"]))
-        
-        # Ajouter les éléments au layout
-        frame_layout.addWidget(comment_text)
-        frame_layout.addWidget(delete_button)
+        if not self.selected_task:
+            return
         
-        # Ajouter la frame au layout principal
-        layout.addWidget(comment_frame)
+        try:
+            # Enregistré dans le journal de la tâche, sans réécrire les autres commentaires
+            self.selected_task = self.engine.update_comment(self.selected_task.id, comment_id, text)
+            print(f"Commentaire modifié : {comment_id}")
+            
+        except Exception as e:
+            self.show_error_message("Erreur lors de la modification du commentaire", f"Une erreur s'est produite : {str(e)}")
+            print(f"Erreur lors de la modification du commentaire : {e}")
     
     def delete_comment(self, comment_id):
         """
@@ -276,19 +502,11 @@ class TaskController:
             comment_id: ID du commentaire à supprimer
         """
         try:
-            # Supprimer le commentaire de la tâche sélectionnée
-            self.selected_task["Commentaires"] = [
-                comment for comment in self.selected_task["Commentaires"] 
-                if comment["id"] != comment_id
-            ]
+            # Supprimer le commentaire de la tâche sélectionnée (enregistré dans le journal de la tâche)
+            self.selected_task = self.engine.delete_comment(self.selected_task.id, comment_id)
             
-            # Sauvegarder le fichier JSON
-            file_path = os.path.join(self.data_folder, f"{self.selected_task['ID']}.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.selected_task, f, ensure_ascii=False, indent=2)
-            
-            # Rafraîchir l'affichage
-            self.refresh_comments_display()
+            # Retirer seulement la ligne du commentaire
+            self.comment_model.remove_comment(comment_id)
             
             print(f"Commentaire supprimé : {comment_id}")
             
@@ -309,10 +527,11 @@ class TaskController:
             return
         
         try:
+            task_id = self.selected_task.id
+            previous = self.repository.get_task(task_id)
+            
             # Supprimer le fichier JSON
-            file_path = os.path.join(self.data_folder, f"{self.selected_task['ID']}.json")
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            self.engine.delete_task(task_id)
             
             # Réinitialiser les champs UI
             self.reset_ui_fields()
@@ -320,8 +539,9 @@ class TaskController:
             # Vider la tâche sélectionnée
             self.selected_task = None
             
-            # Rafraîchir l'affichage des tâches
-            self.load_all_tasks("Tous")
+            # Retirer uniquement la ligne de cette tâche
+            self.task_model.remove_task(task_id)
+            self.count_changes([(previous, None)])
             
             # Afficher un message de confirmation
             self.show_success_message("Tâche supprimée avec succès")
@@ -332,6 +552,183 @@ class TaskController:
             self.show_error_message("Erreur lors de la suppression de la tâche", f"Une erreur s'est produite : {str(e)}")
             print(f"Erreur lors de la suppression de la tâche : {e}")
     
+    def selected_task_ids(self):
+        """
+        Retourne les IDs des tâches sélectionnées dans taskList
+        
+        Returns:
+            list: IDs des tâches, dans l'ordre de la liste
+        """
+        if not hasattr(self.ui, 'taskList'):
+            return []
+        rows = sorted(index.row() for index in self.ui.taskList.selectionModel().selectedRows())
+        return [self.task_model.tasks[row].id for row in rows if row < len(self.task_model.tasks)]
+    
+    def show_task_menu(self, pos):
+        """
+        Affiche le menu des actions groupées sur les tâches sélectionnées
+        
+        Args:
+            pos: Position du clic droit dans taskList
+        """
+        from PySide6.QtWidgets import QMenu
+        
+        task_ids = self.selected_task_ids()
+        if not task_ids:
+            return
+        
+        menu = QMenu(self.ui.taskList)
+        status_menu = menu.addMenu(f"Changer le statut ({len(task_ids)})")
+        statuses = [self.ui.selecteStatus.itemText(i) for i in range(self.ui.selecteStatus.count())] \
+            if hasattr(self.ui, 'selecteStatus') else []
+        statuses += [status for status in self.repository.status_counts() if status not in statuses]
+        for status in statuses:
+            status_menu.addAction(status, lambda status=status: self.batch_set_status(status, task_ids))
+        menu.addAction("Décaler les dates...", lambda: self.batch_shift_dates(task_ids=task_ids))
+        menu.addSeparator()
+        menu.addAction(f"Supprimer ({len(task_ids)})", lambda: self.batch_delete(task_ids))
+        menu.exec(self.ui.taskList.viewport().mapToGlobal(pos))
+    
+    def batch_set_status(self, status, task_ids=None):
+        """
+        Change le statut des tâches sélectionnées en une seule écriture
+        
+        Args:
+            status: Nouveau statut
+            task_ids: IDs des tâches (la sélection de taskList par défaut)
+        """
+        task_ids = self.selected_task_ids() if task_ids is None else task_ids
+        try:
+            previous = self.summaries(task_ids)
+            updated = self.engine.set_status(task_ids, status, on_conflict=self.report_batch_conflict)
+            self.apply_batch(updated, (), previous)
+            self.show_status_message(
+                f"{len(updated)} tâches passées au statut {status}"
+                + (f", {len(task_ids) - len(updated)} inchangées" if len(updated) < len(task_ids) else "")
+            )
+            print(f"Statut {status} appliqué à {len(updated)} tâches")
+        except Exception as e:
+            self.show_error_message("Erreur lors du changement de statut", f"Une erreur s'est produite : {str(e)}")
+            print(f"Erreur lors du changement de statut : {e}")
+    
+    def batch_shift_dates(self, days=None, task_ids=None):
+        """
+        Décale les dates de début et de fin des tâches sélectionnées en une seule écriture
+        
+        Args:
+            days: Nombre de jours (demandé à l'utilisateur par défaut)
+            task_ids: IDs des tâches (la sélection de taskList par défaut)
+        """
+        task_ids = self.selected_task_ids() if task_ids is None else task_ids
+        if days is None:
+            from PySide6.QtWidgets import QInputDialog
+            
+            days, accepted = QInputDialog.getInt(
+                self.main_window, "Décaler les dates",
+                f"Nombre de jours ({len(task_ids)} tâches, négatif pour avancer) :", 1, -3650, 3650
+            )
+            if not accepted:
+                return
+        
+        try:
+            previous = self.summaries(task_ids)
+            updated = self.engine.shift_dates(task_ids, days, on_conflict=self.report_batch_conflict)
+            self.apply_batch(updated, (), previous)
+            self.show_status_message(f"{len(updated)} tâches décalées de {days:+d} jours")
+            print(f"Dates de {len(updated)} tâches décalées de {days:+d} jours")
+        except Exception as e:
+            self.show_error_message("Erreur lors du décalage des dates", f"Une erreur s'est produite : {str(e)}")
+            print(f"Erreur lors du décalage des dates : {e}")
+    
+    def batch_delete(self, task_ids=None, confirm=True):
+        """
+        Supprime les tâches sélectionnées en une seule écriture
+        
+        Args:
+            task_ids: IDs des tâches (la sélection de taskList par défaut)
+            confirm: False pour ne pas demander de confirmation
+        """
+        task_ids = self.selected_task_ids() if task_ids is None else task_ids
+        if not task_ids:
+            return
+        
+        if confirm:
+            answer = QMessageBox.question(
+                self.main_window, "Supprimer les tâches",
+                f"Supprimer {len(task_ids)} tâches et leurs commentaires ?"
+            )
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+        
+        try:
+            previous = self.summaries(task_ids)
+            removed = self.engine.delete_tasks(task_ids)
+            self.apply_batch([], removed, previous)
+            self.show_status_message(f"{len(removed)} tâches supprimées")
+            print(f"{len(removed)} tâches supprimées")
+        except Exception as e:
+            self.show_error_message("Erreur lors de la suppression des tâches", f"Une erreur s'est produite : {str(e)}")
+            print(f"Erreur lors de la suppression des tâches : {e}")
+    
+    def apply_batch(self, updated_ids, removed_ids=(), previous=None):
+        """
+        Met à jour la liste une seule fois après une action groupée
+        
+        Les tâches qui ne correspondent plus au filtre actif sont retirées avec les tâches supprimées.
+        
+        Args:
+            updated_ids: IDs des tâches modifiées
+            removed_ids: IDs des tâches supprimées
+            previous: Résumés des tâches avant l'action (voir summaries), None pour tout recompter
+        """
+        removed_ids = set(removed_ids)
+        self.search_results -= removed_ids
+        
+        visible = []
+        hidden = set()
+        for task_id in updated_ids:
+            task_data = self.repository.get_task(task_id)
+            if task_data is None:
+                continue
+            if self.matches_filter(task_data):
+                visible.append(task_data)
+            else:
+                hidden.add(task_id)
+        
+        with metrics.span("list.batch"):
+            self.task_model.remove_tasks(removed_ids | hidden)
+            self.task_model.upsert_tasks(visible)
+        
+        if previous is None:
+            self.update_status_counts()
+        else:
+            self.count_changes([
+                (previous.get(task_id), self.repository.get_task(task_id))
+                for task_id in dict.fromkeys([*updated_ids, *removed_ids])
+            ])
+        
+        # La tâche ouverte a pu être modifiée ou supprimée
+        if self.selected_task is None:
+            return
+        if self.selected_task.id in removed_ids:
+            self.selected_task = None
+            self.reset_ui_fields()
+        elif self.selected_task.id in updated_ids:
+            self.selected_task = self.engine.get_task(self.selected_task.id)
+            self.update_ui_with_task(self.selected_task)
+    
+    def summaries(self, task_ids):
+        """
+        Retourne les résumés des tâches avant une modification, pour en compter les changements (voir count_changes)
+        
+        Args:
+            task_ids: IDs des tâches
+        
+        Returns:
+            dict: ID -> résumé de la tâche (None si elle n'existe pas)
+        """
+        return {task_id: self.repository.get_task(task_id) for task_id in task_ids}
+    
     def reset_ui_fields(self):
         """
         Remet à zéro tous les champs de l'interface utilisateur
@@ -363,140 +760,526 @@ class TaskController:
     
     def load_all_tasks(self, status="Tous"):
         """
-        Charge tous les fichiers JSON du dossier data et les affiche dans verticalLayout_1
+        Affiche les tâches du dépôt dans la liste taskList
+        
+        Seuls les fichiers JSON modifiés depuis le dernier chargement sont relus.
         
         Args:
             status: Statut pour filtrer les tâches ("Tous" pour afficher toutes les tâches)
         """
         try:
-            # Vider d'abord l'affichage actuel
-            self.clear_tasks_display()
-            
-            # Récupérer le layout des tâches
-            if not hasattr(self.ui, 'verticalLayout_1'):
-                return
-            
-            layout = self.ui.verticalLayout_1.layout()
-            if not layout:
-                return
-            
-            # Charger tous les fichiers JSON du dossier data
-            if not os.path.exists(self.data_folder):
-                return
-            
-            json_files = [f for f in os.listdir(self.data_folder) if f.endswith('.json')]
+            # Relire uniquement les fichiers JSON modifiés du dossier data
+            self.repository.refresh()
             
-            tasks_displayed = 0
-            
-            for json_file in json_files:
-                file_path = os.path.join(self.data_folder, json_file)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        task_data = json.load(f)
-                    
-                    # Filtrer selon le statut
-                    if status == "Tous" or task_data.get("Status", "") == status:
-                        # Créer un widget pour afficher la tâche
-                        self.create_task_widget(layout, task_data)
-                        tasks_displayed += 1
-                    
-                except Exception as e:
-                    print(f"Erreur lors du chargement de {json_file}: {e}")
-            
-            print(f"Chargement terminé : {tasks_displayed} tâches affichées (filtre: {status})")
+            self.display_tasks(status)
             
         except Exception as e:
             print(f"Erreur lors du chargement des tâches : {e}")
     
-    def clear_tasks_display(self):
+    def display_tasks(self, status="Tous"):
+        """
+        Affiche les tâches d'un statut à partir de l'index du dépôt, sans relire le disque
+        
+        Args:
+            status: Statut pour filtrer les tâches ("Tous" pour afficher toutes les tâches)
+        """
+        self.current_filter = status
+        
+        # Le modèle ne fait que référencer les tâches : seules les lignes visibles sont dessinées
+        with metrics.span("list.build"):
+            self.show_visible_tasks()
+        self.update_status_counts()
+        
+        print(f"Chargement terminé : {self.visible_count()} tâches (filtre: {status})")
+    
+    def show_visible_tasks(self):
+        """
+        Affiche les tâches du filtre, de la recherche et du tri actifs
+        
+        Hors recherche, seule la première page de la liste triée est construite ;
+        les suivantes le sont au défilement (voir next_page).
+        """
+        if self.current_search:
+            self.task_model.set_tasks(self.visible_tasks())
+            return
+        
+        tasks, cursor = self.engine.task_page(
+            self.current_filter, self.period, self.current_sort, self.sort_descending, limit=self.PAGE_SIZE
+        )
+        # Les tâches ajoutées ou modifiées ensuite prennent leur place dans le tri (voir TaskListModel.upsert_task)
+        self.task_model.set_tasks(
+            tasks, self.next_page(cursor), row_key(self.current_sort, self.sort_descending)
+        )
+    
+    def next_page(self, cursor):
+        """
+        Retourne la fonction qui construit la page suivante de la liste affichée
+        
+        Le filtre et le tri sont ceux de la première page : un changement de filtre ou de tri
+        remplace toute la liste.
+        
+        Args:
+            cursor: Curseur de la page précédente (voir TaskEngine.task_page)
+        
+        Returns:
+            function: Fonction retournant (tâches, fonction de la page d'après), ou None à la fin de la liste
+        """
+        if cursor is None:
+            return None
+        
+        view, period, sort, descending = self.current_filter, self.period, self.current_sort, self.sort_descending
+        
+        def more():
+            with metrics.span("list.page"):
+                tasks, next_cursor = self.engine.task_page(view, period, sort, descending, cursor, self.PAGE_SIZE)
+            return tasks, self.next_page(next_cursor)
+        
+        return more
+    
+    def visible_count(self):
+        """
+        Retourne le nombre de tâches du filtre et de la recherche actifs, pages non affichées comprises
+        
+        Returns:
+            int: Nombre de tâches
+        """
+        if self.current_search:
+            return self.task_model.rowCount()
+        return self.engine.count_tasks(self.current_filter, self.period)
+    
+    def visible_tasks(self):
+        """
+        Retourne toutes les tâches correspondant au filtre de statut et à la recherche actifs
+        
+        Returns:
+            list: Résumés des tâches, les plus pertinentes en premier pendant une recherche,
+                sinon dans l'ordre du tri actif
+        """
+        if self.current_search:
+            tasks = self.engine.search(self.current_search, self.current_filter, self.period)
+            self.search_results = {task_data.id for task_data in tasks}
+            return tasks
+        
+        return self.engine.sorted_tasks(self.current_filter, self.period, self.current_sort, self.sort_descending)
+    
+    def filtered_tasks(self):
+        """
+        Retourne les tâches correspondant au filtre actif : un statut ou une vue par date
+        
+        Returns:
+            list: Résumés des tâches
+        """
+        return self.engine.filtered_tasks(self.current_filter, self.period)
+    
+    def ask_period(self):
+        """
+        Demande la période de la vue "Actives sur une période"
+        
+        Returns:
+            tuple: (première date, dernière date) au format AAAA-MM-JJ, ou None si annulé
+        """
+        from PySide6.QtWidgets import QDateEdit, QDialog, QDialogButtonBox, QFormLayout
+        
+        dialog = QDialog(self.main_window)
+        dialog.setWindowTitle("Tâches actives sur une période")
+        layout = QFormLayout(dialog)
+        
+        first, last = self.period or (date.today().isoformat(), (date.today() + timedelta(days=7)).isoformat())
+        first_edit = QDateEdit(date.fromisoformat(first))
+        first_edit.setCalendarPopup(True)
+        last_edit = QDateEdit(date.fromisoformat(last))
+        last_edit.setCalendarPopup(True)
+        layout.addRow("Du", first_edit)
+        layout.addRow("Au", last_edit)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return None
+        
+        first = first_edit.date().toString("yyyy-MM-dd")
+        last = last_edit.date().toString("yyyy-MM-dd")
+        return (first, last) if first <= last else (last, first)
+    
+    def on_search_changed(self, text):
+        """
+        Filtre la liste selon le texte saisi dans searchInput
+        
+        Args:
+            text: Texte recherché dans les titres, descriptions et commentaires
+        """
+        self.current_search = text.strip()
+        with metrics.span("search"):
+            self.show_visible_tasks()
+    
+    def on_sort_changed(self, index):
+        """
+        Trie la liste selon le champ choisi dans sortField
+        
+        Args:
+            index: Index de l'entrée sélectionnée
+        """
+        self.current_sort = self.ui.sortField.itemData(index)
+        with metrics.span("sort"):
+            self.show_visible_tasks()
+    
+    def on_sort_order_toggled(self, descending):
+        """
+        Inverse l'ordre du tri (bouton sortDescending)
+        
+        Args:
+            descending: True pour l'ordre décroissant
+        """
+        self.sort_descending = descending
+        if hasattr(self.ui, 'sortDescending'):
+            self.ui.sortDescending.setText("↓" if descending else "↑")
+        with metrics.span("sort"):
+            self.show_visible_tasks()
+    
+    def update_status_counts(self):
         """
-        Vide l'affichage des tâches dans verticalLayout_1
+        Recompte les tâches de chaque entrée de la liste déroulante filterStatus (après un chargement)
+        
+        Les statuts personnalisés présents dans les tâches sont ajoutés à la liste, avant les vues par date.
+        Après une modification, count_changes met les compteurs à jour sans tout recompter.
         """
-        if not hasattr(self.ui, 'verticalLayout_1'):
+        if not hasattr(self.ui, 'filterStatus'):
             return
         
-        layout = self.ui.verticalLayout_1.layout()
-        if not layout:
+        self.add_filter_statuses(self.repository.status_counts())
+        
+        combo = self.ui.filterStatus
+        self.filter_counts = {}
+        for i in range(combo.count()):
+            status = combo.itemData(i)
+            if status == "@period" and not self.period:
+                continue
+            self.filter_counts[status] = self.engine.count_tasks(status, self.period)
+        
+        self.show_status_counts()
+    
+    def count_changes(self, changes):
+        """
+        Met à jour les compteurs de la liste des filtres d'après les tâches modifiées, sans tout recompter
+        
+        Args:
+            changes: Liste de (résumé avant la modification ou None pour une nouvelle tâche,
+                résumé après ou None pour une tâche supprimée)
+        """
+        if not hasattr(self.ui, 'filterStatus'):
+            return
+        if not self.filter_counts:
+            # Compteurs pas encore calculés (démarrage en cours)
+            self.update_status_counts()
             return
         
-        # Supprimer tous les widgets du layout
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        for previous, current in changes:
+            # Nouveau statut personnalisé : son entrée part de zéro, la tâche est comptée ci-dessous
+            if current is not None and current.status not in self.filter_counts:
+                self.add_filter_statuses([current.status])
+                self.filter_counts[current.status] = 0
+            
+            for view in self.filter_counts:
+                before = previous is not None and self.engine.matches_filter(previous, view, self.period)
+                after = current is not None and self.engine.matches_filter(current, view, self.period)
+                self.filter_counts[view] += after - before
+        
+        self.show_status_counts()
     
-    def create_task_widget(self, layout, task_data):
+    def add_filter_statuses(self, statuses):
         """
-        Crée un widget pour afficher une tâche
+        Ajoute à filterStatus les statuts qui n'y sont pas encore, avant les vues par date
+        
+        Le statut brut est gardé dans les données de chaque entrée, le texte affiché contient le compteur.
         
         Args:
-            layout: Le layout où ajouter le widget
-            task_data: Dictionnaire contenant les données de la tâche
+            statuses: Statuts présents dans les tâches
         """
-        from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
+        combo = self.ui.filterStatus
+        combo.blockSignals(True)
         
-        # Créer une frame pour la tâche
-        task_frame = QFrame()
-        task_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        task_frame.setMaximumHeight(80)
-        task_frame.setMinimumHeight(60)
+        known_statuses = set()
+        first_view = combo.count()
+        for i in range(combo.count()):
+            status = combo.itemData(i)
+            if status is None:
+                status = combo.itemText(i)
+                combo.setItemData(i, status)
+            if status in DATE_VIEWS:
+                first_view = min(first_view, i)
+            known_statuses.add(status)
         
-        # Rendre la frame cliquable
-        task_frame.mousePressEvent = lambda event: self.select_task(task_data)
+        for status in statuses:
+            if status not in known_statuses:
+                combo.insertItem(first_view, status, status)
+                first_view += 1
         
-        # Layout horizontal pour la frame
-        frame_layout = QHBoxLayout(task_frame)
+        combo.blockSignals(False)
+    
+    def show_status_counts(self):
+        """
+        Affiche les compteurs de filter_counts dans les libellés de filterStatus
+        """
+        combo = self.ui.filterStatus
         
-        # Layout vertical pour les informations de la tâche
-        info_layout = QVBoxLayout()
+        # Ne pas relancer de filtrage pendant la mise à jour des libellés
+        combo.blockSignals(True)
         
-        # Titre de la tâche
-        title_label = QLabel(task_data.get("Titre", "Sans titre"))
-        title_label.setStyleSheet("font-weight: bold; font-size: 12px;")
+        for i in range(combo.count()):
+            status = combo.itemData(i)
+            count = self.filter_counts.get(status, 0)
+            if status == "@period":
+                if self.period:
+                    first, last = (date.fromisoformat(day).strftime("%d/%m") for day in self.period)
+                    label = f"{DATE_VIEWS[status]} : {first} - {last}"
+                    combo.setItemText(i, f"{label} ({count})")
+                else:
+                    combo.setItemText(i, f"{DATE_VIEWS[status]}...")
+                continue
+            combo.setItemText(i, f"{DATE_VIEWS.get(status, status)} ({count})")
         
-        # Date de début
-        start_date = task_data.get("DateStart", "N/A")
-        if start_date != "N/A":
-            try:
-                # Convertir de YYYY-MM-DD vers dd/mm/YYYY
-                from datetime import datetime
-                date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%d/%m/%Y")
-            except:
-                formatted_date = start_date
-        else:
-            formatted_date = "N/A"
+        combo.blockSignals(False)
+    
+    def matches_filter(self, task_data):
+        """
+        Indique si une tâche correspond au filtre de statut et à la recherche actifs
+        
+        Args:
+            task_data: Tâche ou résumé (voir records.Task)
+        
+        Returns:
+            bool: True si la tâche doit être affichée
+        """
+        if self.current_search and task_data.id not in self.search_results:
+            return False
         
-        date_label = QLabel(f"Début: {formatted_date}")
-        date_label.setStyleSheet("font-size: 10px; color: gray;")
+        return self.engine.matches_filter(task_data, self.current_filter, self.period)
+    
+    def start_loading(self):
+        """
+        Lance le chargement des tâches dans un thread du QThreadPool
         
-        # Statut
-        status = task_data.get("Status", "N/A")
-        status_label = QLabel(f"Statut: {status}")
-        status_label.setStyleSheet("font-size: 10px; color: blue;")
+        Un chargement déjà en cours est annulé ; le nouveau reprend là où il s'était arrêté.
+        """
+        self.cancel_loading()
+        self.repository.begin_load()
         
-        # Ajouter les labels au layout d'informations
-        info_layout.addWidget(title_label)
-        info_layout.addWidget(date_label)
-        info_layout.addWidget(status_label)
+        # Un chargement relancé garde le début de la mesure du chargement annulé
+        if self.load_span is None:
+            self.load_span = metrics.span("load").start()
         
-        # Ajouter le layout d'informations au layout horizontal
-        frame_layout.addLayout(info_layout)
+        loader = TaskLoader(self.repository.store, self.repository.search_index)
+        loader.setAutoDelete(False)
+        loader.signals.batch_loaded.connect(self.on_tasks_loaded)
+        loader.signals.finished.connect(lambda completed: self.on_loading_finished(loader, completed))
+        self.loader = loader
         
-        # Ajouter la frame au layout principal
-        layout.addWidget(task_frame)
+        QThreadPool.globalInstance().start(loader)
+    
+    def cancel_loading(self):
+        """
+        Annule le chargement en arrière-plan en cours
+        """
+        if self.loader:
+            self.loader.cancel()
+            self.loader = None
+    
+    def on_tasks_loaded(self, changed_tasks, removed_ids):
+        """
+        Ajoute à la liste un lot de tâches lu par le chargement en arrière-plan
+        
+        Args:
+            changed_tasks: Liste des tâches ajoutées ou modifiées
+            removed_ids: Liste des IDs des tâches supprimées
+        """
+        with metrics.span("load.batch"):
+            self.apply_loaded_batch(changed_tasks, removed_ids)
+    
+    def apply_loaded_batch(self, changed_tasks, removed_ids):
+        """
+        Applique un lot de tâches chargé au dépôt puis à la liste
+        
+        Args:
+            changed_tasks: Liste des tâches ajoutées ou modifiées
+            removed_ids: Liste des IDs des tâches supprimées
+        """
+        changed_tasks, removed_ids = self.repository.apply_changes(changed_tasks, removed_ids)
+        
+        # Pendant une recherche, les tâches modifiées peuvent entrer ou sortir des résultats
+        if self.current_search:
+            self.show_visible_tasks()
+            self.update_status_counts()
+            return
+        
+        for task_id in removed_ids:
+            self.task_model.remove_task(task_id)
+        
+        for task_data in changed_tasks:
+            if not self.matches_filter(task_data):
+                self.task_model.remove_task(task_data.id)
+        
+        self.task_model.upsert_tasks([task_data for task_data in changed_tasks if self.matches_filter(task_data)])
+        self.update_status_counts()
+    
+    def on_loading_finished(self, loader, completed):
+        """
+        Termine un chargement en arrière-plan
+        
+        Args:
+            loader: Le chargement qui vient de se terminer
+            completed: False si le chargement a été annulé
+        """
+        # Un chargement annulé puis relancé : seul le dernier compte
+        if loader is not self.loader:
+            return
+        
+        self.loader = None
+        self.repository.end_load()
+        
+        if self.load_span is not None and not self.reload_pending:
+            self.load_span.stop()
+            self.load_span = None
+        
+        if completed:
+            self.start_indexing()
+        
+        print(f"Chargement terminé : {self.visible_count()} tâches (filtre: {self.current_filter})")
+        
+        if self.reload_pending:
+            self.reload_pending = False
+            self.start_loading()
+    
+    def start_indexing(self):
+        """
+        Indexe pour la recherche, dans un thread du QThreadPool, les tâches absentes de l'index enregistré
+        """
+        task_ids = self.repository.unindexed_task_ids()
+        if not task_ids or self.indexer:
+            return
+        
+        indexer = TaskIndexer(self.repository.store, self.repository.search_index, task_ids)
+        indexer.setAutoDelete(False)
+        indexer.signals.finished.connect(lambda count: self.on_indexing_finished(indexer, count))
+        self.indexer = indexer
+        
+        QThreadPool.globalInstance().start(indexer)
+    
+    def on_indexing_finished(self, indexer, count):
+        """
+        Termine l'indexation en arrière-plan et met à jour les résultats d'une recherche en cours
+        
+        Args:
+            indexer: L'indexation qui vient de se terminer
+            count: Nombre de tâches indexées
+        """
+        if indexer is not self.indexer:
+            return
+        
+        self.indexer = None
+        if self.current_search:
+            self.show_visible_tasks()
+        
+        print(f"Index de recherche : {count} tâches indexées")
+    
+    def on_data_changed(self, path):
+        """
+        Programme le rechargement des tâches après une modification du dossier data
+        
+        Chaque événement repousse le rechargement de RELOAD_DELAY_MS, sans le retarder
+        de plus de RELOAD_MAX_DELAY depuis le premier événement de la rafale.
+        
+        Args:
+            path: Dossier ou fichier modifié
+        """
+        # Un fichier remplacé n'est plus surveillé : le surveiller à nouveau
+        if path not in self.watcher.files() and path not in self.watcher.directories() and os.path.exists(path):
+            self.watcher.addPath(path)
+        
+        now = time.monotonic()
+        if self.changes_since is None:
+            self.changes_since = now
+        
+        if now - self.changes_since < self.RELOAD_MAX_DELAY or not self.reload_timer.isActive():
+            self.reload_timer.start(self.RELOAD_DELAY_MS)
+    
+    def reload_changed_tasks(self):
+        """
+        Relit en arrière-plan les tâches ajoutées, modifiées ou supprimées depuis le dernier chargement
+        """
+        self.changes_since = None
+        
+        # Surveiller aussi les sous-dossiers créés depuis (disposition en sous-dossiers)
+        watched = set(self.watcher.directories()) | set(self.watcher.files())
+        new_paths = [path for path in self.repository.store.watch_paths() if path not in watched]
+        if new_paths:
+            self.watcher.addPaths(new_paths)
+        
+        # Un chargement est déjà en cours : recharger une fois qu'il sera terminé
+        if self.loader:
+            self.reload_pending = True
+            return
+        
+        self.start_loading()
+    
+    def refresh_task_row(self, task_data, previous):
+        """
+        Met à jour la ligne d'une tâche selon le filtre actif (statut ou vue par date)
+        
+        La tâche est ajoutée ou mise à jour si elle correspond au filtre, sinon elle est retirée.
+        
+        Args:
+            task_data: Tâche ou résumé (voir records.Task)
+            previous: Résumé de la tâche avant la modification (None pour une nouvelle tâche)
+        """
+        # La liste ne garde que le résumé de la tâche
+        task_data = self.repository.get_task(task_data.id) or task_data
+        
+        # Le texte de la tâche a pu changer : relancer la recherche en cours
+        if self.current_search:
+            self.search_results = {result.id for result in self.visible_tasks()}
+        
+        if self.matches_filter(task_data):
+            row = self.task_model.upsert_task(task_data)
+            
+            # Garder la tâche sélectionnée en surbrillance dans la liste (sauf si elle passe après la page affichée)
+            if row is not None and hasattr(self.ui, 'taskList'):
+                self.ui.taskList.setCurrentIndex(self.task_model.index(row, 0))
+        else:
+            self.task_model.remove_task(task_data.id)
+        
+        self.count_changes([(previous, task_data)])
+    
+    def on_task_clicked(self, index):
+        """
+        Sélectionne la tâche correspondant à la ligne cliquée dans taskList
+        
+        Args:
+            index: Index Qt de la ligne cliquée
+        """
+        self.select_task(index.data(TaskRole))
     
     def select_task(self, task_data):
         """
         Sélectionne une tâche et met à jour l'interface
         
         Args:
-            task_data: Dictionnaire contenant les données de la tâche
+            task_data: Tâche ou son résumé (voir records.Task)
         """
         try:
-            # Vérifier que task_data est bien un dictionnaire
-            if not isinstance(task_data, dict):
-                print(f"Erreur : task_data n'est pas un dictionnaire : {type(task_data)}")
+            # Vérifier que task_data est bien une tâche
+            if not isinstance(task_data, Task):
+                print(f"Erreur : task_data n'est pas une tâche : {type(task_data)}")
+                return
+            
+            # La liste ne contient que des résumés : lire la tâche complète à la demande
+            task_id = task_data.id
+            with metrics.span("select.load"):
+                task_data = self.engine.get_task(task_id)
+            if task_data is None:
+                print(f"Tâche introuvable : {task_id}")
                 return
             
             # Définir cette tâche comme sélectionnée
@@ -505,7 +1288,7 @@ class TaskController:
             # Mettre à jour l'interface avec les données de la tâche
             self.update_ui_with_task(task_data)
             
-            print(f"Tâche sélectionnée : {task_data.get('ID', 'N/A')}")
+            print(f"Tâche sélectionnée : {task_data.id}")
             
         except Exception as e:
             print(f"Erreur lors de la sélection de la tâche : {e}")
@@ -519,7 +1302,35 @@ class TaskController:
         Args:
             status: Statut pour filtrer les tâches
         """
-        self.load_all_tasks(status)
+        with metrics.span("filter"):
+            self.display_tasks(status)
+        
+        # Changement de filtre pendant le chargement : annuler et reprendre avec le nouveau filtre
+        if self.loader:
+            self.start_loading()
+    
+    def on_filter_changed(self, index):
+        """
+        Filtre les tâches selon l'entrée choisie dans filterStatus
+        
+        Args:
+            index: Index de l'entrée sélectionnée
+        """
+        status = self.ui.filterStatus.itemData(index)
+        if status is None:
+            status = self.ui.filterStatus.itemText(index)
+        
+        if status == "@period":
+            period = self.ask_period()
+            if period is None:
+                # Période annulée : revenir au filtre précédent
+                self.ui.filterStatus.blockSignals(True)
+                self.ui.filterStatus.setCurrentIndex(max(self.ui.filterStatus.findData(self.current_filter), 0))
+                self.ui.filterStatus.blockSignals(False)
+                return
+            self.period = period
+        
+        self.filter_tasks_by_status(status)
     
     def show_info_message(self, title, message):
         """
@@ -551,6 +1362,17 @@ class TaskController:
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
     
+    def show_status_message(self, message, timeout=5000):
+        """
+        Affiche un message dans la barre d'état, sans bloquer l'interface
+        
+        Args:
+            message: Message à afficher
+            timeout: Durée d'affichage (ms)
+        """
+        if hasattr(self.ui, 'statusbar'):
+            self.ui.statusbar.showMessage(message, timeout)
+    
     def show_error_message(self, title, message):
         """
         Affiche une modale d'erreur
@@ -567,12 +1389,30 @@ class TaskController:
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
     
+    def shutdown(self):
+        """
+        Écrit sur le disque les sauvegardes encore en attente, à appeler avant de quitter l'application
+        """
+        try:
+            self.reload_timer.stop()
+            self.reload_pending = False
+            self.cancel_loading()
+            if self.indexer:
+                self.indexer.cancel()
+                self.indexer = None
+            QThreadPool.globalInstance().waitForDone()
+            
+            self.engine.close()
+            print("Sauvegardes en attente écrites sur le disque")
+        except Exception as e:
+            print(f"Erreur lors de l'écriture des sauvegardes en attente : {e}")
+    
     def get_selected_task(self):
         """
         Retourne la tâche actuellement sélectionnée
         
         Returns:
-            dict: Dictionnaire contenant les données de la tâche sélectionnée ou None
+            Task: La tâche sélectionnée ou None
         """
         return self.selected_task
     
@@ -581,6 +1421,6 @@ class TaskController:
         Définit la tâche sélectionnée
         
         Args:
-            task_data: Dictionnaire contenant les données de la tâche
+            task_data: Tâche complète (voir records.Task)
         """
         self.selected_task = task_data
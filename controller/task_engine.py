@@ -0,0 +1,683 @@
+# -*- coding: utf-8 -*-
+
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+from .date_index import CLOSED_STATUSES
+from .instrumentation import metrics
+from .records import Comment, Task, parse_date
+from .search_index import SearchIndex
+from .sort_index import SORT_FIELDS, sort_key
+from .storage import open_store
+from .task_repository import TaskRepository
+
+
+# Vues par date du filtre : clé -> libellé
+DATE_VIEWS = {
+    "@overdue": "En retard",
+    "@today": "Échéance aujourd'hui",
+    "@week": "Échéance cette semaine",
+    "@period": "Actives sur une période",
+}
+
+# Champs d'une tâche modifiables par update_task (attributs de records.Task)
+TASK_FIELDS = ("title", "description", "start", "end", "status")
+
+
+def check_date(value):
+    """
+    Vérifie qu'une date est au format AAAA-MM-JJ
+
+    Args:
+        value: Date à vérifier (texte AAAA-MM-JJ ou objet date)
+
+    Returns:
+        date: La date
+
+    Raises:
+        ValueError: Si la date est invalide
+    """
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Date invalide (AAAA-MM-JJ attendu) : {value}")
+    return parsed
+
+
+def merge_tasks(base, mine, theirs):
+    """
+    Fusionne une tâche modifiée localement avec la version enregistrée entre-temps par une autre instance
+
+    Fusion à trois versions, champ par champ (TASK_FIELDS) : un champ modifié
+    d'un seul côté prend la valeur modifiée ; un champ modifié des deux côtés
+    avec des valeurs différentes est en conflit et garde la valeur locale.
+    Les commentaires et la version sont ceux de la version enregistrée.
+    Sans la version d'origine, tout champ différent est en conflit.
+
+    Args:
+        base: La tâche telle qu'elle a été lue avant la modification locale, ou None si elle est inconnue
+        mine: La tâche modifiée localement
+        theirs: La tâche enregistrée par l'autre instance
+
+    Returns:
+        tuple: (tâche fusionnée, liste des champs en conflit)
+    """
+    merged = theirs.copy()
+    conflicts = []
+    for field in TASK_FIELDS:
+        # Une description vide et une description absente sont équivalentes
+        local = getattr(mine, field) or None
+        stored = getattr(theirs, field) or None
+        if local == stored or (base is not None and local == (getattr(base, field) or None)):
+            continue
+        if base is None or stored != (getattr(base, field) or None):
+            conflicts.append(field)
+        setattr(merged, field, getattr(mine, field))
+    return merged, conflicts
+
+
+class TaskEngine:
+    """
+    Logique des tâches indépendante de l'interface : création, modification,
+    suppression, commentaires, filtres et recherche
+
+    Le moteur n'importe pas Qt : il est utilisé par TaskController pour
+    l'interface graphique et par la ligne de commande (python -m controller)
+    pour les traitements en masse.
+    """
+
+    # Tentatives d'une modification en masse sur les tâches enregistrées entre-temps par une autre instance
+    COMMIT_ATTEMPTS = 3
+
+    def __init__(self, data_folder="data", backend=None):
+        """
+        Ouvre le support de stockage des tâches
+
+        Args:
+            data_folder: Dossier des données
+            backend: Support de stockage ("json" ou "sqlite", voir storage.open_store)
+        """
+        self.data_folder = data_folder
+        self.repository = TaskRepository(open_store(data_folder, backend), SearchIndex(data_folder))
+
+    def load(self):
+        """
+        Charge toutes les tâches de manière synchrone : résumés du manifeste, puis fichiers modifiés
+
+        Returns:
+            int: Nombre de tâches connues
+        """
+        with metrics.span("load"):
+            self.repository.load_cached()
+            self.repository.refresh()
+        return len(self.repository.tasks)
+
+    def close(self):
+        """
+        Écrit les sauvegardes en attente et ferme le support de stockage
+        """
+        self.repository.close()
+
+    # Tâches
+
+    @staticmethod
+    def new_task(title="Nouvelle tâche", description="Nouvelle description",
+                 start=None, end=None, status="À faire"):
+        """
+        Construit une nouvelle tâche avec un UUID unique, sans l'enregistrer
+
+        Args:
+            title: Titre de la tâche
+            description: Description de la tâche
+            start: Date de début (AAAA-MM-JJ, aujourd'hui par défaut)
+            end: Date de fin (AAAA-MM-JJ, demain par défaut)
+            status: Statut de la tâche
+
+        Returns:
+            Task: La nouvelle tâche
+        """
+        today = date.today()
+        return Task(
+            str(uuid.uuid4()),
+            title,
+            description,
+            check_date(start) if start else today,
+            check_date(end) if end else today + timedelta(days=1),
+            status,
+            []
+        )
+
+    def create_task(self, on_conflict=None, **fields):
+        """
+        Crée et enregistre une nouvelle tâche
+
+        Args:
+            on_conflict: Fonction appelée avec le VersionConflict, l'écriture pouvant alors se faire en arrière-plan (voir save_task)
+            **fields: Arguments de new_task (title, description, start, end, status)
+
+        Returns:
+            Task: La tâche créée
+        """
+        task = self.new_task(**fields)
+        return self.repository.save_task(task, on_conflict)
+
+    def get_task(self, task_id):
+        """
+        Retourne une tâche complète (description et commentaires compris)
+
+        Args:
+            task_id: ID de la tâche
+
+        Returns:
+            Task: La tâche ou None
+        """
+        return self.repository.load_task(task_id)
+
+    def save_task(self, task, on_conflict=None):
+        """
+        Enregistre une tâche complète, si elle n'a pas été modifiée par une autre instance depuis sa lecture
+
+        Avec on_conflict, l'écriture peut se faire en arrière-plan : un conflit
+        est signalé en appelant on_conflict avec le VersionConflict, depuis le
+        thread d'écriture, et l'appelant doit l'appliquer au dépôt
+        (voir TaskRepository.apply_conflict).
+
+        Args:
+            task: La tâche (voir records.Task)
+            on_conflict: Fonction appelée avec le VersionConflict au lieu de lever l'exception
+
+        Returns:
+            Task: La tâche enregistrée (nouvelle version), ou None si on_conflict a déjà été appelée
+
+        Raises:
+            ValueError: Si une date de la tâche n'est pas un objet date
+            VersionConflict: Sans on_conflict, si la tâche a été enregistrée ou supprimée ailleurs entre-temps (voir merge_tasks)
+        """
+        for value in (task.start, task.end):
+            if value is not None and not isinstance(value, date):
+                raise ValueError(f"Date invalide : {value!r}")
+        return self.repository.save_task(task, on_conflict)
+
+    def save_tasks(self, tasks):
+        """
+        Enregistre un lot de tâches complètes déjà validées (import en masse)
+
+        Args:
+            tasks: Liste des tâches
+        """
+        self.repository.save_tasks(tasks)
+
+    def update_task(self, task_id, **changes):
+        """
+        Modifie des champs d'une tâche et l'enregistre
+
+        Args:
+            task_id: ID de la tâche
+            **changes: Champs modifiés (title, description, start, end, status) ;
+                les dates peuvent être données au format AAAA-MM-JJ
+
+        Returns:
+            Task: La tâche à jour ou None si elle n'existe pas
+
+        Raises:
+            ValueError: Si un champ est inconnu ou une date invalide
+            VersionConflict: Si la tâche a été enregistrée ailleurs pendant la modification
+        """
+        unknown = set(changes) - set(TASK_FIELDS)
+        if unknown:
+            raise ValueError(f"Champs inconnus : {', '.join(sorted(unknown))}")
+
+        task = self.repository.load_task(task_id)
+        if task is None:
+            return None
+
+        task = task.copy()
+        for field, value in changes.items():
+            if field in ("start", "end") and value is not None:
+                value = check_date(value)
+            setattr(task, field, value)
+        return self.save_task(task)
+
+    def set_status(self, task_ids, status, on_conflict=None):
+        """
+        Change le statut de plusieurs tâches, enregistrées en une seule écriture
+
+        Les tâches ayant déjà ce statut ne sont pas réécrites.
+
+        Args:
+            task_ids: IDs des tâches
+            status: Nouveau statut
+            on_conflict: Fonction appelée pour chaque conflit de version (voir _update_tasks)
+
+        Returns:
+            list: IDs des tâches modifiées
+        """
+        def change(task):
+            if task.status == status:
+                return False
+            task.status = status
+            return True
+
+        return self._update_tasks(task_ids, change, on_conflict)
+
+    def shift_dates(self, task_ids, days, on_conflict=None):
+        """
+        Décale les dates de début et de fin de plusieurs tâches, enregistrées en une seule écriture
+
+        Args:
+            task_ids: IDs des tâches
+            days: Nombre de jours (négatif pour avancer les dates)
+            on_conflict: Fonction appelée pour chaque conflit de version (voir _update_tasks)
+
+        Returns:
+            list: IDs des tâches modifiées
+        """
+        if not days:
+            return []
+        delta = timedelta(days=days)
+
+        def change(task):
+            if task.start is None and task.end is None:
+                return False
+            if task.start is not None:
+                task.start += delta
+            if task.end is not None:
+                task.end += delta
+            return True
+
+        return self._update_tasks(task_ids, change, on_conflict)
+
+    def _update_tasks(self, task_ids, change, on_conflict=None, attempts=None):
+        """
+        Applique une modification à plusieurs tâches puis les enregistre en un seul lot
+
+        Une tâche enregistrée entre-temps par une autre instance est relue et la
+        modification appliquée à nouveau (au plus COMMIT_ATTEMPTS fois) ; une
+        tâche supprimée entre-temps est ignorée.
+
+        Avec on_conflict, le lot peut être écrit en arrière-plan : chaque conflit
+        est signalé, depuis le thread d'écriture, par on_conflict(conflict, retry).
+        Après avoir appliqué le conflit au dépôt (voir TaskRepository.apply_conflict),
+        l'appelant peut appeler retry() pour appliquer à nouveau la modification
+        à la version enregistrée ; retry est None si la tâche a été supprimée ou
+        si les tentatives sont épuisées.
+
+        Args:
+            task_ids: IDs des tâches (les doublons et les IDs inconnus sont ignorés)
+            change: Fonction qui modifie une copie de la tâche et retourne False si elle est inchangée
+            on_conflict: Fonction appelée pour chaque conflit de version, au lieu de relire la tâche
+            attempts: Tentatives restantes (COMMIT_ATTEMPTS par défaut)
+
+        Returns:
+            list: IDs des tâches modifiées (ou en cours d'écriture)
+        """
+        attempts = attempts or self.COMMIT_ATTEMPTS
+        tasks = []
+        for task_id in dict.fromkeys(task_ids):
+            if self.repository.get_task(task_id) is None:
+                continue
+            task = self.repository.load_task(task_id)
+            if task is None:
+                continue
+            task = task.copy()
+            if change(task):
+                tasks.append(task)
+
+        if on_conflict is not None:
+            if not tasks:
+                return []
+
+            def report(conflict):
+                retry = None
+                if conflict.current is not None and attempts > 1:
+                    task_id = conflict.task.id
+                    retry = lambda: self._update_tasks([task_id], change, on_conflict, attempts - 1)
+                on_conflict(conflict, retry)
+
+            with metrics.span("batch.update"):
+                saved, _ = self.repository.update_tasks(tasks, report)
+            return [task.id for task in saved]
+
+        updated_ids = []
+        with metrics.span("batch.update"):
+            for _ in range(attempts):
+                if not tasks:
+                    break
+                saved, conflicts = self.repository.update_tasks(tasks)
+                updated_ids.extend(task.id for task in saved)
+                tasks = []
+                for conflict in conflicts:
+                    if conflict.current is None:
+                        continue
+                    task = conflict.current.copy()
+                    if change(task):
+                        tasks.append(task)
+        return updated_ids
+
+    def delete_task(self, task_id):
+        """
+        Supprime une tâche et ses commentaires
+
+        Args:
+            task_id: ID de la tâche
+        """
+        self.repository.delete_task(task_id)
+
+    def delete_tasks(self, task_ids):
+        """
+        Supprime plusieurs tâches et leurs commentaires en une seule écriture
+
+        Args:
+            task_ids: IDs des tâches (les IDs inconnus sont ignorés)
+
+        Returns:
+            list: IDs des tâches supprimées
+        """
+        task_ids = [task_id for task_id in dict.fromkeys(task_ids) if self.repository.get_task(task_id) is not None]
+        if task_ids:
+            with metrics.span("batch.delete"):
+                self.repository.delete_tasks(task_ids)
+        return task_ids
+
+    def purge(self, status=None, ended_before=None, dry_run=False):
+        """
+        Supprime toutes les tâches d'un statut et/ou terminées avant une date
+
+        Args:
+            status: Statut des tâches à supprimer (None pour tous les statuts)
+            ended_before: Date (AAAA-MM-JJ) : seules les tâches dont DateEnd est antérieure sont supprimées
+            dry_run: True pour seulement retourner les tâches concernées
+
+        Returns:
+            list: IDs des tâches supprimées
+
+        Raises:
+            ValueError: Si aucun critère n'est donné ou si la date est invalide
+        """
+        if status is None and ended_before is None:
+            raise ValueError("Indiquer un statut ou une date limite")
+
+        tasks = self.repository.tasks_with_status(status or "Tous")
+        if ended_before is not None:
+            ended_before = check_date(ended_before)
+            tasks = [task for task in tasks if task.end is not None and task.end < ended_before]
+
+        task_ids = [task.id for task in tasks]
+        if not dry_run:
+            self.delete_tasks(task_ids)
+        return task_ids
+
+    # Commentaires
+
+    def add_comment(self, task_id, text="Nouveau commentaire"):
+        """
+        Ajoute un commentaire à une tâche
+
+        Args:
+            task_id: ID de la tâche
+            text: Texte du commentaire
+
+        Returns:
+            tuple: (tâche complète à jour, commentaire ajouté)
+
+        Raises:
+            KeyError: Si la tâche n'existe pas
+        """
+        if self.repository.get_task(task_id) is None:
+            raise KeyError(f"Tâche introuvable : {task_id}")
+
+        comment = Comment(str(uuid.uuid4()), text, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        return self.repository.add_comment(task_id, comment), comment
+
+    def delete_comment(self, task_id, comment_id):
+        """
+        Supprime un commentaire d'une tâche
+
+        Args:
+            task_id: ID de la tâche
+            comment_id: ID du commentaire
+
+        Returns:
+            Task: La tâche complète à jour
+
+        Raises:
+            KeyError: Si la tâche n'existe pas
+        """
+        if self.repository.get_task(task_id) is None:
+            raise KeyError(f"Tâche introuvable : {task_id}")
+        return self.repository.delete_comment(task_id, comment_id)
+
+    def update_comment(self, task_id, comment_id, text):
+        """
+        Modifie le texte d'un commentaire d'une tâche
+
+        Args:
+            task_id: ID de la tâche
+            comment_id: ID du commentaire
+            text: Nouveau texte
+
+        Returns:
+            Task: La tâche complète à jour
+
+        Raises:
+            KeyError: Si la tâche n'existe pas
+        """
+        if self.repository.get_task(task_id) is None:
+            raise KeyError(f"Tâche introuvable : {task_id}")
+        return self.repository.update_comment(task_id, comment_id, text)
+
+    # Filtres et recherche
+
+    @staticmethod
+    def due_bounds(view, today=None):
+        """
+        Retourne les dates limites d'échéance d'une vue par date
+
+        Args:
+            view: Clé de la vue ("@overdue", "@today" ou "@week")
+            today: Date de référence (aujourd'hui par défaut)
+
+        Returns:
+            tuple: (première date ou None, dernière date) au format AAAA-MM-JJ
+        """
+        today = today or date.today()
+        if view == "@overdue":
+            return None, (today - timedelta(days=1)).isoformat()
+        if view == "@today":
+            return today.isoformat(), today.isoformat()
+        # Jusqu'au dimanche de la semaine en cours
+        return today.isoformat(), (today + timedelta(days=6 - today.weekday())).isoformat()
+
+    def filtered_tasks(self, view="Tous", period=None):
+        """
+        Retourne les tâches d'un filtre : un statut ou une vue par date
+
+        Les index du dépôt (par statut, par date) évitent de parcourir toutes les tâches.
+
+        Args:
+            view: Statut, "Tous" ou clé d'une vue par date (voir DATE_VIEWS)
+            period: (première date, dernière date) de la vue "@period"
+
+        Returns:
+            list: Résumés des tâches
+        """
+        if view == "@period":
+            return self.repository.tasks_active_between(*period) if period else []
+
+        if view in DATE_VIEWS:
+            return self.repository.tasks_due_between(*self.due_bounds(view))
+
+        return self.repository.tasks_with_status(view)
+
+    def sorted_tasks(self, view="Tous", period=None, sort="end", descending=False):
+        """
+        Retourne les tâches d'un filtre triées par échéance, date de début, titre ou statut
+
+        Args:
+            view: Statut, "Tous" ou clé d'une vue par date
+            period: (première date, dernière date) de la vue "@period"
+            sort: Champ du tri (voir SORT_FIELDS)
+            descending: True pour l'ordre décroissant
+
+        Returns:
+            list: Résumés des tâches
+
+        Raises:
+            ValueError: Si le tri est inconnu
+        """
+        self.check_sort(sort)
+        return self.repository.sort_index.sort(self.filtered_tasks(view, period), sort, descending)
+
+    def task_page(self, view="Tous", period=None, sort="end", descending=False, after=None, limit=100):
+        """
+        Retourne une page des tâches triées d'un filtre, sans construire la liste complète
+
+        Les pages se suivent par curseur : la page suivante commence après la
+        dernière tâche retournée, même si des tâches ont été ajoutées ou
+        supprimées entre-temps. Un filtre qui retient beaucoup de tâches est
+        appliqué pendant le parcours de l'index trié ; un filtre plus sélectif est
+        appliqué d'abord (ses index suffisent), puis seul son résultat est trié.
+
+        Args:
+            view: Statut, "Tous" ou clé d'une vue par date
+            period: (première date, dernière date) de la vue "@period"
+            sort: Champ du tri (voir SORT_FIELDS)
+            descending: True pour l'ordre décroissant
+            after: Curseur retourné avec la page précédente (None pour la première page)
+            limit: Nombre maximal de tâches de la page
+
+        Returns:
+            tuple: (résumés des tâches, curseur de la page suivante ou None à la fin)
+
+        Raises:
+            ValueError: Si le tri est inconnu
+        """
+        self.check_sort(sort)
+        sort_index = self.repository.sort_index
+        tasks = self.repository.tasks
+
+        if view == "Tous":
+            task_ids, cursor = sort_index.page(sort, descending, after, limit)
+        elif self.count_tasks(view, period) * 8 >= len(tasks):
+            task_ids, cursor = sort_index.page(
+                sort, descending, after, limit,
+                accept=lambda task_id: self.matches_filter(tasks[task_id], view, period)
+            )
+        else:
+            keys = sorted(sort_key(sort, task) for task in self.filtered_tasks(view, period))
+            if descending:
+                keys = keys[:bisect_left(keys, after) if after is not None else len(keys)][::-1]
+            else:
+                keys = keys[bisect_right(keys, after) if after is not None else 0:]
+            task_ids = [task_id for _, task_id in keys[:limit]]
+            cursor = keys[limit - 1] if len(keys) > limit else None
+
+        return [tasks[task_id] for task_id in task_ids], cursor
+
+    @staticmethod
+    def check_sort(sort):
+        """
+        Vérifie qu'un champ de tri est connu
+
+        Raises:
+            ValueError: Si le tri est inconnu
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Tri inconnu : {sort} ({', '.join(SORT_FIELDS)})")
+
+    def count_tasks(self, view="Tous", period=None):
+        """
+        Compte les tâches d'un filtre, sans construire la liste quand un index suffit
+
+        Args:
+            view: Statut, "Tous" ou clé d'une vue par date
+            period: (première date, dernière date) de la vue "@period"
+
+        Returns:
+            int: Nombre de tâches
+        """
+        if view == "Tous":
+            return len(self.repository.tasks)
+        if view == "@period":
+            return len(self.filtered_tasks(view, period))
+        if view in DATE_VIEWS:
+            return self.repository.count_tasks_due_between(*self.due_bounds(view))
+        return len(self.repository.tasks_by_status.get(view, ()))
+
+    def matches_filter(self, task, view="Tous", period=None):
+        """
+        Indique si une tâche correspond à un filtre
+
+        Args:
+            task: La tâche ou son résumé (voir records.Task)
+            view: Statut, "Tous" ou clé d'une vue par date
+            period: (première date, dernière date) de la vue "@period"
+
+        Returns:
+            bool: True si la tâche correspond
+        """
+        if view == "@period":
+            if not period or task.start is None or task.end is None:
+                return False
+            first, last = period
+            return task.start <= parse_date(last) and task.end >= parse_date(first)
+
+        if view in DATE_VIEWS:
+            if task.status in CLOSED_STATUSES or task.end is None:
+                return False
+            first, last = self.due_bounds(view)
+            return (first is None or task.end >= parse_date(first)) and task.end <= parse_date(last)
+
+        return view == "Tous" or task.status == view
+
+    def search(self, query, view="Tous", period=None):
+        """
+        Cherche des tâches parmi celles d'un filtre
+
+        Args:
+            query: Texte recherché
+            view: Statut, "Tous" ou clé d'une vue par date
+            period: (première date, dernière date) de la vue "@period"
+
+        Returns:
+            list: Résumés des tâches trouvées, les plus pertinentes en premier
+        """
+        candidates = None if view == "Tous" else self.filtered_tasks(view, period)
+        return self.repository.search(query, candidates)
+
+    def index_missing(self):
+        """
+        Charge l'index de recherche et y ajoute les tâches manquantes, de manière synchrone
+
+        L'interface fait ce travail en arrière-plan (voir task_loader.TaskIndexer).
+
+        Returns:
+            int: Nombre de tâches indexées
+        """
+        search_index = self.repository.search_index
+        search_index.load()
+        count = 0
+        for task_id in self.repository.unindexed_task_ids():
+            task = self.repository.store.read_task(task_id)
+            if task is not None:
+                search_index.index_task(task, replace=False)
+                count += 1
+        return count
+
+    def iter_tasks(self, view="Tous", period=None):
+        """
+        Parcourt les tâches complètes d'un filtre, lues une à une sur le support de stockage
+
+        Les tâches ne sont pas gardées en cache : la mémoire reste constante quel que soit leur nombre.
+
+        Args:
+            view: Statut, "Tous" ou clé d'une vue par date
+            period: (première date, dernière date) de la vue "@period"
+
+        Yields:
+            Task: Tâche complète
+        """
+        for summary in self.filtered_tasks(view, period):
+            task = self.repository.store.read_task(summary.id)
+            if task is not None:
+                yield task
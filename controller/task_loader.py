@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+
+class TaskLoaderSignals(QObject):
+    # Lot de tâches lues (liste des tâches ajoutées ou modifiées, liste des IDs supprimés)
+    batch_loaded = Signal(list, list)
+    # Fin du chargement (True si terminé, False si annulé)
+    finished = Signal(bool)
+
+
+class TaskLoader(QRunnable):
+    BATCH_SIZE = 200
+
+    def __init__(self, store, search_index=None):
+        """
+        Charge les tâches du support de stockage dans un thread du QThreadPool
+
+        Les tâches sont envoyées au thread de l'interface par lots, via les signaux
+        de TaskLoaderSignals, pour que la liste se remplisse progressivement.
+        L'index de recherche enregistré est chargé avant les tâches.
+
+        Args:
+            store: Support de stockage des tâches (voir controller.storage)
+            search_index: Index de recherche à charger (voir controller.search_index)
+        """
+        super().__init__()
+        self.store = store
+        self.search_index = search_index
+        self.signals = TaskLoaderSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Demande l'arrêt du chargement après le lot en cours
+        """
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if self.search_index is not None:
+                self.search_index.load()
+
+            for changed_tasks, removed_ids in self.store.iter_scan(self.BATCH_SIZE):
+                if changed_tasks or removed_ids:
+                    self.signals.batch_loaded.emit(changed_tasks, removed_ids)
+                if self.cancelled:
+                    break
+        except Exception as e:
+            print(f"Erreur lors du chargement des tâches : {e}")
+
+        self.signals.finished.emit(not self.cancelled)
+
+
+class TaskIndexerSignals(QObject):
+    # Fin de l'indexation (nombre de tâches indexées)
+    finished = Signal(int)
+
+
+class TaskIndexer(QRunnable):
+    def __init__(self, store, search_index, task_ids):
+        """
+        Ajoute à l'index de recherche, dans un thread du QThreadPool, les tâches qui n'y sont pas encore
+
+        Une tâche indexée entre-temps par le thread de l'interface (sauvegarde,
+        commentaire) n'est pas remplacée par la version lue ici.
+
+        Args:
+            store: Support de stockage des tâches (voir controller.storage)
+            search_index: Index de recherche à compléter
+            task_ids: IDs des tâches à indexer
+        """
+        super().__init__()
+        self.store = store
+        self.search_index = search_index
+        self.task_ids = task_ids
+        self.signals = TaskIndexerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Demande l'arrêt de l'indexation
+        """
+        self.cancelled = True
+
+    def run(self):
+        indexed = 0
+        try:
+            for task_id in self.task_ids:
+                if self.cancelled:
+                    break
+                task = self.store.read_task(task_id)
+                if task is not None:
+                    self.search_index.index_task(task, replace=False)
+                    indexed += 1
+        except Exception as e:
+            print(f"Erreur lors de l'indexation des tâches : {e}")
+
+        self.signals.finished.emit(indexed)
@@ -0,0 +1,545 @@
+# -*- coding: utf-8 -*-
+
+import gc
+from collections import OrderedDict
+
+from .date_index import DateIndex
+from .records import Comment
+from .sort_index import SortIndex
+from .storage import VersionConflict
+
+class TaskRepository:
+    # Nombre de tâches complètes (description et commentaires) gardées en mémoire
+    DETAILS_CACHE_SIZE = 32
+
+    def __init__(self, store, search_index=None):
+        """
+        Initialise le dépôt de tâches en mémoire
+
+        Seul le résumé de chaque tâche (ID, titre, dates et statut, voir records.Task) est gardé en
+        mémoire : la tâche complète est lue à la demande par load_task, et seules
+        les dernières tâches ouvertes restent en cache. À chaque rafraîchissement,
+        seules les tâches modifiées sur le support de stockage sont relues.
+
+        Les tâches complètes lues ou enregistrées sont aussi indexées pour la recherche.
+
+        Args:
+            store: Support de stockage des tâches (voir controller.storage)
+            search_index: Index de recherche plein texte (voir controller.search_index), optionnel
+        """
+        self.store = store
+        self.search_index = search_index
+        # ID -> résumé de la tâche
+        self.tasks = {}
+        # Cache LRU des tâches complètes : ID -> tâche, la plus récemment ouverte en dernier
+        self.details = OrderedDict()
+        # Index secondaire : statut -> {ID: tâche}
+        self.tasks_by_status = {}
+        # ID -> statut sous lequel la tâche est indexée
+        self.indexed_status = {}
+        # Index trié des dates de début et de fin (échéances, tâches actives sur une période)
+        self.date_index = DateIndex()
+        # Listes triées par échéance, date de début, titre ou statut, construites au premier tri
+        self.sort_index = SortIndex(self.tasks)
+        # IDs modifiés par cette instance pendant un chargement en arrière-plan
+        self.local_changes = None
+
+    def refresh(self):
+        """
+        Synchronise les tâches en mémoire avec le support de stockage
+
+        Returns:
+            tuple: (IDs des tâches ajoutées ou modifiées, IDs des tâches supprimées)
+        """
+        changed_tasks, removed_ids = self.apply_changes(*self.store.scan())
+        return [task.id for task in changed_tasks], removed_ids
+
+    def load_cached(self):
+        """
+        Charge les résumés de tâches connus du support de stockage (manifeste), sans lire les tâches
+
+        La tâche complète est lue à la demande par load_task.
+
+        Returns:
+            list: Liste des résumés chargés
+        """
+        summaries = self.store.cached_summaries()
+
+        # Chargement en masse sans cycle : inutile de déclencher le ramasse-miettes
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if self.tasks:
+                for summary in summaries:
+                    self._store(summary)
+            else:
+                # Dépôt vide : remplir directement les index
+                tasks_by_status = self.tasks_by_status
+                for summary in summaries:
+                    task_id = summary.id
+                    status = summary.status
+                    self.tasks[task_id] = summary
+                    bucket = tasks_by_status.get(status)
+                    if bucket is None:
+                        bucket = tasks_by_status[status] = {}
+                    bucket[task_id] = summary
+                    self.indexed_status[task_id] = status
+                self.date_index.load(summaries)
+                self.sort_index.reset()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return summaries
+
+    def begin_load(self):
+        """
+        Signale le début d'un chargement en arrière-plan
+
+        Les tâches modifiées localement pendant le chargement ne seront pas écrasées
+        par la version (plus ancienne) lue sur le disque par le chargement.
+        """
+        self.local_changes = set()
+
+    def end_load(self):
+        """
+        Signale la fin d'un chargement en arrière-plan
+        """
+        self.local_changes = None
+
+    def apply_changes(self, changed_tasks, removed_ids):
+        """
+        Applique un lot de changements lu sur le support de stockage
+
+        Args:
+            changed_tasks: Liste des tâches ajoutées ou modifiées
+            removed_ids: Liste des IDs des tâches supprimées
+
+        Returns:
+            tuple: (résumés des tâches réellement appliquées, IDs réellement supprimés)
+        """
+        if self.local_changes:
+            changed_tasks = [task for task in changed_tasks if task.id not in self.local_changes]
+            removed_ids = [task_id for task_id in removed_ids if task_id not in self.local_changes]
+
+        for task_id in removed_ids:
+            self._forget(task_id)
+
+        summaries = [self._store(task) for task in changed_tasks]
+
+        return summaries, removed_ids
+
+    def _mark_local_change(self, task_id):
+        """
+        Retient qu'une tâche a été modifiée par cette instance pendant un chargement
+
+        Args:
+            task_id: ID de la tâche
+        """
+        if self.local_changes is not None:
+            self.local_changes.add(task_id)
+
+    def _store(self, task):
+        """
+        Enregistre le résumé d'une tâche en mémoire et met à jour l'index par statut
+
+        Si la tâche complète est en cache, elle est remplacée par la nouvelle version
+        (ou retirée si seul un résumé est fourni).
+
+        Args:
+            task: La tâche ou son résumé (voir records.Task)
+
+        Returns:
+            Task: Résumé de la tâche
+        """
+        summary = task.summary()
+        task_id = summary.id
+        status = summary.status
+
+        if not task.is_summary:
+            if task_id in self.details:
+                self.details[task_id] = task
+            if self.search_index is not None:
+                self.search_index.index_task(task)
+        else:
+            self.details.pop(task_id, None)
+
+        previous_status = self.indexed_status.get(task_id)
+        if previous_status is not None and previous_status != status:
+            self._unindex(task_id, previous_status)
+
+        self.sort_index.update(self.tasks.get(task_id), summary)
+        self.tasks[task_id] = summary
+        self.tasks_by_status.setdefault(status, {})[task_id] = summary
+        self.indexed_status[task_id] = status
+        self.date_index.update(summary)
+        return summary
+
+    def _cache_details(self, task):
+        """
+        Ajoute une tâche complète au cache LRU, en retirant la plus anciennement ouverte si besoin
+
+        Args:
+            task: Tâche complète
+        """
+        self.details[task.id] = task
+        self.details.move_to_end(task.id)
+        while len(self.details) > self.DETAILS_CACHE_SIZE:
+            self.details.popitem(last=False)
+
+    def _forget(self, task_id):
+        """
+        Retire une tâche de la mémoire et de l'index par statut
+
+        Args:
+            task_id: ID de la tâche
+        """
+        summary = self.tasks.pop(task_id, None)
+        if summary is not None:
+            self.sort_index.remove(summary)
+        self.details.pop(task_id, None)
+        self.date_index.remove(task_id)
+        if self.search_index is not None:
+            self.search_index.remove_task(task_id)
+        status = self.indexed_status.pop(task_id, None)
+        if status is not None:
+            self._unindex(task_id, status)
+
+    def _unindex(self, task_id, status):
+        """
+        Retire une tâche du seau de son ancien statut
+
+        Args:
+            task_id: ID de la tâche
+            status: Statut sous lequel la tâche était indexée
+        """
+        bucket = self.tasks_by_status.get(status)
+        if bucket is None:
+            return
+        bucket.pop(task_id, None)
+        if not bucket:
+            del self.tasks_by_status[status]
+
+    def all_tasks(self):
+        """
+        Retourne toutes les tâches connues
+
+        Returns:
+            list: Liste des résumés de tâches
+        """
+        return list(self.tasks.values())
+
+    def tasks_with_status(self, status):
+        """
+        Retourne les tâches ayant un statut donné, sans parcourir toutes les tâches
+
+        Args:
+            status: Statut recherché ("Tous" pour toutes les tâches)
+
+        Returns:
+            list: Liste des résumés de tâches
+        """
+        if status == "Tous":
+            return self.all_tasks()
+        return list(self.tasks_by_status.get(status, {}).values())
+
+    def status_counts(self):
+        """
+        Retourne le nombre de tâches par statut
+
+        Returns:
+            dict: Statut -> nombre de tâches
+        """
+        return {status: len(bucket) for status, bucket in self.tasks_by_status.items()}
+
+    def tasks_due_between(self, first, last):
+        """
+        Retourne les tâches non terminées dont l'échéance (DateEnd) est comprise entre deux dates
+
+        Args:
+            first: Première date incluse (AAAA-MM-JJ), None pour toutes les échéances antérieures
+            last: Dernière date incluse (AAAA-MM-JJ)
+
+        Returns:
+            list: Résumés des tâches, par échéance croissante
+        """
+        return [self.tasks[task_id] for task_id in self.date_index.open_ending_between(first, last)]
+
+    def count_tasks_due_between(self, first, last):
+        """
+        Compte les tâches non terminées dont l'échéance est comprise entre deux dates
+
+        Args:
+            first: Première date incluse (AAAA-MM-JJ), None pour toutes les échéances antérieures
+            last: Dernière date incluse (AAAA-MM-JJ)
+
+        Returns:
+            int: Nombre de tâches
+        """
+        return self.date_index.count_open_ending_between(first, last)
+
+    def tasks_active_between(self, first, last):
+        """
+        Retourne les tâches actives sur une période (commencées avant sa fin, terminées après son début)
+
+        Args:
+            first: Début de la période (AAAA-MM-JJ)
+            last: Fin de la période (AAAA-MM-JJ)
+
+        Returns:
+            list: Résumés des tâches
+        """
+        return [self.tasks[task_id] for task_id in self.date_index.active_between(first, last)]
+
+    def get_task(self, task_id):
+        """
+        Retourne le résumé d'une tâche par son ID
+
+        Args:
+            task_id: ID de la tâche
+
+        Returns:
+            Task: Résumé de la tâche ou None
+        """
+        return self.tasks.get(task_id)
+
+    def load_task(self, task_id):
+        """
+        Retourne une tâche complète, lue sur le support de stockage si elle n'est pas en cache
+
+        Args:
+            task_id: ID de la tâche
+
+        Returns:
+            Task: La tâche complète ou None
+        """
+        task = self.details.get(task_id)
+        if task is not None:
+            self.details.move_to_end(task_id)
+            return task
+
+        if task_id not in self.tasks:
+            return None
+
+        task = self.store.read_task(task_id)
+        if task is not None:
+            self._store(task)
+            self._cache_details(task)
+        return task
+
+    def save_task(self, task, on_conflict=None):
+        """
+        Enregistre une tâche sur le support de stockage, si elle n'a pas été modifiée ailleurs, et met à jour le cache
+
+        Sans on_conflict, le cache reprend la version du support de stockage en
+        cas de conflit. Avec on_conflict, l'écriture peut se faire en arrière-plan
+        et c'est à on_conflict d'appeler apply_conflict (voir TaskStore.commit_task).
+
+        Args:
+            task: Tâche complète
+            on_conflict: Fonction appelée avec le VersionConflict, éventuellement depuis le thread d'écriture
+
+        Returns:
+            Task: La tâche enregistrée (voir TaskStore.commit_task), ou None si on_conflict a déjà été appelée
+
+        Raises:
+            VersionConflict: Sans on_conflict, si la tâche a été enregistrée ou supprimée par une autre instance depuis sa lecture
+        """
+        # La tâche avant modification, pour fusionner en cas de conflit (voir task_engine.merge_tasks)
+        base = self.details.get(task.id)
+        try:
+            saved = self.store.commit_task(task, on_conflict, base)
+        except VersionConflict as conflict:
+            self.apply_conflict(conflict)
+            raise
+        if saved is None:
+            return None
+        self._store(saved)
+        self._cache_details(saved)
+        self._mark_local_change(saved.id)
+        return saved
+
+    def save_tasks(self, tasks):
+        """
+        Enregistre un lot de tâches (import en masse), sans garder les tâches complètes en mémoire
+
+        Seuls les résumés sont gardés ; les tâches sont retirées de l'index de
+        recherche, qui les indexera à nouveau en arrière-plan (voir unindexed_task_ids).
+
+        Args:
+            tasks: Liste des tâches complètes
+        """
+        self.store.write_tasks(tasks)
+        for task in tasks:
+            if self.search_index is not None:
+                self.search_index.remove_task(task.id)
+            self._store(task.summary())
+            self._mark_local_change(task.id)
+
+    def update_tasks(self, tasks, on_conflict=None):
+        """
+        Enregistre un lot de tâches modifiées en une seule écriture et met à jour le cache
+
+        Contrairement à save_tasks, les tâches restent dans l'index de recherche.
+        Les tâches modifiées ailleurs depuis leur lecture ne sont pas enregistrées.
+
+        Args:
+            tasks: Liste des tâches complètes
+            on_conflict: Fonction appelée avec chaque VersionConflict (voir save_task)
+
+        Returns:
+            tuple: (tâches enregistrées, liste des VersionConflict)
+        """
+        saved, conflicts = self.store.commit_tasks(tasks, on_conflict)
+        for task in saved:
+            self._store(task)
+            self._mark_local_change(task.id)
+        for conflict in conflicts:
+            self.apply_conflict(conflict)
+        return saved, conflicts
+
+    def apply_conflict(self, conflict):
+        """
+        Remplace une tâche en mémoire par celle du support de stockage, après un conflit de version
+
+        Args:
+            conflict: Le conflit (voir storage.VersionConflict)
+        """
+        if conflict.current is None:
+            self._forget(conflict.task.id)
+        else:
+            self._store(conflict.current)
+
+    def delete_task(self, task_id):
+        """
+        Supprime une tâche du support de stockage et du cache
+
+        Args:
+            task_id: ID de la tâche à supprimer
+        """
+        self.store.delete_task(task_id)
+        self._forget(task_id)
+        self._mark_local_change(task_id)
+
+    def delete_tasks(self, task_ids):
+        """
+        Supprime un lot de tâches en une seule écriture et les retire du cache
+
+        Args:
+            task_ids: IDs des tâches à supprimer
+        """
+        self.store.delete_tasks(task_ids)
+        for task_id in task_ids:
+            self._forget(task_id)
+            self._mark_local_change(task_id)
+
+    def add_comment(self, task_id, comment):
+        """
+        Ajoute un commentaire à une tâche, sans réécrire ses autres commentaires
+
+        Args:
+            task_id: ID de la tâche
+            comment: Le commentaire (voir records.Comment)
+
+        Returns:
+            Task: La tâche complète à jour
+        """
+        task = self.load_task(task_id)
+        self.store.add_comment(task_id, comment)
+        task.comments.append(comment)
+        self._mark_local_change(task_id)
+        if self.search_index is not None:
+            self.search_index.index_task(task)
+        return task
+
+    def delete_comment(self, task_id, comment_id):
+        """
+        Supprime un commentaire d'une tâche, sans réécrire ses autres commentaires
+
+        Args:
+            task_id: ID de la tâche
+            comment_id: ID du commentaire à supprimer
+
+        Returns:
+            Task: La tâche complète à jour
+        """
+        task = self.load_task(task_id)
+        self.store.delete_comment(task_id, comment_id)
+        self._mark_local_change(task_id)
+        task.comments = [comment for comment in task.comments if comment.id != comment_id]
+        if self.search_index is not None:
+            self.search_index.index_task(task)
+        return task
+
+    def update_comment(self, task_id, comment_id, text):
+        """
+        Modifie le texte d'un commentaire, sans réécrire les autres commentaires
+
+        Args:
+            task_id: ID de la tâche
+            comment_id: ID du commentaire
+            text: Nouveau texte
+
+        Returns:
+            Task: La tâche complète à jour
+        """
+        task = self.load_task(task_id)
+        self.store.update_comment(task_id, comment_id, text)
+        self._mark_local_change(task_id)
+        task.comments = [
+            Comment(comment.id, text, comment.created_at) if comment.id == comment_id else comment
+            for comment in task.comments
+        ]
+        if self.search_index is not None:
+            self.search_index.index_task(task)
+        return task
+
+    def search(self, query, candidates=None):
+        """
+        Cherche les tâches dont le titre, la description ou les commentaires contiennent les mots d'une requête
+
+        Args:
+            query: Texte recherché (sans tenir compte des accents ni des majuscules)
+            candidates: Résumés des tâches parmi lesquelles chercher (None pour toutes les tâches)
+
+        Returns:
+            list: Résumés des tâches trouvées, les plus pertinentes en premier
+        """
+        if self.search_index is None:
+            return []
+
+        if candidates is None:
+            tasks = self.tasks
+        else:
+            tasks = {task.id: task for task in candidates}
+        return [tasks[task_id] for task_id in self.search_index.search(query) if task_id in tasks]
+
+    def unindexed_task_ids(self):
+        """
+        Synchronise l'index de recherche avec les tâches connues
+
+        Les tâches supprimées sont retirées de l'index ; les tâches absentes de
+        l'index sont retournées pour être indexées en arrière-plan.
+
+        Returns:
+            list: IDs des tâches à indexer
+        """
+        if self.search_index is None:
+            return []
+
+        for task_id in self.search_index.task_ids() - self.tasks.keys():
+            self.search_index.remove_task(task_id)
+        return [task_id for task_id in self.tasks if not self.search_index.has_task(task_id)]
+
+    def flush(self):
+        """
+        Attend que toutes les écritures en attente soient sur le disque
+        """
+        self.store.flush()
+
+    def close(self):
+        """
+        Termine les écritures en attente, enregistre l'index de recherche et ferme le support de stockage
+        """
+        if self.search_index is not None:
+            self.search_index.save()
+        self.store.close()
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import re
+import sys
+import uuid
+from itertools import islice
+
+from .records import Comment
+from .task_engine import TaskEngine
+
+FORMATS = ("jsonl", "csv")
+# Colonnes d'un export CSV : les commentaires sont une liste JSON dans une seule colonne
+CSV_FIELDS = ("ID", "Titre", "Description", "DateStart", "DateEnd", "Status", "Commentaires")
+# Un ID sert de nom de fichier (data/<ID>.json) : lettres, chiffres, tirets et soulignés seulement
+ID_PATTERN = re.compile(r"^[\w-]{1,128}$")
+# Nombre de tâches écrites par lot pendant un import
+BATCH_SIZE = 500
+# Nombre de tâches exportées entre deux rapports de progression
+PROGRESS_EVERY = 1000
+
+
+def detect_format(path, file_format=None):
+    """
+    Retourne le format d'un fichier d'import ou d'export : celui demandé, sinon d'après son extension
+
+    Args:
+        path: Chemin du fichier ("-" pour l'entrée ou la sortie standard)
+        file_format: "jsonl", "csv" ou None
+
+    Returns:
+        str: "jsonl" ou "csv"
+    """
+    if file_format:
+        if file_format not in FORMATS:
+            raise ValueError(f"Format inconnu : {file_format}")
+        return file_format
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_jsonl(lines):
+    """
+    Lit des tâches au format JSONL (une tâche JSON par ligne), ligne par ligne
+
+    Args:
+        lines: Itérable de lignes (fichier ouvert)
+
+    Yields:
+        tuple: (numéro de ligne, dictionnaire lu ou exception si la ligne est invalide)
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+def read_csv(lines):
+    """
+    Lit des tâches au format CSV (colonnes CSV_FIELDS), ligne par ligne
+
+    La colonne Commentaires contient la liste JSON des commentaires.
+
+    Args:
+        lines: Itérable de lignes (fichier ouvert avec newline='')
+
+    Yields:
+        tuple: (numéro de ligne, dictionnaire lu ou exception si la ligne est invalide)
+    """
+    reader = csv.DictReader(lines)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, e
+            continue
+
+        if None in row:
+            yield reader.line_num, ValueError("Colonnes en trop")
+            continue
+
+        record = {field: value for field, value in row.items() if value not in (None, "")}
+        try:
+            record["Commentaires"] = json.loads(record.get("Commentaires") or "[]")
+        except ValueError as e:
+            yield reader.line_num, e
+            continue
+        yield reader.line_num, record
+
+
+def clean_task(record):
+    """
+    Valide une tâche importée et complète les champs absents
+
+    Args:
+        record: Dictionnaire lu dans le fichier d'import
+
+    Returns:
+        Task: Tâche prête à être enregistrée
+
+    Raises:
+        ValueError: Si la tâche est invalide
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Objet JSON attendu")
+
+    title = record.get("Titre")
+    if not isinstance(title, str) or not title:
+        raise ValueError("Titre manquant")
+
+    task_id = str(record.get("ID") or uuid.uuid4())
+    if not ID_PATTERN.match(task_id):
+        raise ValueError(f"ID invalide : {task_id}")
+
+    # Dates absentes : aujourd'hui et demain, comme une tâche créée dans l'application
+    task = TaskEngine.new_task(
+        title=title,
+        description=str(record.get("Description") or ""),
+        start=record.get("DateStart"),
+        end=record.get("DateEnd"),
+        status=str(record.get("Status") or "À faire")
+    )
+    task.id = task_id
+
+    comments = record.get("Commentaires") or []
+    if not isinstance(comments, list):
+        raise ValueError("Commentaires : liste attendue")
+    for comment in comments:
+        if not isinstance(comment, dict) or not isinstance(comment.get("text", ""), str):
+            raise ValueError("Commentaire invalide")
+        task.comments.append(Comment(
+            str(comment.get("id") or uuid.uuid4()), comment.get("text", ""), comment.get("created_at")
+        ))
+
+    return task
+
+
+def valid_tasks(records, report, errors=None):
+    """
+    Filtre un flux de tâches lues : les lignes invalides sont comptées et signalées, pas importées
+
+    Args:
+        records: Itérable de (numéro de ligne, dictionnaire ou exception)
+        report: Compteurs de l'import, mis à jour ("skipped")
+        errors: Fonction appelée avec (numéro de ligne, message) pour chaque ligne ignorée
+
+    Yields:
+        Task: Tâche valide
+    """
+    for line_number, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            yield clean_task(record)
+        except (ValueError, csv.Error) as e:
+            report["skipped"] += 1
+            if errors:
+                errors(line_number, str(e))
+
+
+def batched(items, size):
+    """
+    Regroupe un flux en listes d'au plus size éléments
+
+    Yields:
+        list: Lot d'éléments
+    """
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def open_input(path, file_format):
+    """
+    Ouvre un fichier d'import (ou l'entrée standard pour "-")
+    """
+    if path == "-":
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8-sig', newline='' if file_format == "csv" else None)
+
+
+def open_output(path, file_format):
+    """
+    Ouvre un fichier d'export (ou la sortie standard pour "-")
+    """
+    if path == "-":
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8', newline='' if file_format == "csv" else None)
+
+
+def import_tasks(engine, path, file_format=None, batch_size=BATCH_SIZE, progress=None, errors=None):
+    """
+    Importe des tâches (commentaires compris) depuis un fichier JSONL ou CSV
+
+    Le fichier est lu en flux : seul le lot en cours est gardé en mémoire, et
+    chaque lot est écrit en une fois sur le support de stockage. Une ligne
+    invalide est ignorée sans interrompre l'import. Une tâche dont l'ID existe
+    déjà est remplacée.
+
+    Args:
+        engine: Moteur des tâches (voir task_engine.TaskEngine), chargé
+        path: Chemin du fichier ("-" pour l'entrée standard)
+        file_format: "jsonl", "csv" ou None pour le déduire de l'extension
+        batch_size: Nombre de tâches écrites par lot
+        progress: Fonction appelée avec les compteurs après chaque lot
+        errors: Fonction appelée avec (numéro de ligne, message) pour chaque ligne ignorée
+
+    Returns:
+        dict: Compteurs de l'import ("imported", "skipped")
+    """
+    file_format = detect_format(path, file_format)
+    report = {"imported": 0, "skipped": 0}
+    reader = read_csv if file_format == "csv" else read_jsonl
+
+    source = open_input(path, file_format)
+    try:
+        for batch in batched(valid_tasks(reader(source), report, errors), batch_size):
+            try:
+                engine.save_tasks(batch)
+                report["imported"] += len(batch)
+            except Exception:
+                # Lot refusé par le support de stockage : isoler les tâches en cause
+                for task in batch:
+                    try:
+                        engine.save_tasks([task])
+                        report["imported"] += 1
+                    except Exception as e:
+                        report["skipped"] += 1
+                        if errors:
+                            errors(None, f"{task.id} : {e}")
+            if progress:
+                progress(report)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    return report
+
+
+def write_jsonl(tasks, output):
+    """
+    Écrit des tâches au format JSONL, une par une
+
+    Args:
+        tasks: Itérable de tâches complètes
+        output: Fichier ouvert en écriture
+
+    Yields:
+        Task: Chaque tâche, une fois écrite
+    """
+    for task in tasks:
+        output.write(task.to_json(indent=None) + "\n")
+        yield task
+
+
+def write_csv(tasks, output):
+    """
+    Écrit des tâches au format CSV (colonnes CSV_FIELDS), une par une
+
+    Args:
+        tasks: Itérable de tâches complètes
+        output: Fichier ouvert en écriture (newline='')
+
+    Yields:
+        Task: Chaque tâche, une fois écrite
+    """
+    writer = csv.DictWriter(output, CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for task in tasks:
+        row = task.to_dict()
+        row["Commentaires"] = json.dumps(row.get("Commentaires", []), ensure_ascii=False)
+        writer.writerow(row)
+        yield task
+
+
+def export_tasks(engine, path, file_format=None, view="Tous", period=None, progress=None):
+    """
+    Exporte les tâches complètes d'un filtre vers un fichier JSONL ou CSV
+
+    Les tâches sont lues et écrites une par une : la mémoire reste constante.
+
+    Args:
+        engine: Moteur des tâches (voir task_engine.TaskEngine), chargé
+        path: Chemin du fichier ("-" pour la sortie standard)
+        file_format: "jsonl", "csv" ou None pour le déduire de l'extension
+        view: Statut, "Tous" ou clé d'une vue par date
+        period: (première date, dernière date) de la vue "@period"
+        progress: Fonction appelée avec les compteurs toutes les PROGRESS_EVERY tâches
+
+    Returns:
+        dict: Compteurs de l'export ("exported")
+    """
+    file_format = detect_format(path, file_format)
+    report = {"exported": 0}
+    writer = write_csv if file_format == "csv" else write_jsonl
+
+    output = open_output(path, file_format)
+    try:
+        for _ in writer(engine.iter_tasks(view, period), output):
+            report["exported"] += 1
+            if progress and report["exported"] % PROGRESS_EVERY == 0:
+                progress(report)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if progress:
+        progress(report)
+    return report
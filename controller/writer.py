@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import time
+
+from .instrumentation import metrics
+
+
+def atomic_write(path, data):
+    """
+    Écrit un fichier de manière atomique : fichier temporaire, fsync puis os.replace
+
+    Un arrêt brutal pendant l'écriture laisse l'ancien fichier intact au lieu d'un fichier tronqué.
+    Le fichier temporaire porte le numéro du processus : deux instances partageant
+    le dossier data n'écrivent jamais dans le même.
+
+    Args:
+        path: Chemin du fichier à écrire
+        data: Contenu à écrire (str encodé en UTF-8, ou bytes)
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    with metrics.span("write"):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, path)
+
+    metrics.count("files_written")
+    metrics.count("bytes_written", len(data))
+
+
+def atomic_write_many(files):
+    """
+    Écrit plusieurs fichiers de manière atomique, en synchronisant chaque dossier une seule fois
+
+    Chaque fichier temporaire est écrit et synchronisé (fsync) avant d'être
+    renommé ; les dossiers concernés sont ensuite synchronisés une fois chacun,
+    pour que les renommages survivent à un arrêt brutal. Utilisé pour les
+    écritures en lot, où un fsync de dossier par fichier doublerait le coût.
+
+    Args:
+        files: Liste de (chemin, contenu str ou bytes)
+    """
+    temp_paths = []
+    for path, data in files:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_paths.append(temp_path)
+        metrics.count("files_written")
+        metrics.count("bytes_written", len(data))
+
+    for (path, _), temp_path in zip(files, temp_paths):
+        os.replace(temp_path, path)
+
+    for folder in dict.fromkeys(os.path.dirname(os.path.abspath(path)) for path, _ in files):
+        fsync_folder(folder)
+
+
+def fsync_folder(folder):
+    """
+    Synchronise un dossier sur le disque (création, renommage et suppression de ses fichiers)
+
+    Sans effet sous Windows, où un dossier ne peut pas être ouvert.
+
+    Args:
+        folder: Chemin du dossier
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter:
+    # Délai (en secondes) pendant lequel les écritures d'une même clé sont regroupées
+    COALESCE_DELAY = 0.2
+
+    def __init__(self, name="task-writer"):
+        """
+        Thread d'écriture en arrière-plan
+
+        Les opérations sont regroupées par clé (l'ID de la tâche) : elles s'exécutent
+        dans l'ordre de soumission, et une opération soumise avec replace=True remplace
+        celles de la même clé encore en attente. Ainsi plusieurs sauvegardes rapprochées
+        d'une tâche ne produisent qu'une seule écriture.
+
+        Args:
+            name: Nom du thread
+        """
+        # Clé -> [échéance, liste des opérations en attente]
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.busy = False
+        self.flushing = 0
+        self.closed = False
+
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, key, operation, replace=False):
+        """
+        Programme une opération d'écriture
+
+        Args:
+            key: Clé de regroupement (ID de la tâche)
+            operation: Fonction sans argument à exécuter dans le thread d'écriture
+            replace: True si l'opération rend inutiles celles déjà en attente pour cette clé
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Le thread d'écriture est arrêté")
+
+            entry = self.pending.get(key)
+            if entry is None:
+                self.pending[key] = [time.monotonic() + self.COALESCE_DELAY, [operation]]
+            elif replace:
+                entry[1] = [operation]
+            else:
+                entry[1].append(operation)
+
+            self.condition.notify_all()
+
+    def flush(self):
+        """
+        Exécute immédiatement toutes les opérations en attente et attend leur fin
+        """
+        with self.condition:
+            self.flushing += 1
+            self.condition.notify_all()
+            try:
+                while self.pending or self.busy:
+                    self.condition.wait()
+            finally:
+                self.flushing -= 1
+
+    def close(self):
+        """
+        Vide la file d'attente puis arrête le thread d'écriture
+        """
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def _run(self):
+        """
+        Boucle du thread d'écriture
+        """
+        while True:
+            with self.condition:
+                while True:
+                    if self.closed and not self.pending:
+                        return
+
+                    now = time.monotonic()
+                    due_keys = [
+                        key for key, (deadline, _) in self.pending.items()
+                        if self.flushing or deadline <= now
+                    ]
+                    if due_keys:
+                        break
+
+                    if self.pending:
+                        next_deadline = min(deadline for deadline, _ in self.pending.values())
+                        self.condition.wait(next_deadline - now)
+                    else:
+                        self.condition.wait()
+
+                batch = [(key, self.pending.pop(key)[1]) for key in due_keys]
+                self.busy = True
+
+            for key, operations in batch:
+                for operation in operations:
+                    try:
+                        operation()
+                    except Exception as e:
+                        print(f"Erreur lors de l'écriture en arrière-plan ({key}) : {e}")
+
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
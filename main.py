@@ -1,44 +1,94 @@
-import PySide6
-import socket
+import time
+
+# Début du lancement, pour --profile-startup : mesuré avant les imports
+STARTED_AT = time.perf_counter()
+
+import logging
 import sys
 from views.interface import Ui_MainWindow
-from PySide6.QtWidgets import QFrame, QLabel, QPushButton, QVBoxLayout, QMainWindow, QWidget, QApplication, QComboBox
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QLabel, QPushButton, QMainWindow, QApplication, QComboBox
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QAction, QKeySequence
 from controller import TaskController
-print(PySide6.__version__)
-print(PySide6.QtCore.__version__)
+from controller.instrumentation import logger as perf_logger, metrics
 
 
+class StartupProfile:
+  """
+  Durées des étapes du démarrage, affichées avec l'option --profile-startup
+  """
+  # Mesures de l'instrumentation détaillant les étapes
+  DETAILS = ("manifest.load", "load.cached", "startup.deferred", "load")
+  
+  def __init__(self, started_at):
+    self.started_at = started_at
+    self.last = started_at
+    self.steps = []
+  
+  def mark(self, step):
+    now = time.perf_counter()
+    self.steps.append((step, (now - self.last) * 1000, (now - self.started_at) * 1000))
+    self.last = now
+  
+  def report(self):
+    print("Démarrage (--profile-startup) :")
+    for step, duration, elapsed in self.steps:
+      print(f"  {step:<34} {duration:8.1f} ms   total {elapsed:8.1f} ms")
+    spans = metrics.snapshot()["spans"]
+    for name in self.DETAILS:
+      if name in spans:
+        print(f"  dont {name:<29} {spans[name]['last_ms']:8.1f} ms")
 
-# print(f"IP publique : {get_public_ip()}")
 
 class MainWindow(QMainWindow):
-  def __init__(self):
+  def __init__(self, profile=None):
     super().__init__()
+    self.profile = profile
+    self.first_frame_shown = False
     self.ui = Ui_MainWindow()
     self.ui.setupUi(self)
+    self.mark("interface (setupUi)")
     
-    # Initialiser le contrôleur de tâches
+    # Initialiser le contrôleur de tâches : la liste est remplie depuis le manifeste
     self.task_controller = TaskController(self.ui, self)
     
-    # Récupérer les QVBoxLayout et appliquer l'alignement
-    self.setup_layouts()
-    
     # Connecter les boutons
     self.connect_buttons()
+    self.mark("contrôleur et liste des tâches")
   
-  def setup_layouts(self):
-    # Récupérer verticalLayout_1 (dans le premier scrollArea)
-    if hasattr(self.ui, 'verticalLayout_1'):
-      vertical_layout_1 = self.ui.verticalLayout_1.layout()
-      if vertical_layout_1:
-        vertical_layout_1.setAlignment(Qt.AlignTop)
+  def mark(self, step):
+    if self.profile:
+      self.profile.mark(step)
+  
+  def paintEvent(self, event):
+    super().paintEvent(event)
+    # Le reste du démarrage attend que la première image soit affichée
+    if not self.first_frame_shown:
+      self.first_frame_shown = True
+      self.mark("première image")
+      QTimer.singleShot(0, self.finish_startup)
+  
+  def finish_startup(self):
+    # Volet des commentaires, compteurs des filtres, chargement en arrière-plan et surveillance du dossier
+    if self.task_controller.started:
+      return
+    self.task_controller.finish_startup()
+    
+    # Mesures de performance dans la barre d'état
+    self.setup_perf_overlay()
+    self.mark("volets secondaires")
     
-    # Récupérer verticalLayout (dans le deuxième scrollArea)
-    if hasattr(self.ui, 'verticalLayout_2'):
-      vertical_layout = self.ui.verticalLayout_2.layout()
-      if vertical_layout:
-        vertical_layout.setAlignment(Qt.AlignTop)
+    if self.profile:
+      # Le rapport est affiché une fois le dossier data vérifié en arrière-plan
+      self.profile_timer = QTimer(self)
+      self.profile_timer.timeout.connect(self.check_startup_loaded)
+      self.profile_timer.start(20)
+  
+  def check_startup_loaded(self):
+    if self.task_controller.loader is None:
+      self.profile_timer.stop()
+      self.mark("chargement en arrière-plan")
+      self.profile.report()
   
   def connect_buttons(self):
     # Connecter le bouton avec l'objectName "create"
@@ -64,11 +114,86 @@ class MainWindow(QMainWindow):
     # Connecter le ComboBox avec l'objectName "filterStatus"
     filter_combo = self.findChild(QComboBox, "filterStatus")
     if filter_combo:
-      filter_combo.currentTextChanged.connect(self.task_controller.filter_tasks_by_status)
+      filter_combo.currentIndexChanged.connect(self.task_controller.on_filter_changed)
+    
+    # Connecter le tri : champ (sortField) et ordre (sortDescending)
+    sort_combo = self.findChild(QComboBox, "sortField")
+    if sort_combo:
+      sort_combo.currentIndexChanged.connect(self.task_controller.on_sort_changed)
+    
+    sort_order_button = self.findChild(QPushButton, "sortDescending")
+    if sort_order_button:
+      sort_order_button.toggled.connect(self.task_controller.on_sort_order_toggled)
+  
+  def setup_perf_overlay(self):
+    # Menu Affichage > Mesures de performance (Ctrl+Maj+P), activé d'office avec GESTIONNAIRE_PERF=1
+    self.perf_action = QAction("Mesures de performance", self)
+    self.perf_action.setCheckable(True)
+    self.perf_action.setShortcut(QKeySequence("Ctrl+Shift+P"))
+    self.perf_action.setChecked(metrics.enabled)
+    self.perf_action.toggled.connect(self.toggle_perf_overlay)
+    self.ui.menubar.addMenu("Affichage").addAction(self.perf_action)
+    
+    self.perf_label = QLabel()
+    self.ui.statusbar.addPermanentWidget(self.perf_label)
+    
+    # Rafraîchir les mesures affichées une fois par seconde, seulement quand elles sont actives
+    self.perf_timer = QTimer(self)
+    self.perf_timer.timeout.connect(self.update_perf_overlay)
+    self.toggle_perf_overlay(metrics.enabled)
+  
+  def toggle_perf_overlay(self, enabled):
+    if not enabled and metrics.enabled:
+      metrics.log_summary()
+    
+    metrics.enabled = enabled
+    perf_logger.setLevel(logging.DEBUG if enabled else logging.NOTSET)
+    self.perf_label.setVisible(enabled)
+    if enabled:
+      self.perf_timer.start(1000)
+      self.update_perf_overlay()
+    else:
+      self.perf_timer.stop()
+  
+  def update_perf_overlay(self):
+    # Dernière durée des opérations suivies, puis les compteurs
+    snapshot = metrics.snapshot()
+    spans = snapshot["spans"]
+    counters = snapshot["counters"]
+    labels = {
+      "load": "chargement",
+      "filter": "filtre",
+      "search": "recherche",
+      "select.load": "lecture",
+      "comments.refresh": "commentaires",
+      "save": "sauvegarde",
+    }
+    parts = [f"{label} {spans[name]['last_ms']:.0f} ms" for name, label in labels.items() if name in spans]
+    parts.append(f"fichiers lus {counters.get('files_read', 0)}")
+    parts.append(f"écrits {counters.get('bytes_written', 0) / 1024:.0f} Ko")
+    parts.append(f"widgets actifs {len(QApplication.allWidgets())}")
+    self.perf_label.setText(" · ".join(parts))
   
 
 if __name__ == "__main__":
+  # Les mesures de performance sont écrites par le module logging (logger "gestionnaire.perf")
+  logging.basicConfig(format="%(asctime)s %(name)s %(message)s")
+  
+  # --profile-startup : durées des imports, de la construction et de la première image
+  profile = None
+  if "--profile-startup" in sys.argv:
+    sys.argv.remove("--profile-startup")
+    profile = StartupProfile(STARTED_AT)
+    profile.mark("imports")
+    metrics.enabled = True
+  
   app = QApplication(sys.argv)
-  window = MainWindow()
+  if profile:
+    profile.mark("QApplication")
+  window = MainWindow(profile)
   window.show()
-  sys.exit(app.exec())
\ No newline at end of file
+  exit_code = app.exec()
+  
+  # Les sauvegardes sont écrites en arrière-plan : vider la file d'attente avant de quitter
+  window.task_controller.shutdown()
+  sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+from PySide6.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QApplication, QPlainTextEdit, QStyle, QStyledItemDelegate
+
+from controller.records import Comment
+from .task_list_model import format_date
+
+
+# Rôle Qt permettant de récupérer le commentaire (voir controller.records.Comment)
+CommentRole = Qt.ItemDataRole.UserRole + 1
+
+
+class CommentListModel(QAbstractListModel):
+    # Nombre de commentaires plus anciens ajoutés à chaque défilement en bas de la liste
+    PAGE_SIZE = 50
+
+    # Texte d'un commentaire modifié dans la liste : (ID du commentaire, nouveau texte)
+    comment_edited = Signal(str, str)
+
+    def __init__(self, parent=None):
+        """
+        Modèle des commentaires de la tâche sélectionnée, affichés dans commentList
+
+        Les commentaires les plus récents sont en haut. Seule une page est exposée
+        à la vue au départ : les plus anciens sont ajoutés par pages (fetchMore)
+        quand l'utilisateur fait défiler la liste jusqu'en bas.
+
+        Args:
+            parent: Objet Qt parent
+        """
+        super().__init__(parent)
+        # Commentaires dans l'ordre de la tâche (du plus ancien au plus récent)
+        self.comments = []
+        # Nombre de lignes exposées à la vue, en partant du plus récent
+        self.loaded = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.loaded
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+
+        comment = self.comment_at(index.row())
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return comment.text
+        if role == CommentRole:
+            return comment
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid() or index.row() >= self.loaded:
+            return False
+
+        position = self.position_of_row(index.row())
+        comment = self.comments[position]
+        if comment.text == value:
+            return False
+
+        self.comments[position] = Comment(comment.id, value, comment.created_at)
+        self.dataChanged.emit(index, index)
+        self.comment_edited.emit(comment.id, value)
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.comments)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self.comments) - self.loaded)
+        if count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def position_of_row(self, row):
+        """
+        Convertit un numéro de ligne (le plus récent en premier) en position dans la liste des commentaires
+
+        Args:
+            row: Numéro de ligne
+
+        Returns:
+            int: Position dans self.comments
+        """
+        return len(self.comments) - 1 - row
+
+    def comment_at(self, row):
+        """
+        Retourne le commentaire affiché à une ligne
+
+        Args:
+            row: Numéro de ligne
+
+        Returns:
+            Comment: Le commentaire
+        """
+        return self.comments[self.position_of_row(row)]
+
+    def row_of(self, comment_id):
+        """
+        Retourne le numéro de ligne d'un commentaire
+
+        Args:
+            comment_id: ID du commentaire
+
+        Returns:
+            int: Numéro de ligne ou None si le commentaire est inconnu
+        """
+        # Les commentaires récents, les plus souvent modifiés, sont en fin de liste
+        for position in range(len(self.comments) - 1, -1, -1):
+            if self.comments[position].id == comment_id:
+                return self.position_of_row(position)
+        return None
+
+    def set_comments(self, comments):
+        """
+        Remplace tous les commentaires affichés ; seule la première page est exposée à la vue
+
+        Args:
+            comments: Liste des commentaires de la tâche (du plus ancien au plus récent)
+        """
+        self.beginResetModel()
+        self.comments = list(comments)
+        self.loaded = min(self.PAGE_SIZE, len(self.comments))
+        self.endResetModel()
+
+    def add_comment(self, comment):
+        """
+        Ajoute un nouveau commentaire en haut de la liste, sans toucher aux autres lignes
+
+        Args:
+            comment: Le commentaire (voir controller.records.Comment)
+
+        Returns:
+            int: Numéro de ligne du commentaire (0)
+        """
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.comments.append(comment)
+        self.loaded += 1
+        self.endInsertRows()
+        return 0
+
+    def remove_comment(self, comment_id):
+        """
+        Retire la ligne d'un commentaire
+
+        Args:
+            comment_id: ID du commentaire à retirer
+        """
+        row = self.row_of(comment_id)
+        if row is None:
+            return
+
+        if row >= self.loaded:
+            # Commentaire d'une page pas encore affichée : aucune ligne à retirer
+            del self.comments[self.position_of_row(row)]
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.comments[self.position_of_row(row)]
+        self.loaded -= 1
+        self.endRemoveRows()
+
+
+class CommentItemDelegate(QStyledItemDelegate):
+    ROW_HEIGHT = 64
+    MARGIN = 6
+    BUTTON_SIZE = 28
+
+    # Clic sur le bouton de suppression d'un commentaire : ID du commentaire
+    delete_requested = Signal(str)
+
+    def __init__(self, parent=None):
+        """
+        Dessine un commentaire (date, texte et bouton de suppression) sans créer de widget
+
+        Une zone de texte n'est créée que pour le commentaire en cours de modification
+        (double-clic ou F2), puis détruite à la fin de la modification.
+
+        Args:
+            parent: Objet Qt parent
+        """
+        super().__init__(parent)
+        self.text_font = QFont()
+        self.text_font.setPixelSize(12)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(10)
+
+    def button_rect(self, rect):
+        """
+        Retourne la zone du bouton de suppression d'une ligne
+
+        Args:
+            rect: Zone de la ligne
+
+        Returns:
+            QRect: Zone du bouton
+        """
+        return QRect(
+            rect.right() - self.MARGIN - self.BUTTON_SIZE,
+            rect.center().y() - self.BUTTON_SIZE // 2,
+            self.BUTTON_SIZE, self.BUTTON_SIZE
+        )
+
+    def text_rect(self, rect):
+        """
+        Retourne la zone du texte d'une ligne (sous la date, à gauche du bouton)
+
+        Args:
+            rect: Zone de la ligne
+
+        Returns:
+            QRect: Zone du texte
+        """
+        return QRect(
+            rect.left() + self.MARGIN, rect.top() + 18,
+            rect.width() - 3 * self.MARGIN - self.BUTTON_SIZE, rect.height() - 18 - self.MARGIN
+        )
+
+    def paint(self, painter, option, index):
+        comment = index.data(CommentRole)
+        if comment is None:
+            return
+
+        painter.save()
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        # Cadre du commentaire
+        frame_rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.setPen(option.palette.mid().color())
+        painter.drawRect(frame_rect)
+
+        # Date de création
+        painter.setFont(self.info_font)
+        painter.setPen(QColor("gray"))
+        created_at = comment.created_at or ""
+        day, _, time = created_at.partition(" ")
+        date_rect = QRect(frame_rect.left() + self.MARGIN, frame_rect.top() + 2, frame_rect.width(), 16)
+        painter.drawText(
+            date_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"{format_date(day)} {time[:5]}".strip()
+        )
+
+        # Texte, coupé à la hauteur de la ligne (la zone de modification affiche le texte complet)
+        painter.setFont(self.text_font)
+        painter.setPen(option.palette.text().color())
+        painter.drawText(
+            self.text_rect(option.rect), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+            comment.text
+        )
+
+        # Bouton de suppression
+        button_rect = self.button_rect(option.rect)
+        painter.setPen(option.palette.mid().color())
+        painter.drawRoundedRect(button_rect, 4, 4)
+        painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, "🗑️")
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                            QEvent.Type.MouseButtonDblClick):
+            if self.button_rect(option.rect).contains(event.position().toPoint()):
+                if (event.type() == QEvent.Type.MouseButtonRelease
+                        and event.button() == Qt.MouseButton.LeftButton):
+                    self.delete_requested.emit(index.data(CommentRole).id)
+                # Le clic sur le bouton ne sélectionne ni ne modifie la ligne
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        editor = QPlainTextEdit(parent)
+        editor.setFont(self.text_font)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setPlainText(index.data(Qt.ItemDataRole.EditRole) or "")
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.toPlainText(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(self.text_rect(option.rect).adjusted(-2, -2, 2, 2))
@@ -15,10 +15,11 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QApplication, QComboBox, QDateEdit, QFrame,
-    QLabel, QLineEdit, QMainWindow, QMenuBar,
-    QPlainTextEdit, QPushButton, QScrollArea, QSizePolicy,
-    QStatusBar, QVBoxLayout, QWidget)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QComboBox, QDateEdit,
+    QFrame, QLabel, QLineEdit, QListView,
+    QMainWindow, QMenuBar, QPlainTextEdit, QPushButton,
+    QScrollArea, QSizePolicy, QStatusBar, QVBoxLayout,
+    QWidget)
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -48,18 +49,26 @@ class Ui_MainWindow(object):
         self.create.setObjectName(u"create")
         self.create.setGeometry(QRect(10, 10, 191, 31))
         self.create.setStyleSheet(u"background-color:blue; color: white")
-        self.scrollArea = QScrollArea(self.frame)
-        self.scrollArea.setObjectName(u"scrollArea")
-        self.scrollArea.setGeometry(QRect(10, 90, 191, 431))
-        self.scrollArea.setWidgetResizable(True)
-        self.verticalLayout_1 = QWidget()
-        self.verticalLayout_1.setObjectName(u"verticalLayout_1")
-        self.verticalLayout_1.setGeometry(QRect(0, 0, 177, 16777215))
-        self.verticalLayout_1.setMinimumSize(QSize(0, 16777215))
-        self.verticalLayout_1.setMaximumSize(QSize(16777215, 16777215))
-        self.verticalLayout_3 = QVBoxLayout(self.verticalLayout_1)
-        self.verticalLayout_3.setObjectName(u"verticalLayout_3")
-        self.scrollArea.setWidget(self.verticalLayout_1)
+        self.searchInput = QLineEdit(self.frame)
+        self.searchInput.setObjectName(u"searchInput")
+        self.searchInput.setGeometry(QRect(10, 90, 191, 31))
+        self.searchInput.setClearButtonEnabled(True)
+        self.sortField = QComboBox(self.frame)
+        self.sortField.setObjectName(u"sortField")
+        self.sortField.setGeometry(QRect(10, 130, 151, 31))
+        self.sortDescending = QPushButton(self.frame)
+        self.sortDescending.setObjectName(u"sortDescending")
+        self.sortDescending.setGeometry(QRect(166, 130, 35, 31))
+        self.sortDescending.setCheckable(True)
+        self.taskList = QListView(self.frame)
+        self.taskList.setObjectName(u"taskList")
+        self.taskList.setGeometry(QRect(10, 170, 191, 351))
+        self.taskList.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.taskList.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.taskList.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.taskList.setLayoutMode(QListView.LayoutMode.Batched)
+        self.taskList.setUniformItemSizes(True)
+        self.taskList.setBatchSize(1000)
         self.frame_2 = QFrame(self.centralwidget)
         self.frame_2.setObjectName(u"frame_2")
         self.frame_2.setGeometry(QRect(229, 9, 561, 531))
@@ -123,8 +132,7 @@ class Ui_MainWindow(object):
         self.scrollArea_2.setWidgetResizable(True)
         self.verticalLayout_2 = QWidget()
         self.verticalLayout_2.setObjectName(u"verticalLayout_2")
-        self.verticalLayout_2.setGeometry(QRect(0, 0, 519, 16777215))
-        self.verticalLayout_2.setMinimumSize(QSize(519, 16777215))
+        self.verticalLayout_2.setGeometry(QRect(0, 0, 519, 169))
         self.verticalLayout_2.setStyleSheet(u"")
         self.verticalLayout = QVBoxLayout(self.verticalLayout_2)
         self.verticalLayout.setObjectName(u"verticalLayout")
@@ -133,6 +141,14 @@ class Ui_MainWindow(object):
 
         self.verticalLayout.addWidget(self.createComment)
 
+        self.commentList = QListView(self.verticalLayout_2)
+        self.commentList.setObjectName(u"commentList")
+        self.commentList.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked|QAbstractItemView.EditTrigger.EditKeyPressed)
+        self.commentList.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.commentList.setUniformItemSizes(True)
+
+        self.verticalLayout.addWidget(self.commentList)
+
         self.scrollArea_2.setWidget(self.verticalLayout_2)
         self.label_4 = QLabel(self.frame_2)
         self.label_4.setObjectName(u"label_4")
@@ -176,6 +192,14 @@ class Ui_MainWindow(object):
         self.filterStatus.setItemText(5, QCoreApplication.translate("MainWindow", u"En attente", None))
 
         self.create.setText(QCoreApplication.translate("MainWindow", u"Ajouter une t\u00e2che", None))
+        self.searchInput.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Rechercher...", None))
+#if QT_CONFIG(tooltip)
+        self.sortField.setToolTip(QCoreApplication.translate("MainWindow", u"Trier les t\u00e2ches", None))
+#endif // QT_CONFIG(tooltip)
+#if QT_CONFIG(tooltip)
+        self.sortDescending.setToolTip(QCoreApplication.translate("MainWindow", u"Ordre d\u00e9croissant", None))
+#endif // QT_CONFIG(tooltip)
+        self.sortDescending.setText(QCoreApplication.translate("MainWindow", u"\u2191", None))
         self.selectedTitle.setText("")
         self.selectedDate_3.setText("")
         self.label.setText(QCoreApplication.translate("MainWindow", u"Date d\u00e9but", None))
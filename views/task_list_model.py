@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate
+
+
+# Rôle Qt permettant de récupérer la tâche (voir controller.records.Task)
+TaskRole = Qt.ItemDataRole.UserRole + 1
+
+
+def format_date(date_str):
+    """
+    Convertit une date YYYY-MM-DD (texte ou objet date) vers dd/mm/YYYY
+
+    Les dates des tâches sont déjà des objets date : elles sont formatées sans être relues.
+
+    Args:
+        date_str: Date au format YYYY-MM-DD, objet date ou None
+
+    Returns:
+        str: Date au format dd/mm/YYYY (ou la valeur d'origine si invalide, N/A si absente)
+    """
+    if date_str is None:
+        return "N/A"
+    if not isinstance(date_str, str):
+        return f"{date_str.day:02d}/{date_str.month:02d}/{date_str.year}"
+    parts = date_str.split("-")
+    if len(parts) != 3:
+        return date_str
+    return f"{parts[2]}/{parts[1]}/{parts[0]}"
+
+
+class TaskListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        """
+        Modèle de la liste des tâches affichée dans taskList
+
+        Les tâches peuvent être données page par page : la page suivante n'est
+        demandée (fetchMore) que quand l'utilisateur fait défiler la liste jusqu'en bas.
+        Quand la liste est triée, une tâche ajoutée ou modifiée prend sa place dans
+        le tri ; une tâche placée après la dernière page affichée arrivera avec la suivante.
+
+        Args:
+            parent: Objet Qt parent
+        """
+        super().__init__(parent)
+        self.tasks = []
+        # ID de la tâche -> numéro de ligne, pour les mises à jour ciblées
+        self.rows = {}
+        # Fonction retournant (page suivante, fonction de la page d'après ou None), None à la fin de la liste
+        self.more = None
+        # Fonction résumé -> clé de tri (voir controller.sort_index.row_key), None si la liste n'est pas triée
+        self.key = None
+        # Clés de tri des lignes, dans l'ordre de la liste (si key est donnée)
+        self.keys = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.tasks)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.tasks):
+            return None
+
+        task_data = self.tasks[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return task_data.title
+        if role == TaskRole:
+            return task_data
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.more is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.more is None:
+            return
+        tasks, self.more = self.more()
+
+        # Une tâche déjà ajoutée à la liste (création, rechargement) n'est pas répétée
+        new_tasks = [task_data for task_data in tasks if task_data.id not in self.rows]
+        if not new_tasks:
+            return
+
+        self._append(new_tasks)
+
+    def _append(self, new_tasks):
+        """
+        Ajoute des tâches en fin de liste, en un seul bloc de lignes
+
+        Args:
+            new_tasks: Liste des résumés de tâches
+        """
+        first_row = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(new_tasks) - 1)
+        for row, task_data in enumerate(new_tasks, first_row):
+            self.tasks.append(task_data)
+            self.rows[task_data.id] = row
+        if self.key is not None:
+            self.keys.extend(self.key(task_data) for task_data in new_tasks)
+        self.endInsertRows()
+
+    def set_tasks(self, tasks, more=None, key=None):
+        """
+        Remplace toutes les tâches affichées
+
+        Args:
+            tasks: Liste des résumés de tâches à afficher (voir controller.records.Task),
+                ou première page de la liste
+            more: Fonction retournant (page suivante, fonction de la page d'après ou None),
+                None si toutes les tâches sont données
+            key: Fonction résumé -> clé de tri de la liste (voir controller.sort_index.row_key),
+                None si l'ordre des tâches n'est pas un tri (résultats d'une recherche)
+        """
+        self.beginResetModel()
+        self.tasks = list(tasks)
+        self.rows = {task_data.id: row for row, task_data in enumerate(self.tasks)}
+        self.more = more
+        self.key = key
+        self.keys = [key(task_data) for task_data in self.tasks] if key is not None else []
+        self.endResetModel()
+
+    def _sorted_row(self, key):
+        """
+        Retourne la ligne où placer une tâche d'après sa clé de tri
+
+        Args:
+            key: Clé de tri de la tâche (absente de keys)
+
+        Returns:
+            int: Numéro de ligne, ou None si la tâche se place après la dernière page affichée
+        """
+        row = bisect_left(self.keys, key)
+        if row == len(self.keys) and self.more is not None:
+            return None
+        return row
+
+    def upsert_task(self, task_data):
+        """
+        Met à jour la ligne d'une tâche, ou l'ajoute à sa place (en fin de liste si elle n'est pas triée)
+
+        Une tâche dont la clé de tri a changé est déplacée à sa nouvelle place.
+
+        Args:
+            task_data: Résumé de la tâche
+
+        Returns:
+            int: Numéro de ligne de la tâche, ou None si elle se place après la dernière page affichée
+        """
+        row = self.rows.get(task_data.id)
+        if self.key is None:
+            if row is None:
+                self._append([task_data])
+                return len(self.tasks) - 1
+            self.tasks[row] = task_data
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+            return row
+
+        key = self.key(task_data)
+        if row is None:
+            row = self._sorted_row(key)
+            if row is None:
+                return None
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.tasks.insert(row, task_data)
+            self.keys.insert(row, key)
+            self._renumber(row, len(self.tasks))
+            self.endInsertRows()
+            return row
+
+        # Clé toujours entre celles des lignes voisines : la ligne ne bouge pas
+        if (row == 0 or self.keys[row - 1] < key) and (row == len(self.keys) - 1 or key < self.keys[row + 1]):
+            self.tasks[row] = task_data
+            self.keys[row] = key
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+            return row
+
+        # Place parmi les autres lignes : l'ancienne clé de la ligne n'est pas comptée
+        target = bisect_left(self.keys, key)
+        if target == len(self.keys) and self.more is not None:
+            self.remove_task(task_data.id)
+            return None
+        if target > row:
+            target -= 1
+
+        # La destination de beginMoveRows est la ligne avant laquelle insérer, comptée avant le déplacement
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target + 1 if target > row else target)
+        del self.tasks[row]
+        del self.keys[row]
+        self.tasks.insert(target, task_data)
+        self.keys.insert(target, key)
+        self._renumber(min(row, target), max(row, target) + 1)
+        self.endMoveRows()
+        index = self.index(target, 0)
+        self.dataChanged.emit(index, index)
+        return target
+
+    def _renumber(self, first, last):
+        """
+        Met à jour les numéros de ligne des tâches d'un intervalle de lignes
+
+        Args:
+            first: Première ligne
+            last: Ligne suivant la dernière
+        """
+        for row in range(first, last):
+            self.rows[self.tasks[row].id] = row
+
+    def upsert_tasks(self, tasks):
+        """
+        Met à jour ou ajoute plusieurs tâches, les nouvelles lignes étant insérées en un seul bloc
+
+        Les lignes existantes sont signalées modifiées en un seul signal. Si la
+        liste est triée, elle est ensuite remise en ordre en un seul changement
+        de disposition, au lieu d'un déplacement par tâche.
+
+        Args:
+            tasks: Liste des résumés de tâches
+        """
+        # Clé de la dernière ligne : une tâche placée après elle arrivera avec la page suivante
+        last_key = self.keys[-1] if self.key is not None and self.keys and self.more is not None else None
+
+        new_tasks = []
+        changed_rows = []
+        after_page = []
+        for task_data in tasks:
+            row = self.rows.get(task_data.id)
+            key = self.key(task_data) if self.key is not None else None
+            if last_key is not None and last_key < key:
+                if row is not None:
+                    after_page.append(task_data.id)
+                continue
+            if row is not None:
+                self.tasks[row] = task_data
+                if key is not None:
+                    self.keys[row] = key
+                changed_rows.append(row)
+            else:
+                new_tasks.append(task_data)
+
+        # Un seul signal pour toutes les lignes modifiées
+        if changed_rows:
+            self.dataChanged.emit(self.index(min(changed_rows), 0), self.index(max(changed_rows), 0))
+
+        if after_page:
+            self.remove_tasks(after_page)
+        if new_tasks:
+            self._append(new_tasks)
+        if self.key is not None and (changed_rows or new_tasks):
+            self._sort()
+
+    def _sort(self):
+        """
+        Remet les lignes dans l'ordre de leurs clés de tri, en gardant la sélection et la ligne courante
+        """
+        order = sorted(range(len(self.tasks)), key=self.keys.__getitem__)
+        if all(row == position for position, row in enumerate(order)):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_ids = [self.tasks[index.row()].id if index.isValid() else None for index in persistent]
+
+        self.tasks = [self.tasks[row] for row in order]
+        self.keys = [self.keys[row] for row in order]
+        self.rows = {task_data.id: row for row, task_data in enumerate(self.tasks)}
+
+        self.changePersistentIndexList(persistent, [
+            self.index(self.rows[task_id], 0) if task_id in self.rows else QModelIndex()
+            for task_id in persistent_ids
+        ])
+        self.layoutChanged.emit()
+
+    def remove_task(self, task_id):
+        """
+        Retire la ligne d'une tâche si elle est affichée
+
+        Args:
+            task_id: ID de la tâche à retirer
+        """
+        row = self.rows.pop(task_id, None)
+        if row is None:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.tasks[row]
+        if self.key is not None:
+            del self.keys[row]
+        # Décaler les lignes suivantes
+        self._renumber(row, len(self.tasks))
+        self.endRemoveRows()
+
+    def remove_tasks(self, task_ids):
+        """
+        Retire les lignes de plusieurs tâches, par blocs de lignes consécutives
+
+        Les numéros de ligne ne sont recalculés qu'une fois, quel que soit le nombre de tâches retirées.
+
+        Args:
+            task_ids: IDs des tâches à retirer
+        """
+        removed_rows = sorted(
+            (row for row in (self.rows.get(task_id) for task_id in task_ids) if row is not None),
+            reverse=True
+        )
+        if not removed_rows:
+            return
+
+        # Retirer les blocs en partant de la fin pour ne pas décaler les suivants
+        first = last = removed_rows[0]
+        for row in removed_rows[1:] + [None]:
+            if row is not None and row == first - 1:
+                first = row
+                continue
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.tasks[first:last + 1]
+            if self.key is not None:
+                del self.keys[first:last + 1]
+            self.endRemoveRows()
+            first = last = row
+
+        self.rows = {task_data.id: row for row, task_data in enumerate(self.tasks)}
+
+    def row_of(self, task_id):
+        """
+        Retourne le numéro de ligne d'une tâche
+
+        Args:
+            task_id: ID de la tâche
+
+        Returns:
+            int: Numéro de ligne ou None si la tâche n'est pas affichée
+        """
+        return self.rows.get(task_id)
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    ROW_HEIGHT = 70
+    MARGIN = 8
+
+    def __init__(self, parent=None):
+        """
+        Dessine une tâche (titre, date de début et statut) sans créer de widget
+
+        Args:
+            parent: Objet Qt parent
+        """
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setBold(True)
+        self.title_font.setPixelSize(12)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(10)
+
+    def paint(self, painter, option, index):
+        task_data = index.data(TaskRole)
+        if task_data is None:
+            return
+
+        painter.save()
+
+        # Fond et surbrillance de sélection selon le style courant
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        # Cadre de la tâche
+        frame_rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.setPen(option.palette.mid().color())
+        painter.drawRect(frame_rect)
+
+        text_rect = frame_rect.adjusted(self.MARGIN, 4, -self.MARGIN, -4)
+        line_height = text_rect.height() // 3
+
+        # Titre de la tâche
+        painter.setFont(self.title_font)
+        painter.setPen(option.palette.text().color())
+        title_rect = QRect(text_rect.left(), text_rect.top(), text_rect.width(), line_height)
+        title = painter.fontMetrics().elidedText(
+            task_data.title, Qt.TextElideMode.ElideRight, title_rect.width()
+        )
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+        # Date de début
+        painter.setFont(self.info_font)
+        painter.setPen(QColor("gray"))
+        date_rect = title_rect.translated(0, line_height)
+        start_date = task_data.start
+        painter.drawText(
+            date_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"Début: {format_date(start_date)}"
+        )
+
+        # Statut
+        painter.setPen(QColor("blue"))
+        status_rect = date_rect.translated(0, line_height)
+        painter.drawText(
+            status_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"Statut: {task_data.status or 'N/A'}"
+        )
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)